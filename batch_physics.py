@@ -0,0 +1,231 @@
+"""Vectorized headless Pong simulator.
+
+Steps thousands of independent AI-vs-AI matches at once with the rules from
+``physics.py``.  State is stored as one NumPy array per field
+(struct-of-arrays), and any rule may be a scalar or a per-match array, which
+makes parameter sweeps a single simulation run:
+
+    python batch_physics.py --matches 20000 --steps 36000 --ai-speed 2 3 4 --speedup 1.03 1.05
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from physics import DEFAULT_RULES, MAX_PADDLE_HITS, make_rules
+
+
+def _fold_walls(y, dy, t, radius, height):
+    """Ball y and dy after moving for time t, reflected between the walls (physics.fold_walls)"""
+    span = height - 2 * radius
+    with np.errstate(invalid='ignore'):
+        travelled = y - radius + dy * t
+        folded = travelled - 2 * span * np.floor(travelled / (2 * span))
+    flip = folded > span
+    return radius + np.where(flip, 2 * span - folded, folded), np.where(flip, -dy, dy)
+
+
+class BatchPong:
+    """Many Pong matches stepped together with NumPy"""
+
+    def __init__(self, num_matches, rules=None, seed=None):
+        self.n = num_matches
+        self.rules = {key: self._per_match(value) for key, value in (rules or DEFAULT_RULES).items()}
+        self.rng = np.random.default_rng(seed)
+
+        r = self.rules
+        self.ball_x = np.empty(self.n)
+        self.ball_y = np.empty(self.n)
+        self.ball_dx = np.empty(self.n)
+        self.ball_dy = np.empty(self.n)
+        self.paddle1_y = np.broadcast_to(r['paddle_start_y'], self.n).astype(float)
+        self.paddle2_y = self.paddle1_y.copy()
+        self.score1 = np.zeros(self.n, dtype=np.int64)
+        self.score2 = np.zeros(self.n, dtype=np.int64)
+
+        # Rally statistics
+        self.hits = np.zeros(self.n, dtype=np.int64)
+        self.rally_hits = np.zeros(self.n, dtype=np.int64)
+        self.longest_rally = np.zeros(self.n, dtype=np.int64)
+        self.max_speed = np.zeros(self.n)
+        self.steps = 0
+
+        self.serve(np.ones(self.n, dtype=bool))
+
+    def _per_match(self, value):
+        """Keep scalars as they are, check arrays have one entry per match"""
+        array = np.asarray(value, dtype=float)
+        if array.ndim == 0:
+            return float(array)
+        if array.shape != (self.n,):
+            raise ValueError(f"Rule arrays must have shape ({self.n},), got {array.shape}")
+        return array
+
+    def _masked(self, key, mask):
+        """Rule value for the matches selected by mask"""
+        value = self.rules[key]
+        return value[mask] if isinstance(value, np.ndarray) else value
+
+    def serve(self, mask):
+        """Serve the ball from the center for the matches selected by mask"""
+        count = int(mask.sum())
+        if not count:
+            return
+        speed = self._masked('serve_speed', mask)
+        jitter = self._masked('serve_jitter', mask)
+        signs = np.where(self.rng.random((2, count)) > 0.5, 1.0, -1.0)
+        self.ball_x[mask] = self._masked('width', mask) // 2
+        self.ball_y[mask] = self._masked('height', mask) // 2
+        self.ball_dx[mask] = speed * signs[0]
+        self.ball_dy[mask] = speed * signs[1] * (1 + jitter * (2 * self.rng.random(count) - 1))
+
+    def _move_ai(self, paddle_y):
+        """Move all paddles towards their ball (in place)"""
+        r = self.rules
+        center = paddle_y + r['paddle_height'] // 2
+        down = center < self.ball_y - r['ai_deadzone']
+        up = center > self.ball_y + r['ai_deadzone']
+        paddle_y += np.where(down, r['ai_speed'], 0.0) - np.where(up, r['ai_speed'], 0.0)
+        np.clip(paddle_y, 0, r['height'] - r['paddle_height'], out=paddle_y)
+
+    def _bounce_speed(self, dx, idx):
+        """Reversed, sped-up and capped horizontal speed (physics.bounce_speed)"""
+        return -np.sign(dx) * np.minimum(np.abs(dx) * self._masked('speedup', idx),
+                                         self._masked('max_ball_speed', idx))
+
+    def step(self):
+        """Advance every match by one physics step"""
+        r = self.rules
+        radius = r['ball_radius']
+
+        self._move_ai(self.paddle1_y)
+        self._move_ai(self.paddle2_y)
+
+        # A paddle moved onto the ball: send the ball back the way it came
+        x, y = self.ball_x, self.ball_y
+        overlap1 = ((self.ball_dx < 0) &
+                    (x >= r['left_paddle_x'] - radius) &
+                    (x <= r['left_paddle_x'] + r['paddle_width'] + radius) &
+                    (y >= self.paddle1_y) & (y <= self.paddle1_y + r['paddle_height']))
+        overlap2 = ((self.ball_dx > 0) &
+                    (x >= r['right_paddle_x'] - radius) &
+                    (x <= r['right_paddle_x'] + r['paddle_width'] + radius) &
+                    (y >= self.paddle2_y) & (y <= self.paddle2_y + r['paddle_height']))
+        overlap = overlap1 | overlap2
+        self.ball_dx = np.where(overlap, self._bounce_speed(self.ball_dx, slice(None)), self.ball_dx)
+
+        # Swept movement: paddle bounces at their time of impact, walls folded in closed form.
+        # Each pass only handles the matches whose ball bounced in the previous one.
+        hit = overlap.astype(np.int64)
+        idx = slice(None)  # every match on the first pass
+        remaining = 1.0
+        for _ in range(MAX_PADDLE_HITS + 1):
+            x, y, dx, dy = self.ball_x[idx], self.ball_y[idx], self.ball_dx[idx], self.ball_dy[idx]
+            radius = self._masked('ball_radius', idx)
+            height = self._masked('height', idx)
+            left = dx < 0
+            face = np.where(left,
+                            self._masked('left_paddle_x', idx) + self._masked('paddle_width', idx) + radius,
+                            self._masked('right_paddle_x', idx) - radius)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = np.where(dx != 0, (face - x) / dx, -1.0)
+            y_hit, dy_hit = _fold_walls(y, dy, t, radius, height)
+            paddle_y = np.where(left, self.paddle1_y[idx], self.paddle2_y[idx])
+            bounce = ((t >= 0) & (t <= remaining) &
+                      (y_hit >= paddle_y) & (y_hit <= paddle_y + self._masked('paddle_height', idx)))
+
+            # Balls that bounce stop at the paddle face; the rest finish the step
+            y_end, dy_end = _fold_walls(y, dy, remaining, radius, height)
+            self.ball_x[idx] = np.where(bounce, face, x + dx * remaining)
+            self.ball_y[idx] = np.where(bounce, y_hit, y_end)
+            self.ball_dy[idx] = np.where(bounce, dy_hit, dy_end)
+            self.ball_dx[idx] = np.where(bounce, self._bounce_speed(dx, idx), dx)
+            hit[idx] += bounce
+
+            remaining = (remaining - t)[bounce]
+            idx = np.arange(self.n)[idx][bounce]
+            if not idx.size:
+                break
+        self.hits += hit
+        self.rally_hits += hit
+        np.maximum(self.max_speed, np.abs(self.ball_dx), out=self.max_speed)
+
+        # Scoring
+        right_scores = self.ball_x < 0
+        left_scores = self.ball_x > r['width']
+        self.score2 += right_scores
+        self.score1 += left_scores
+        point = right_scores | left_scores
+        if point.any():
+            np.maximum(self.longest_rally, np.where(point, self.rally_hits, 0), out=self.longest_rally)
+            self.rally_hits[point] = 0
+            self.serve(point)
+
+        self.steps += 1
+
+    def run(self, steps):
+        """Advance every match by the given number of steps"""
+        for _ in range(steps):
+            self.step()
+
+    def stats(self, mask=None):
+        """Summary statistics, optionally over a subset of matches"""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        points = (self.score1 + self.score2)[mask]
+        total_points = int(points.sum())
+        return {
+            'matches': int(mask.sum()),
+            'steps': self.steps,
+            'points': total_points,
+            # None when no point was scored (e.g. AIs that never miss)
+            'hits_per_point': float(self.hits[mask].sum() / total_points) if total_points else None,
+            # Rallies still going count too, or endless ones would report 0
+            'longest_rally': int(max(self.longest_rally[mask].max(initial=0),
+                                     self.rally_hits[mask].max(initial=0))),
+            'mean_max_speed': float(self.max_speed[mask].mean()),
+            'left_win_share': float(self.score1[mask].sum() / total_points) if total_points else None,
+        }
+
+
+def main():
+    """Run a parameter sweep from the command line"""
+    parser = argparse.ArgumentParser(description="Headless batch Pong simulator")
+    parser.add_argument('--matches', type=int, default=10000, help="matches per parameter combination")
+    parser.add_argument('--steps', type=int, default=3600, help="physics steps per match (60 per second)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--ai-speed', type=float, nargs='+', default=[DEFAULT_RULES['ai_speed']])
+    parser.add_argument('--speedup', type=float, nargs='+', default=[DEFAULT_RULES['speedup']])
+    parser.add_argument('--serve-jitter', type=float, nargs='+', default=[DEFAULT_RULES['serve_jitter']])
+    parser.add_argument('--max-ball-speed', type=float, nargs='+', default=[DEFAULT_RULES['max_ball_speed']])
+    args = parser.parse_args()
+
+    combos = list(itertools.product(args.ai_speed, args.speedup, args.serve_jitter, args.max_ball_speed))
+    total = args.matches * len(combos)
+    group = np.repeat(np.arange(len(combos)), args.matches)
+    rules = make_rules(
+        ai_speed=np.array([c[0] for c in combos])[group],
+        speedup=np.array([c[1] for c in combos])[group],
+        serve_jitter=np.array([c[2] for c in combos])[group],
+        max_ball_speed=np.array([c[3] for c in combos])[group],
+    )
+
+    sim = BatchPong(total, rules, seed=args.seed)
+    started = time.perf_counter()
+    sim.run(args.steps)
+    elapsed = time.perf_counter() - started
+    print(f"Simulated {total} matches x {args.steps} steps in {elapsed:.2f}s "
+          f"({total * args.steps / elapsed / 1e6:.1f}M match-steps/s)")
+
+    print(f"{'ai_speed':>8} {'speedup':>8} {'jitter':>7} {'v_cap':>6} {'points':>9} {'hits/pt':>8} "
+          f"{'longest':>8} {'max_v':>7}")
+    for i, (ai_speed, speedup, jitter, speed_cap) in enumerate(combos):
+        s = sim.stats(group == i)
+        hits_per_point = 'no point' if s['hits_per_point'] is None else f"{s['hits_per_point']:.2f}"
+        print(f"{ai_speed:8.2f} {speedup:8.3f} {jitter:7.2f} {speed_cap:6.0f} {s['points']:9d} "
+              f"{hits_per_point:>8} {s['longest_rally']:8d} {s['mean_max_speed']:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
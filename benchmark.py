@@ -0,0 +1,353 @@
+"""Headless per-stage benchmark of the frame pipeline.
+
+Times each stage the game runs per frame, on synthetic frames, a recorded
+session or a live camera, and reports p50/p95/p99 latencies:
+
+    python benchmark.py                          # synthetic frames
+    python benchmark.py --replay recordings/s1   # recorded session
+    python benchmark.py --camera 0 --frames 600  # live camera
+    python benchmark.py --json run.json --compare baseline.json
+
+MediaPipe and Tk stages are skipped (and reported as such) when mediapipe
+is not installed or no display is available.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+import physics
+from frame_buffers import FrameBuffers
+from gestures import classify as classify_gestures
+from landmarks import landmarks_array
+from preview import CameraPreview
+from raster_renderer import RasterRenderer, parse_size
+
+STAGES = [
+    'cap.read', 'flip', 'cvtColor', 'hands.process', 'landmarks_array', 'gestures', 'draw_landmarks',
+    'preview_resize', 'preview_photo', 'update_game', 'draw_game', 'draw_raster',
+]
+
+
+class StageTimer:
+    """Collect per-stage durations in seconds"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.enabled = True
+
+    @contextmanager
+    def __call__(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.samples[stage].append(time.perf_counter() - started)
+
+    def summary(self):
+        """p50/p95/p99/mean/max in milliseconds per stage"""
+        result = {}
+        for stage in STAGES + sorted(set(self.samples) - set(STAGES)):
+            values = self.samples.get(stage)
+            if not values:
+                continue
+            ms = np.array(values) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            result[stage] = {
+                'count': len(ms),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'mean': float(ms.mean()),
+                'max': float(ms.max()),
+            }
+        return result
+
+
+def synthetic_frames(count=60, width=640, height=480, seed=0):
+    """Frames with a textured background and two moving skin-colored blobs"""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(40, 90, (height, width, 3), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        phase = 2 * np.pi * i / count
+        for cx, offset in ((width // 4, 0.0), (3 * width // 4, np.pi)):
+            cy = int(height / 2 + height / 3 * np.sin(phase + offset))
+            cv2.ellipse(frame, (cx, cy), (45, 65), 0, 0, 360, (90, 140, 200), -1)
+        frames.append(frame)
+    return frames
+
+
+class SyntheticSource:
+    """Frame source cycling through pregenerated frames (copied like a real read)"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+
+    def read(self, image=None):
+        source = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        if image is not None and image.shape == source.shape:
+            np.copyto(image, source)
+            return True, image
+        return True, source.copy()
+
+    def release(self):
+        pass
+
+
+class ReplayCapture:
+    """cv2.VideoCapture-like wrapper around a recording"""
+
+    def __init__(self, path):
+        from recording import ReplaySource
+        self.source = ReplaySource(path, realtime=False, loop=True).start()
+
+    def read(self, image=None):
+        frame, _ = self.source.read()
+        if frame is None:
+            return False, None
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, np.array(frame)
+
+    def release(self):
+        pass
+
+
+def synthetic_landmarks(num_hands=2, seed=0):
+    """Plausible normalized landmarks for drawing when no model runs"""
+    rng = np.random.default_rng(seed)
+    centers = np.array([[0.25, 0.5], [0.75, 0.5]])[:num_hands]
+    points = centers[:, None, :] + rng.normal(0, 0.05, (num_hands, 21, 2))
+    return np.concatenate([points, np.zeros((num_hands, 21, 1))], axis=2).astype(np.float32)
+
+
+def make_hands(args):
+    """MediaPipe Hands model and connections, or (None, ()) if unavailable"""
+    if args.no_inference:
+        return None, ()
+    try:
+        import mediapipe as mp
+    except ImportError:
+        print("⚠️ mediapipe not installed: skipping hands.process", file=sys.stderr)
+        return None, ()
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=args.max_num_hands,
+        model_complexity=args.model_complexity,
+        min_detection_confidence=0.3,
+        min_tracking_confidence=0.3
+    )
+    return hands, mp.solutions.hands.HAND_CONNECTIONS
+
+
+def make_tk(width, height):
+    """Hidden Tk root with the game canvas, or None without a display"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"⚠️ Tk unavailable ({e}): skipping preview_photo and draw_game", file=sys.stderr)
+        return None
+    root.withdraw()
+    canvas = tk.Canvas(root, width=width, height=height, bg='#0f172a')
+    canvas.pack()
+    label = tk.Label(root)
+    label.pack()
+    return root, canvas, label
+
+
+def run(args):
+    """Run the pipeline for the configured number of frames and return results"""
+    if args.camera is not None:
+        cap = cv2.VideoCapture(args.camera)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, args.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, args.height)
+        if not cap.isOpened():
+            raise SystemExit(f"❌ Cannot open camera {args.camera}")
+        source_name = f"camera:{args.camera}"
+    elif args.replay:
+        cap = ReplayCapture(args.replay)
+        source_name = f"replay:{args.replay}"
+    else:
+        cap = SyntheticSource(synthetic_frames(width=args.width, height=args.height))
+        source_name = "synthetic"
+
+    hands, connections = make_hands(args)
+    fallback_landmarks = synthetic_landmarks(args.max_num_hands)
+
+    tk_parts = None if args.no_tk else make_tk(600, 400)
+    renderer = None
+    if tk_parts:
+        from renderer import CanvasRenderer
+        root, canvas, label = tk_parts
+        renderer = CanvasRenderer(canvas, 600, 400)
+    raster = RasterRenderer(600, 400, size=args.render_size, order='BGR')
+    preview = CameraPreview(tk_parts[2] if tk_parts else None, fps=0,
+                            connections=connections or fallback_connections())
+
+    rules = physics.make_rules()
+    state = physics.new_state(rules)
+    rng = np.random.default_rng(0)
+    timer = StageTimer()
+    buffers = FrameBuffers()
+    frame = None
+
+    for i in range(args.warmup + args.frames):
+        timer.enabled = i >= args.warmup
+        if i == args.warmup:
+            allocated_before = buffers.bytes_allocated
+
+        with timer('cap.read'):
+            # Decode into the previous frame's array, as CameraStream does
+            ok, frame = cap.read(frame) if frame is not None else cap.read()
+        if not ok:
+            frame = None
+            continue
+        with timer('flip'):
+            mirrored = buffers.mirror(frame)
+        with timer('cvtColor'):
+            rgb = buffers.rgb(mirrored)
+
+        landmarks = fallback_landmarks
+        if hands:
+            with timer('hands.process'):
+                results = hands.process(rgb)
+            if results.multi_hand_landmarks:
+                with timer('landmarks_array'):
+                    landmarks = landmarks_array(results.multi_hand_landmarks)
+        with timer('gestures'):
+            classify_gestures(landmarks, aspect=args.width / args.height)
+
+        with timer('preview_resize'):
+            cv2.resize(mirrored, (preview.width, preview.height), dst=preview.small, interpolation=cv2.INTER_AREA)
+        with timer('draw_landmarks'):
+            preview.draw_landmarks(landmarks)
+        if preview.photo is not None:
+            with timer('preview_photo'):
+                cv2.cvtColor(preview.small, cv2.COLOR_BGR2RGBA, dst=preview.rgba)
+                preview.photo.paste(preview.image)
+
+        with timer('update_game'):
+            physics.step(state, rules, rng)
+
+        if renderer:
+            with timer('draw_game'):
+                ball, p1, p2 = state['ball'], state['paddle1'], state['paddle2']
+                renderer.draw(ball['x'], ball['y'], ball['radius'],
+                              (p1['x'], p1['y'], p1['width'], p1['height']),
+                              (p2['x'], p2['y'], p2['width'], p2['height']), False, False)
+                root.update_idletasks()
+        with timer('draw_raster'):
+            ball, p1, p2 = state['ball'], state['paddle1'], state['paddle2']
+            raster.set_picture(preview.small)
+            raster.draw(ball['x'], ball['y'], ball['radius'],
+                        (p1['x'], p1['y'], p1['width'], p1['height']),
+                        (p2['x'], p2['y'], p2['width'], p2['height']), False, False)
+
+    cap.release()
+    if hands:
+        hands.close()
+    if tk_parts:
+        tk_parts[0].destroy()
+
+    return {
+        'source': source_name,
+        'frames': args.frames,
+        'frame_size': [args.width, args.height],
+        'render_size': list(args.render_size),
+        'model_complexity': args.model_complexity,
+        'max_num_hands': args.max_num_hands,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+        },
+        'stages': timer.summary(),
+        'bytes_allocated_per_frame': (buffers.bytes_allocated - allocated_before) / max(args.frames, 1),
+    }
+
+
+def fallback_connections():
+    """MediaPipe's 21-point hand skeleton, for drawing without mediapipe"""
+    chains = [(0, 1, 2, 3, 4), (0, 5, 6, 7, 8), (5, 9, 10, 11, 12), (9, 13, 14, 15, 16), (13, 17, 18, 19, 20), (0, 17)]
+    return [(a, b) for chain in chains for a, b in zip(chain, chain[1:])]
+
+
+def print_report(report, baseline=None):
+    """Print the stage table, with p50/p95 change versus a baseline if given"""
+    print(f"Source: {report['source']}  frames: {report['frames']}  "
+          f"size: {report['frame_size'][0]}x{report['frame_size'][1]}")
+    header = f"{'stage':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8}"
+    if baseline:
+        header += f" {'Δp50':>8} {'Δp95':>8}"
+    print(header)
+    for stage, s in report['stages'].items():
+        line = f"{stage:<16} {s['p50']:8.3f} {s['p95']:8.3f} {s['p99']:8.3f} {s['mean']:8.3f}"
+        base = (baseline or {}).get('stages', {}).get(stage)
+        if base:
+            line += f" {_change(s['p50'], base['p50']):>8} {_change(s['p95'], base['p95']):>8}"
+        print(line)
+    if 'bytes_allocated_per_frame' in report:
+        print(f"Pipeline buffers allocated per measured frame: {report['bytes_allocated_per_frame']:.0f} bytes")
+    skipped = [stage for stage in STAGES if stage not in report['stages']]
+    if skipped:
+        print(f"Skipped: {', '.join(skipped)}")
+
+
+def _change(value, base):
+    """Relative change as a signed percentage string"""
+    if not base:
+        return "n/a"
+    return f"{(value - base) / base * 100:+.1f}%"
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Per-stage frame pipeline benchmark")
+    parser.add_argument('--frames', type=int, default=300, help="measured frames")
+    parser.add_argument('--warmup', type=int, default=30, help="unmeasured frames first")
+    parser.add_argument('--camera', type=int, default=None, help="use a live camera instead of synthetic frames")
+    parser.add_argument('--replay', metavar='DIR', help="use a recorded session (hand.py --record)")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--model-complexity', type=int, default=1, choices=[0, 1])
+    parser.add_argument('--max-num-hands', type=int, default=2)
+    parser.add_argument('--no-inference', action='store_true', help="skip MediaPipe")
+    parser.add_argument('--render-size', type=parse_size, default=(600, 400), metavar='WxH',
+                        help="output size for the draw_raster stage")
+    parser.add_argument('--no-tk', action='store_true', help="skip Tk stages even if a display is available")
+    parser.add_argument('--json', metavar='FILE', help="write results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    report = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
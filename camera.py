@@ -0,0 +1,121 @@
+import threading
+import time
+
+
+class CameraStream:
+    """Drain a cv2.VideoCapture on a background thread.
+
+    The capture thread keeps only the newest frame (latest-frame-wins), so the
+    game loop never blocks on the camera's frame interval and never works on
+    stale frames queued up in the driver buffer.  Frames that were replaced
+    before the game loop picked them up are counted in ``dropped_frames``.
+
+    Frames are decoded into three reused arrays (one being filled, the newest
+    one, and the one the reader holds), so a frame returned by ``read()`` is
+    only valid until the next call.  Bytes allocated for frames are counted
+    in ``bytes_allocated``; it stops growing once the slots are filled.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._thread = None
+        self._running = False
+
+        # Reused frame arrays; _latest is the newest frame, _held the reader's
+        self._slots = [None, None, None]
+        self._latest = None
+        self._held = None
+        self._timestamp = 0.0
+        self._frame_id = 0
+        self._last_read_id = 0
+
+        # Stats
+        self.frames_captured = 0
+        self.dropped_frames = 0
+        self.failed_reads = 0
+        self.bytes_allocated = 0
+
+    def start(self):
+        """Start the capture thread"""
+        if self._running:
+            return self
+        # A frame left over from before a stop() is stale
+        with self._lock:
+            self._last_read_id = self._frame_id
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="CameraStream", daemon=True)
+        self._thread.start()
+        return self
+
+    def _capture_loop(self):
+        """Read frames as fast as the camera delivers them"""
+        while self._running:
+            with self._lock:
+                slot = next(i for i in range(len(self._slots)) if i not in (self._latest, self._held))
+            buffer = self._slots[slot]
+            # Decode into the free slot; the backend reuses it when the size matches
+            ret, frame = self.cap.read(buffer) if buffer is not None else self.cap.read()
+            timestamp = time.monotonic()
+            if not ret:
+                self.failed_reads += 1
+                time.sleep(0.01)
+                continue
+            if frame is not buffer:
+                self.bytes_allocated += frame.nbytes
+
+            with self._lock:
+                self._slots[slot] = frame
+                if self._latest is not None and self._frame_id != self._last_read_id:
+                    self.dropped_frames += 1
+                self._latest = slot
+                self._timestamp = timestamp
+                self._frame_id += 1
+                self.frames_captured += 1
+            self._new_frame.set()
+
+    def read(self, timeout=0.0):
+        """Return (frame, timestamp) for the newest unseen frame.
+
+        Returns (None, None) if no new frame arrived since the last call
+        (after waiting up to ``timeout`` seconds).  The frame is reused for
+        capture after the next call, so copy it to keep it longer.
+        """
+        if timeout and not self._new_frame.wait(timeout):
+            return None, None
+
+        with self._lock:
+            if self._latest is None or self._frame_id == self._last_read_id:
+                return None, None
+            self._last_read_id = self._frame_id
+            self._held = self._latest
+            self._new_frame.clear()
+            return self._slots[self._held], self._timestamp
+
+    def stop(self):
+        """Stop the capture thread (the device stays open)"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def release(self):
+        """Stop the capture thread and release the device"""
+        self.stop()
+        self.cap.release()
+
+
+def open_capture(config):
+    """Open and configure the camera described by a game config (slow; call off the Tk thread)"""
+    import cv2  # here so importing this module stays cheap
+    cap = cv2.VideoCapture(config['camera_index'])
+    if not cap.isOpened():
+        cap.release()
+        return None
+
+    # Set camera properties for better performance
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config['camera_width'])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config['camera_height'])
+    cap.set(cv2.CAP_PROP_FPS, config['camera_fps'])
+    return cap
@@ -1,27 +1,26 @@
-import subprocess
 import sys
 
-def install_packages():
-    """Install required packages"""
-    packages = [
-        'opencv-python==4.8.1.78',
-        'mediapipe==0.10.7',
-        'pillow==10.0.1',
-        'numpy==1.24.3'
-    ]
-    
-    for package in packages:
-        try:
-            print(f"Installing {package}...")
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
-            print(f"✓ {package} installed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Failed to install {package}: {e}")
-            return False
-    
+from installer import check_python_version, check_requirement, find_wheelhouse, install_requirements, read_requirements
+
+def install_packages(wheelhouse=None):
+    """Install required packages that are missing or at the wrong version (one pip run)"""
+    if not check_python_version():
+        return False
+    checks = [check_requirement(name, operator, version) for name, operator, version in read_requirements()]
+    packages = [to_install for ok, _, to_install in checks if not ok]
+    if not packages:
+        print("✓ All packages are already installed")
+        return True
+
+    try:
+        install_requirements(packages, wheelhouse=find_wheelhouse(wheelhouse))
+    except Exception as e:
+        print(f"✗ Failed to install {', '.join(packages)}: {e}")
+        return False
+
     print("\n✓ All packages installed successfully!")
-    print("You can now run: python hand_pong.py")
+    print("You can now run: python hand.py")
     return True
 
 if __name__ == "__main__":
-    install_packages()
+    install_packages(sys.argv[1] if len(sys.argv) > 1 else None)
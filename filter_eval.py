@@ -0,0 +1,173 @@
+"""Compare paddle input filters offline: lag versus jitter.
+
+Replays hand traces (CSV written by ``python hand.py --hand-trace FILE``, a
+session recorded with ``python hand.py --record DIR``, or a synthetic trace
+with known ground truth) through each filter, sampling
+its prediction at the display rate as the game does, and reports:
+
+- lag_ms: time shift that best aligns the output with the reference motion
+- jitter_px: frame-to-frame noise of the output while the hand is still
+  (second-difference RMS)
+- rmse_px: error against the reference at zero shift
+
+For recorded traces the reference is a centered (non-causal) moving average
+of the measurements; for synthetic traces it is the true hand path.
+
+    python filter_eval.py --synthetic
+    python filter_eval.py hand_trace.csv --filter ema --filter one_euro:beta=0.02
+    python filter_eval.py recordings/session1
+"""
+import argparse
+import csv
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from filters import make_filter
+from recording import Recording
+
+DEFAULT_FILTERS = ['ema', 'one_euro', 'one_euro:lookahead=0.03', 'kalman', 'kalman:lookahead=0.03']
+GAP_SECONDS = 0.3  # longer gaps count as a lost hand (filter reset)
+STILL_SPEED = 10.0  # px/s; slower reference motion counts as a still hand
+
+
+def load_trace(path):
+    """Read a hand trace CSV or recording into {paddle: (timestamps, values, truth)}"""
+    if os.path.isdir(path):
+        return load_recording(path)
+    columns = defaultdict(lambda: ([], []))
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            times, values = columns[row['paddle']]
+            times.append(float(row['timestamp']))
+            values.append(float(row['target_y']))
+    return {name: (np.array(t), np.array(v), None) for name, (t, v) in columns.items()}
+
+
+def load_recording(path, canvas_height=400, paddle_height=80):
+    """Paddle targets from the landmark-12 positions in a session recording"""
+    recording = Recording(path)
+    columns = defaultdict(lambda: ([], []))
+    for record in recording.results:
+        for slot in range(int(record['count'])):
+            # Mirrored image: the user's left hand drives the right paddle
+            paddle = 'paddle2' if record['handedness'][slot] == 0 else 'paddle1'
+            times, values = columns[paddle]
+            times.append(float(recording.timestamps[record['frame']]))
+            values.append(float(record['landmarks'][slot, 12, 1]) * canvas_height - paddle_height / 2)
+    return {name: (np.array(t), np.array(v), None) for name, (t, v) in columns.items()}
+
+
+def synthetic_trace(seconds=60.0, rate=30.0, noise=2.0, seed=0):
+    """Hand path with still periods, sweeps and fast flicks, plus noisy samples"""
+    rng = np.random.default_rng(seed)
+    times = np.arange(0, seconds, 1.0 / rate)
+
+    def truth(t):
+        t = np.asarray(t, dtype=float)
+        phase = (t // 5) % 3
+        sweep = 160 + 120 * np.sin(2 * np.pi * 0.4 * t)
+        flick = 160 + 140 * np.tanh(8 * np.sin(2 * np.pi * 0.7 * t))
+        return np.where(phase == 0, 160.0, np.where(phase == 1, sweep, flick))
+
+    values = truth(times) + rng.normal(0, noise, len(times))
+    return {'synthetic': (times, values, truth)}
+
+
+def segments(times):
+    """Index ranges of the trace split at gaps"""
+    breaks = np.flatnonzero(np.diff(times) > GAP_SECONDS) + 1
+    bounds = np.concatenate(([0], breaks, [len(times)]))
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b - a > 5]
+
+
+def centered_average(times, values, window=0.1):
+    """Non-causal moving average used as reference for recorded traces"""
+    out = np.empty_like(values)
+    lo = np.searchsorted(times, times - window / 2)
+    hi = np.searchsorted(times, times + window / 2, side='right')
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    out[:] = (cumulative[hi] - cumulative[lo]) / (hi - lo)
+    return lambda t: np.interp(t, times, out)
+
+
+def run_filter(spec, times, values, latency, display_rate):
+    """Filter output sampled at the display rate; measurements arrive after latency"""
+    filt = make_filter(spec)
+    arrivals = times + latency
+    sample_times = np.arange(arrivals[0], arrivals[-1], 1.0 / display_rate)
+    output = np.empty(len(sample_times))
+    i = 0
+    for k, t in enumerate(sample_times):
+        while i < len(times) and arrivals[i] <= t:
+            filt.update(values[i], times[i])
+            i += 1
+        output[k] = filt.predict(t)
+    return sample_times, output
+
+
+def evaluate(spec, trace, latency=0.03, display_rate=60.0, max_lag=0.3):
+    """Lag, jitter and error of one filter over all segments of a trace"""
+    shifts = np.arange(0.0, max_lag + 1e-9, 0.005)
+    errors = np.zeros(len(shifts))
+    second_diffs = []
+    count = 0
+    for times, values, truth in trace.values():
+        for a, b in segments(times):
+            t, v = times[a:b], values[a:b]
+            reference = truth or centered_average(t, v)
+            sample_times, output = run_filter(spec, t, v, latency, display_rate)
+            for j, shift in enumerate(shifts):
+                errors[j] += np.sum((output - reference(sample_times - shift)) ** 2)
+            # Jitter only where the hand is (nearly) still
+            speed = np.abs(np.gradient(reference(sample_times), sample_times))
+            still = (speed[1:-1] < STILL_SPEED) & (speed[:-2] < STILL_SPEED) & (speed[2:] < STILL_SPEED)
+            second_diffs.append(np.diff(output, 2)[still])
+            count += len(output)
+
+    if not count:
+        return None
+    rms = np.sqrt(errors / count)
+    d2 = np.concatenate(second_diffs)
+    return {
+        'filter': spec,
+        'lag_ms': float(shifts[np.argmin(rms)] * 1000),
+        'jitter_px': float(np.sqrt(np.mean(d2 ** 2) / 6)) if len(d2) else float('nan'),
+        'rmse_px': float(rms[0]),
+    }
+
+
+def main():
+    """Evaluate filters from the command line"""
+    parser = argparse.ArgumentParser(description="Compare paddle input filters on hand traces")
+    parser.add_argument('trace', nargs='?', help="CSV from hand.py --hand-trace or a directory from --record")
+    parser.add_argument('--synthetic', action='store_true', help="use a synthetic trace with ground truth")
+    parser.add_argument('--filter', action='append', dest='filters',
+                        help="filter spec to evaluate (repeatable)")
+    parser.add_argument('--latency', type=float, default=30.0,
+                        help="capture-to-result latency in ms applied before a sample reaches the filter")
+    parser.add_argument('--display-rate', type=float, default=60.0, help="rate the output is sampled at")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    if args.synthetic or not args.trace:
+        trace = synthetic_trace()
+    else:
+        trace = load_trace(args.trace)
+
+    results = [evaluate(spec, trace, args.latency / 1000, args.display_rate)
+               for spec in args.filters or DEFAULT_FILTERS]
+    results = [r for r in results if r]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'filter':<32} {'lag ms':>7} {'jitter px':>10} {'rmse px':>8}")
+    for r in results:
+        print(f"{r['filter']:<32} {r['lag_ms']:7.0f} {r['jitter_px']:10.3f} {r['rmse_px']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
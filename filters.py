@@ -0,0 +1,204 @@
+"""Filters that turn noisy hand measurements into paddle positions.
+
+Every filter takes measurements with ``update(value, timestamp)`` and is
+asked for a position with ``predict(timestamp)``, which may be later than
+the last measurement (for example between inference runs).  Filters are
+picked by name with a spec string such as ``one_euro:min_cutoff=0.8,beta=0.02``
+(see ``make_filter``); ``filter_eval.py`` compares them offline.
+``update_from`` starts a freshly reset filter from the paddle's current
+position, so a hand that comes back is eased to rather than jumped to.
+"""
+import math
+
+
+class ExponentialFilter:
+    """Blend each measurement into the position with a fixed weight.
+
+    This is the game's original ``0.7 * old + 0.3 * new`` smoothing.
+    """
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        """Forget all measurements"""
+        self.position = None
+
+    def update(self, value, timestamp):
+        """Fold in a measurement"""
+        if self.position is None:
+            self.position = float(value)
+        else:
+            self.position += self.alpha * (value - self.position)
+        return self.position
+
+    def predict(self, timestamp):
+        """Latest smoothed position"""
+        return self.position
+
+
+class OneEuroFilter:
+    """One Euro filter (Casiez et al., CHI 2012).
+
+    A low-pass filter whose cutoff frequency rises with speed: slow,
+    jittery movement is smoothed heavily (``min_cutoff``, Hz) while fast
+    movement passes with little lag (``beta`` scales the cutoff with speed).
+    ``lookahead`` extrapolates predictions that many seconds ahead along the
+    filtered velocity to hide pipeline latency.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.01, d_cutoff=1.0, lookahead=0.0, max_horizon=0.15):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.lookahead = lookahead
+        self.max_horizon = max_horizon
+        self.reset()
+
+    def reset(self):
+        """Forget all measurements"""
+        self.position = None
+        self.velocity = 0.0
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(dt, cutoff):
+        """Smoothing factor for a first-order low-pass at cutoff Hz"""
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, value, timestamp):
+        """Fold in a measurement taken at timestamp"""
+        if self.position is None:
+            self.position = float(value)
+            self.velocity = 0.0
+            self.timestamp = timestamp
+            return self.position
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.position
+        self.timestamp = timestamp
+
+        raw_velocity = (value - self.position) / dt
+        self.velocity += self._alpha(dt, self.d_cutoff) * (raw_velocity - self.velocity)
+        cutoff = self.min_cutoff + self.beta * abs(self.velocity)
+        self.position += self._alpha(dt, cutoff) * (value - self.position)
+        return self.position
+
+    def predict(self, timestamp):
+        """Filtered position, extrapolated if lookahead is set"""
+        if self.position is None or not self.lookahead:
+            return self.position
+        dt = min(max(timestamp - self.timestamp + self.lookahead, 0.0), self.max_horizon)
+        return self.position + self.velocity * dt
+
+
+class ConstantVelocityKalman:
+    """1D Kalman filter with a constant-velocity motion model.
+
+    ``process_noise`` is the white-noise acceleration density (units^2/s^3)
+    and ``measurement_noise`` the variance of one measurement (units^2).
+    Predictions are extrapolated at most ``max_horizon`` seconds past the
+    last measurement so a lost hand does not fly off; ``lookahead`` adds a
+    fixed extra prediction time to hide pipeline latency.
+    """
+
+    def __init__(self, process_noise=3e5, measurement_noise=4.0, lookahead=0.0, max_horizon=0.15):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.lookahead = lookahead
+        self.max_horizon = max_horizon
+        self.reset()
+
+    def reset(self):
+        """Forget all measurements"""
+        self.position = None
+        self.velocity = 0.0
+        self.timestamp = None
+        # Covariance [[p00, p01], [p01, p11]]
+        self.p00 = self.p01 = self.p11 = 0.0
+
+    def _propagate(self, dt):
+        """Advance state and covariance by dt seconds"""
+        q = self.q
+        self.position += self.velocity * dt
+        p00 = self.p00 + 2 * dt * self.p01 + dt * dt * self.p11 + q * dt ** 3 / 3
+        p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2
+        p11 = self.p11 + q * dt
+        self.p00, self.p01, self.p11 = p00, p01, p11
+
+    def update(self, value, timestamp):
+        """Fold in a measurement taken at timestamp"""
+        if self.position is None:
+            self.position = float(value)
+            self.velocity = 0.0
+            self.timestamp = timestamp
+            self.p00 = self.r
+            self.p01 = 0.0
+            self.p11 = 1e6
+            return self.position
+
+        dt = timestamp - self.timestamp
+        if dt > 0:
+            self._propagate(dt)
+            self.timestamp = timestamp
+
+        # Correct with H = [1, 0]
+        s = self.p00 + self.r
+        k0 = self.p00 / s
+        k1 = self.p01 / s
+        innovation = value - self.position
+        self.position += k0 * innovation
+        self.velocity += k1 * innovation
+        self.p11 -= k1 * self.p01
+        self.p01 -= k0 * self.p01
+        self.p00 -= k0 * self.p00
+        return self.position
+
+    def predict(self, timestamp):
+        """Estimated position at timestamp (state is not modified)"""
+        if self.position is None:
+            return None
+        dt = min(max(timestamp - self.timestamp + self.lookahead, 0.0), self.max_horizon)
+        return self.position + self.velocity * dt
+
+
+FILTERS = {
+    'ema': ExponentialFilter,
+    'one_euro': OneEuroFilter,
+    'kalman': ConstantVelocityKalman,
+}
+
+
+def parse_filter_spec(spec):
+    """Split 'name:key=value,...' into (name, params)"""
+    name, _, options = spec.partition(':')
+    params = {}
+    for option in filter(None, options.split(',')):
+        key, _, value = option.partition('=')
+        params[key.strip()] = float(value)
+    return name.strip(), params
+
+
+def make_filter(spec, **params):
+    """Create a filter from a spec string like 'one_euro:beta=0.02'"""
+    name, spec_params = parse_filter_spec(spec)
+    if name not in FILTERS:
+        raise ValueError(f"Unknown filter '{name}' (choose from {', '.join(FILTERS)})")
+    spec_params.update(params)
+    return FILTERS[name](**spec_params)
+
+
+def update_from(paddle_filter, current, value, timestamp, seed_interval=1 / 60):
+    """Fold in value; a filter without measurements (just reset) first takes current.
+
+    The seed is dated seed_interval (one physics step) before timestamp, so
+    filters that need time between measurements fold value in too.  The
+    paddle then eases from where it is toward the re-acquired hand with the
+    filter's usual smoothing instead of jumping there.
+    """
+    if paddle_filter.predict(timestamp) is None:
+        paddle_filter.update(current, timestamp - seed_interval)
+    return paddle_filter.update(value, timestamp)
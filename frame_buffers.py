@@ -0,0 +1,41 @@
+"""Reusable output arrays for the per-frame image pipeline.
+
+OpenCV functions allocate a new result image on every call unless they are
+given a ``dst`` array of the right shape.  ``FrameBuffers`` hands out named
+arrays that are allocated once (and again only if the frame size changes),
+and counts every byte it allocates so steady-state churn can be checked.
+"""
+import cv2
+import numpy as np
+
+
+class FrameBuffers:
+    """Named, lazily allocated arrays reused from frame to frame"""
+
+    def __init__(self):
+        self._buffers = {}
+        self.bytes_allocated = 0
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """Array called name with the given shape, allocated only when needed"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+            self.bytes_allocated += buffer.nbytes
+            self.allocations += 1
+        return buffer
+
+    def mirror(self, frame):
+        """Horizontally flipped frame (valid until the next call)"""
+        return cv2.flip(frame, 1, dst=self.get('mirror', frame.shape, frame.dtype))
+
+    def rgb(self, frame):
+        """BGR frame converted to RGB (valid until the next call)"""
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.get('rgb', frame.shape, frame.dtype))
+
+    def resized(self, name, frame, width, height):
+        """Frame resized to width x height into a named buffer"""
+        dst = self.get(name, (height, width) + frame.shape[2:], frame.dtype)
+        return cv2.resize(frame, (width, height), dst=dst)
@@ -0,0 +1,127 @@
+"""Deadline-based frame pacing for the Tk main loop.
+
+Re-arming ``root.after(16, loop)`` at the end of every frame waits 16 ms
+*after* the work is done, so the real period is 16 ms plus the frame's work
+plus timer slop, and it drifts further the busier the machine is.
+``FrameScheduler`` aims every frame at a fixed grid of absolute deadlines
+on the monotonic clock instead, and only sleeps for whatever is left until
+the next one.  A frame that overruns is not queued up behind: if the next
+deadline was only just missed the next frame starts right away, otherwise
+the passed deadlines are counted as missed and merged into the next one
+still in the future.
+
+Work is registered as named tasks, run in order.  Essential tasks (input,
+physics, drawing the court) run every frame.  Optional tasks (camera
+preview, status labels, metrics) only run when their measured cost fits in
+the time left before the next deadline, and at least every ``max_skip``
+frames so they never starve.
+"""
+import time
+
+
+class FrameScheduler:
+    """Run registered tasks once per frame, paced against absolute deadlines"""
+
+    def __init__(self, root, interval=1 / 60, clock=time.perf_counter, on_error=None):
+        self.root = root
+        self.interval = interval
+        self.clock = clock
+        self.on_error = on_error  # called with (task name, exception)
+        self.tasks = []
+        self.deadline = None  # start time planned for the next frame
+        self._job = None
+
+        # Stats
+        self.frames = 0
+        self.missed = 0  # deadlines skipped because a frame overran them
+        self.late = 0  # frames started more than half an interval after their deadline
+        self.deferred = 0  # optional task runs put off for lack of time
+        self.lateness = 0.0  # smoothed seconds between deadline and frame start
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def add(self, name, func, essential=True, max_skip=10):
+        """Call func(now) every frame, or (optional tasks) when there is time for it.
+
+        An optional task returns False when it had nothing to do, so that
+        call is left out of its measured cost.
+        """
+        self.tasks.append({'name': name, 'func': func, 'essential': essential,
+                           'max_skip': max_skip, 'cost': 0.0, 'skipped': 0})
+
+    def start(self):
+        """Run the first frame now and keep going until stop()"""
+        self.stop()
+        self.deadline = self.clock()
+        self._tick()
+
+    def stop(self):
+        """Cancel the next frame (safe to call from inside a task)"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self.deadline = None
+
+    def stats(self):
+        """Pacing counters for metrics"""
+        return {
+            'frames': self.frames,
+            'missed': self.missed,
+            'late': self.late,
+            'deferred': self.deferred,
+            'lateness': self.lateness,
+        }
+
+    def _tick(self):
+        """One frame: run the tasks, then plan the next deadline"""
+        self._job = None
+        if self.deadline is None:
+            return
+        now = self.clock()
+        if now < self.deadline - 0.001:
+            # Tk timers only have millisecond resolution; wait out the rest
+            self._arm(now)
+            return
+
+        lateness = max(0.0, now - self.deadline)
+        self.lateness += 0.05 * (lateness - self.lateness)
+        if lateness > self.interval / 2:
+            self.late += 1
+        self.frames += 1
+        next_deadline = self.deadline + self.interval
+
+        for task in self.tasks:
+            if not task['essential'] and task['skipped'] < task['max_skip']:
+                if task['cost'] > next_deadline - self.clock():
+                    task['skipped'] += 1
+                    self.deferred += 1
+                    continue
+            started = self.clock()
+            try:
+                did_work = task['func'](now)
+            except Exception as e:
+                did_work = None
+                if self.on_error:
+                    self.on_error(task['name'], e)
+            if self.deadline is None:
+                return  # a task stopped the scheduler
+            if not task['essential']:
+                task['skipped'] = 0
+                if did_work is not False:
+                    task['cost'] += 0.2 * (self.clock() - started - task['cost'])
+
+        # Merge overrun frames into the next deadline instead of queueing them
+        end = self.clock()
+        self.deadline = next_deadline
+        if end - self.deadline > self.interval / 2:
+            passed = int((end - self.deadline) // self.interval) + 1
+            self.missed += passed
+            self.deadline += passed * self.interval
+        self._arm(end)
+
+    def _arm(self, now):
+        """Schedule _tick for the current deadline (rounded down: early is fixed up, late is not)"""
+        delay_ms = max(0, int((self.deadline - now) * 1000))
+        self._job = self.root.after(delay_ms, self._tick)
@@ -0,0 +1,134 @@
+"""Structured, rate-limited logging that stays off the game's hot path.
+
+Logging a message only appends a tuple to an in-memory ring buffer; a
+background thread formats and writes the buffered events.  Repeated events
+are rate-limited per key (the number suppressed is reported with the next
+one that gets through), and debug traces can be sampled.
+
+    log = GameLogger(level='INFO')
+    log.info('hands', "🖐️ Detected {count} hand(s)", count=2)
+    if log.sampled('landmarks'):
+        log.debug('landmarks', "hand at y={y:.3f}", y=0.42)
+"""
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+
+class GameLogger:
+    """Ring-buffered logger flushed by a background thread"""
+
+    def __init__(self, level='INFO', stream=None, json_format=False, capacity=4096,
+                 rate_limit=1.0, trace_sample=0.0, flush_interval=0.5):
+        self.level = LEVELS[level.upper()] if isinstance(level, str) else level
+        self.stream = stream or sys.stdout
+        self.json_format = json_format
+        self.rate_limit = rate_limit  # seconds between events with the same key
+        self.trace_sample = trace_sample  # fraction of sampled() calls that pass
+        self.flush_interval = flush_interval
+
+        self._buffer = deque(maxlen=capacity)
+        self._last_emit = {}
+        self._suppressed = {}
+        self.dropped = 0  # events lost because the ring buffer was full
+
+        self._wake = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._flush_loop, name="GameLogger", daemon=True)
+        self._thread.start()
+
+    def enabled(self, level):
+        """Whether events at level would be recorded"""
+        return level >= self.level
+
+    def sampled(self, key):
+        """Whether to record a sampled debug trace this time"""
+        return self.level <= LEVELS['DEBUG'] and self.trace_sample > 0 and random.random() < self.trace_sample
+
+    def log(self, level, event, message='', key=None, rate_limit=None, **fields):
+        """Record an event; message is a str.format template over fields.
+
+        Events sharing ``key`` (default: the event name) are let through at
+        most once per ``rate_limit`` seconds; pass 0 to log every occurrence.
+        """
+        if level < self.level:
+            return
+        key = key or event
+        limit = self.rate_limit if rate_limit is None else rate_limit
+        now = time.time()
+        if limit:
+            last = self._last_emit.get(key)
+            if last is not None and now - last < limit:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return
+            self._last_emit[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append((now, level, event, message, fields, suppressed))
+
+    def debug(self, event, message='', **fields):
+        self.log(LEVELS['DEBUG'], event, message, **fields)
+
+    def info(self, event, message='', **fields):
+        self.log(LEVELS['INFO'], event, message, **fields)
+
+    def warning(self, event, message='', **fields):
+        self.log(LEVELS['WARNING'], event, message, **fields)
+
+    def error(self, event, message='', **fields):
+        self.log(LEVELS['ERROR'], event, message, **fields)
+
+    def _format(self, record):
+        """Render one buffered event as a line"""
+        timestamp, level, event, message, fields, suppressed = record
+        try:
+            text = message.format(**fields)
+        except (KeyError, IndexError, ValueError):
+            text = message
+        if self.json_format:
+            data = {'time': round(timestamp, 3), 'level': LEVEL_NAMES[level], 'event': event, 'message': text}
+            data.update(fields)
+            if suppressed:
+                data['suppressed'] = suppressed
+            return json.dumps(data, default=str)
+        clock = time.strftime('%H:%M:%S', time.localtime(timestamp)) + f"{timestamp % 1:.3f}"[1:]
+        line = f"{clock} {LEVEL_NAMES[level]:<7} {text or event}"
+        if suppressed:
+            line += f" (+{suppressed} similar)"
+        return line
+
+    def flush(self):
+        """Write out everything buffered so far"""
+        lines = []
+        while self._buffer:
+            try:
+                lines.append(self._format(self._buffer.popleft()))
+            except IndexError:
+                break
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+    def _flush_loop(self):
+        """Background thread: flush periodically until closed"""
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Flush remaining events and stop the background thread"""
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        self.flush()
+        if self.stream not in (sys.stdout, sys.stderr):
+            self.stream.close()
@@ -0,0 +1,90 @@
+"""Hand gestures from landmark arrays, turned into game commands.
+
+``classify`` labels every hand in a (hands x 21 x 3) landmark array at once
+with a few vectorized distance comparisons.  Distances are measured in hand
+sizes (wrist to middle-finger knuckle), so they do not depend on how far
+the player stands from the camera:
+
+    pinch      thumb and index fingertips touching   -> 'serve'
+    open_palm  all five fingers spread               -> 'pause'
+    fist       all four fingers curled               -> 'reset'
+
+``GestureCommands`` fires a command only once a gesture has been held for
+``hold`` seconds, and at most once per ``cooldown``, so a hand shape passing
+by in the middle of a rally does not stop the game.
+"""
+import numpy as np
+
+from landmarks import WRIST, THUMB_TIP, INDEX_MCP, INDEX_TIP, MIDDLE_MCP, FINGER_PIPS, FINGER_TIPS
+
+NONE, PINCH, OPEN_PALM, FIST = range(4)
+GESTURE_NAMES = ('none', 'pinch', 'open_palm', 'fist')
+COMMANDS = {PINCH: 'serve', OPEN_PALM: 'pause', FIST: 'reset'}
+
+
+def classify(landmarks, aspect=4 / 3, pinch_distance=0.35, extended_ratio=1.15, thumb_spread=0.6):
+    """Gesture code per hand for (hands x 21 x 3) normalized landmarks.
+
+    aspect is the frame's width / height, so x and y distances compare.
+    """
+    points = landmarks[:, :, :2] * np.array([aspect, 1.0], dtype=np.float32)
+    wrist = points[:, WRIST:WRIST + 1]
+    scale = np.linalg.norm(points[:, MIDDLE_MCP] - points[:, WRIST], axis=-1)
+    valid = scale > 1e-3  # the blob tracker's single-point "hands" have no size
+    scale = np.where(valid, scale, 1.0)
+
+    # A finger is extended when its tip is well beyond its middle joint, seen from the wrist
+    tip_distance = np.linalg.norm(points[:, FINGER_TIPS] - wrist, axis=-1)
+    pip_distance = np.linalg.norm(points[:, FINGER_PIPS] - wrist, axis=-1)
+    extended = tip_distance > pip_distance * extended_ratio
+    curled = tip_distance < pip_distance
+
+    pinch_gap = np.linalg.norm(points[:, THUMB_TIP] - points[:, INDEX_TIP], axis=-1) / scale
+    thumb_out = np.linalg.norm(points[:, THUMB_TIP] - points[:, INDEX_MCP], axis=-1) / scale > thumb_spread
+
+    fist = curled.all(axis=1)
+    pinch = (pinch_gap < pinch_distance) & ~fist
+    open_palm = extended.all(axis=1) & thumb_out & ~pinch
+
+    codes = np.full(len(landmarks), NONE, dtype=np.int8)
+    codes[open_palm] = OPEN_PALM
+    codes[pinch] = PINCH
+    codes[fist] = FIST
+    codes[~valid] = NONE
+    return codes
+
+
+class GestureCommands:
+    """Turn per-frame gestures into debounced game commands"""
+
+    def __init__(self, hold=0.6, cooldown=1.5, aspect=4 / 3):
+        self.hold = hold
+        self.cooldown = cooldown
+        self.aspect = aspect
+        self.gesture = NONE  # gesture currently being held
+        self.since = None
+        self.fired = False
+        self.last_command_time = None
+
+    def update(self, landmarks, now):
+        """Command ('serve', 'pause' or 'reset') to run for this frame's landmarks, or None"""
+        gesture = NONE
+        if landmarks is not None and len(landmarks):
+            codes = classify(landmarks, aspect=self.aspect)
+            shown = codes[codes != NONE]
+            if len(shown):
+                gesture = int(shown[0])
+
+        if gesture != self.gesture:
+            self.gesture = gesture
+            self.since = now
+            self.fired = False
+            return None
+        if gesture == NONE or self.fired or now - self.since < self.hold:
+            return None
+        if self.last_command_time is not None and now - self.last_command_time < self.cooldown:
+            return None
+        # One command per hold: release the gesture to repeat it
+        self.fired = True
+        self.last_command_time = now
+        return COMMANDS[gesture]
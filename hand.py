@@ -1,49 +1,291 @@
-import cv2
-import mediapipe as mp
-import numpy as np
+from startup import BackgroundLoader, since_start
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
+import random
 import time
 
+from camera import CameraStream, open_capture
+from filters import make_filter
+import physics
+from renderer import CanvasRenderer, WidgetUpdater
+from frame_scheduler import FrameScheduler
+from metrics import GameMetrics, MetricsExporter
+from game_log import GameLogger
+from netplay import RollbackSession, UdpTransport
+from paddle_input import apply_hands, place_predicted_paddles, run_fixed_steps
+from hardware_profile import DEFAULT_PROFILE_PATH, PROFILE_KEYS, load_profile
+
+# OpenCV, MediaPipe, NumPy, PIL and the modules built on them take seconds to
+# import; load_heavy_modules() fills these in on a background thread
+cv2 = mp = np = None
+CameraPreview = FrameBuffers = None
+SessionRecorder = ReplaySource = None
+InferenceWorker = InferenceScheduler = None
+make_hand_tracker = warm_up_tracker = make_tracker = None
+RasterRenderer = TkImageSink = WindowSink = None
+GestureCommands = None
+
+
+def load_heavy_modules():
+    """Import the slow dependencies into this module's namespace"""
+    global cv2, mp, np, CameraPreview, FrameBuffers, SessionRecorder, ReplaySource
+    global InferenceWorker, InferenceScheduler, make_hand_tracker, warm_up_tracker, make_tracker
+    global RasterRenderer, TkImageSink, WindowSink, GestureCommands
+    import cv2
+    import mediapipe as mp
+    import numpy as np
+    from preview import CameraPreview
+    from frame_buffers import FrameBuffers
+    from recording import SessionRecorder, ReplaySource
+    from inference_worker import InferenceWorker, InferenceScheduler
+    from roi_tracking import make_hand_tracker, warm_up_tracker
+    from trackers import make_tracker
+    from raster_renderer import RasterRenderer, TkImageSink, WindowSink
+    from gestures import GestureCommands
+
+# Default settings (override by passing a dict to HandPongGame)
+DEFAULT_CONFIG = {
+    'camera_index': 0,
+    'camera_width': 640,
+    'camera_height': 480,
+    'camera_fps': 30,
+    'hardware_profile': DEFAULT_PROFILE_PATH,  # installer benchmark results to tune from (None = ignore)
+    'camera_keep_open': 0,  # seconds to keep the camera open between matches (0 = release at stop)
+    'record_path': None,  # record camera frames and landmarks to this directory
+    'replay_path': None,  # play a recording instead of opening the camera
+    'replay_realtime': True,  # False = deliver every recorded frame as fast as possible
+    'inference_mode': 'inline',  # 'inline' or 'process'
+    'model_complexity': 1,  # MediaPipe hand model: 0 = fast, 1 = accurate
+    'inference_every': 1,  # run inference on every Nth camera frame, or 'auto'
+    'paddle_filter': None,  # filters.make_filter spec; None = 'ema', or 'kalman' when skipping frames
+    'hand_trace_file': None,  # CSV of hand measurements for filter_eval.py
+    'gestures': False,  # pinch = serve/resume, open palm = pause, fist = reset (held briefly)
+    'roi_tracking': False,  # True or a dict of roi_tracking.DEFAULT_ROI_OPTIONS overrides
+    'tracker': 'mediapipe',  # 'mediapipe', 'blob' (skin color, cheap) or 'auto' (switch on latency)
+    'tracker_options': None,  # {'blob': {...}, 'auto': {...}} overrides of trackers.DEFAULT_*_OPTIONS
+    'physics_hz': 60,  # fixed simulation rate
+    'render_interval_ms': 1000 / 60,  # time between frame deadlines
+    'max_physics_steps': 5,  # per rendered frame, to avoid a spiral of death
+    'preview_fps': 30,  # camera preview refresh rate (can be lower than the game)
+    'renderer': 'canvas',  # 'canvas' (Tk items), 'raster' (one NumPy image on the canvas) or 'window' (OpenCV)
+    'render_size': None,  # (width, height) of the 'window' renderer's output; None = game size
+    'render_fullscreen': False,  # show the 'window' renderer fullscreen
+    'render_pip': False,  # camera picture-in-picture on the court (raster renderers)
+    'metrics_overlay': False,  # draw live performance numbers on the game canvas
+    'metrics_file': None,  # write Prometheus-style metrics to this file
+    'metrics_port': None,  # serve metrics on http://127.0.0.1:<port>/metrics
+    'metrics_interval': 1.0,  # seconds between metrics exports
+    'log_level': 'INFO',  # DEBUG, INFO, WARNING or ERROR
+    'log_file': None,  # write game events here instead of stdout
+    'log_json': False,  # one JSON object per line instead of text
+    'log_rate_limit': 1.0,  # seconds between repeats of the same event
+    'log_trace_sample': 0.0,  # fraction of frames with a DEBUG landmark trace
+    'seed': None,  # serve randomness; None = different every run (online: 0 unless set)
+    'net_peer': None,  # 'host:port' of the other player for an online match
+    'net_port': 5005,  # local UDP port
+    'net_side': 'left',  # paddle this player controls online
+    'net_input_delay': 2,  # physics steps of local input delay online (fewer rollbacks)
+}
+
+START_BUTTON_TEXT = "🎮 START GAME\n📹 Turn ON Camera\n✋ Enable Hand Control"
+CAMERA_OFF_TEXT = "📷 Camera is OFF\n\n🎮 Click START GAME\nto turn on camera\n\n✋ Show both hands\nfor best control"
+
 class HandPongGame:
-    def __init__(self):
-        # Initialize MediaPipe with better settings
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,  # Detect both hands
-            min_detection_confidence=0.3,  # Lower threshold for better detection
-            min_tracking_confidence=0.3
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, config=None):
+        self.config = dict(DEFAULT_CONFIG)
+        # Settings from the installer's hardware benchmark, unless given explicitly
+        profile_path = (config or {}).get('hardware_profile', DEFAULT_CONFIG['hardware_profile'])
+        self.profile = load_profile(profile_path) if profile_path else None
+        if self.profile:
+            self.config.update(self.profile['config'])
+            print(f"🧰 Tuned by {profile_path} ({self.profile['created']}): "
+                  + ", ".join(f"{key}={value}" for key, value in self.profile['config'].items()))
+        if config:
+            self.config.update(config)
+            
+        # Hand tracking is loaded in the background (see load_models)
+        self.mp_hands = None
+        self.hands = None
+        self.tracker = None  # trackers.* backend used for inline inference
+        self.tracker_name = None
+        self.inference = None
+        self.models_ready = False
+        self.startup_seconds = None
         
         # Game state
         self.game_running = False
+        self.paused = False  # by gesture; physics stops, hand tracking continues
+        self.gestures = None  # GestureCommands, created once hand tracking has loaded
         self.left_hand_detected = False
         self.right_hand_detected = False
-        self.score = {'player1': 0, 'player2': 0}
         
-        # Game objects
+        # Game objects (rules and state live in physics.py)
         self.canvas_width = 600
         self.canvas_height = 400
-        self.ball = {
-            'x': self.canvas_width // 2,
-            'y': self.canvas_height // 2,
-            'dx': 4,
-            'dy': 4,
-            'radius': 8
-        }
-        self.paddle1 = {'x': 10, 'y': 180, 'width': 8, 'height': 80}
-        self.paddle2 = {'x': 582, 'y': 180, 'width': 8, 'height': 80}
+        self.rules = physics.make_rules(width=self.canvas_width, height=self.canvas_height)
+        seed = self.config['seed']
+        self.rng = physics.SeededRng(random.getrandbits(64) if seed is None else seed)
+        self.net = None  # RollbackSession during an online match
+        self.state = physics.new_state(self.rules)
+        self.ball = self.state['ball']
+        self.paddle1 = self.state['paddle1']
+        self.paddle2 = self.state['paddle2']
+        self.score = self.state['score']
         self.paddle_speed = 6
         
+        # Fixed-timestep simulation (positions before the last step are kept for interpolation)
+        self.physics_dt = 1.0 / self.config['physics_hz']
+        self.accumulator = 0.0
+        self.last_loop_time = None
+        self.prev_positions = self.snapshot_positions()
+        
         # Camera
         self.cap = None
-        self.current_frame = None
+        self.camera = None
+        self.camera_opener = None  # BackgroundLoader while the camera is being opened
+        self.camera_release_job = None  # Tk timer releasing an idle camera
+        self.frame_buffers = None  # reused flip/RGB/resize outputs
+        self.preview_frame = None  # newest mirrored frame, until the preview shows it
+        self.raster_renderer = None  # RasterRenderer replacing the canvas items, if enabled
+        self.frame_timestamp = None
+        self.recorder = None
+        self.hand_landmarks = None  # last (hands x 21 x 3) landmarks, normalized
+        self.hand_result_age = None  # seconds between capture and result
+        
+        # Per-frame diagnostics go through a buffered, rate-limited logger
+        self.log = GameLogger(
+            level=self.config['log_level'],
+            stream=open(self.config['log_file'], 'a') if self.config['log_file'] else None,
+            json_format=self.config['log_json'],
+            rate_limit=self.config['log_rate_limit'],
+            trace_sample=self.config['log_trace_sample']
+        )
+        
+        # Performance instrumentation
+        self.metrics = GameMetrics()
+        self.metrics_exporter = None
+        if self.config['metrics_file'] or self.config['metrics_port'] is not None:
+            self.metrics_exporter = MetricsExporter(
+                self.metrics,
+                path=self.config['metrics_file'],
+                port=self.config['metrics_port'],
+                interval=self.config['metrics_interval']
+            )
+        self.last_overlay_update = 0.0
+        
+        # Inference frame skipping, with predicted paddles in between
+        self.scheduler = None
+        
+        # Input filter per hand-controlled paddle
+        filter_spec = self.config['paddle_filter']
+        if filter_spec is None:
+            filter_spec = 'ema' if self.config['inference_every'] == 1 else 'kalman'
+        self.paddle_filters = {'paddle1': make_filter(filter_spec), 'paddle2': make_filter(filter_spec)}
+        self.hand_trace = None
+        if self.config['hand_trace_file']:
+            self.hand_trace = open(self.config['hand_trace_file'], 'w')
+            self.hand_trace.write("timestamp,paddle,target_y\n")
         
-        # Setup UI
+        # Setup UI, then load hand tracking while the window is already usable
         self.setup_ui()
+        self.preview = None
+        print(f"🪟 Window ready after {since_start():.2f}s, loading hand tracking...")
+        self.loader = BackgroundLoader(self.load_models, name="ModelLoader").start()
+        self.root.after(50, self.check_loader)
+        
+    def hands_options(self):
+        """Options for the MediaPipe Hands model"""
+        return {
+            'model_complexity': self.config['model_complexity'],
+            'min_detection_confidence': 0.3,  # Lower threshold for better detection
+            'min_tracking_confidence': 0.3
+        }
+        
+    def load_models(self):
+        """Import heavy modules, build the hand tracker and warm it up (background thread)"""
+        load_heavy_modules()
+        mp_hands = mp.solutions.hands
+        hands_options = self.hands_options()
+        frame_shape = (self.config['camera_height'], self.config['camera_width'], 3)
+        models = {'mp_hands': mp_hands, 'hands': None, 'tracker': None, 'inference': None}
+        tracker = self.config['tracker']
+        if self.config['inference_mode'] == 'process':
+            if tracker != 'mediapipe':
+                print(f"⚠️ The {tracker} tracker runs inline only; the worker process uses MediaPipe")
+            # Run the model on another core; frames and landmarks go through shared memory
+            models['inference'] = InferenceWorker(
+                frame_shape=frame_shape,
+                max_num_hands=2,
+                roi=self.config['roi_tracking'],
+                **hands_options
+            ).start()
+            # The worker warms its model up before reporting ready
+            if not models['inference'].wait_ready(timeout=60):
+                models['inference'].close()
+                raise RuntimeError("hand tracking worker did not start")
+        else:
+            if tracker != 'blob':
+                models['hands'] = make_hand_tracker(
+                    mp_hands,
+                    max_num_hands=2,  # Detect both hands
+                    roi=self.config['roi_tracking'],
+                    **hands_options
+                )
+                # The first inferences initialize the graph; do them before START
+                warm_up_tracker(models['hands'], frame_shape)
+            models['tracker'] = make_tracker(tracker, models['hands'], **(self.config['tracker_options'] or {}))
+        return models
+        
+    def check_loader(self):
+        """Finish startup on the Tk thread once the background loader is done"""
+        if not self.loader.done:
+            self.root.after(50, self.check_loader)
+            return
+        if self.loader.error:
+            print(f"❌ Error loading hand tracking: {self.loader.error}")
+            print("pip install opencv-python mediapipe pillow numpy")
+            self.camera_preview.config(text="❌ Hand tracking\nfailed to load")
+            messagebox.showerror("Error", f"Failed to load hand tracking:\n{self.loader.error}")
+            return
+            
+        models = self.loader.result
+        self.mp_hands = models['mp_hands']
+        self.hands = models['hands']
+        self.tracker = models['tracker']
+        self.tracker_name = getattr(self.tracker, 'name', None)
+        self.inference = models['inference']
+        self.frame_buffers = FrameBuffers()
+        self.scheduler = InferenceScheduler(self.config['inference_every'])
+        if self.config['gestures']:
+            self.gestures = GestureCommands(aspect=self.config['camera_width'] / self.config['camera_height'])
+        self.preview = CameraPreview(
+            self.camera_preview,
+            size=(240, 180),
+            fps=self.config['preview_fps'],
+            connections=self.mp_hands.HAND_CONNECTIONS
+        )
+        self.preview.detach(CAMERA_OFF_TEXT)
+        if self.config['renderer'] != 'canvas':
+            self.use_raster_renderer()
+        self.start_stop_button.config(text=START_BUTTON_TEXT, state=tk.NORMAL)
+        
+        self.models_ready = True
+        self.startup_seconds = since_start()
+        self.metrics.gauges['startup_seconds'] = self.startup_seconds
+        print(f"✅ Hand tracking ready after {self.startup_seconds:.2f}s "
+              f"(loaded and warmed up in {self.loader.elapsed:.2f}s)")
+        
+    def use_raster_renderer(self):
+        """Draw the game into one NumPy image, shown on the canvas or in an OpenCV window"""
+        if self.config['renderer'] == 'window':
+            sink = WindowSink("Hand Pong", fullscreen=self.config['render_fullscreen'])
+            size = self.config['render_size']
+        else:
+            sink = TkImageSink(self.canvas)
+            size = None
+        self.raster_renderer = RasterRenderer(self.canvas_width, self.canvas_height, size=size, sink=sink)
+        self.renderer = self.raster_renderer
+        self.draw_game()
         
     def setup_ui(self):
         """Setup the Tkinter UI"""
@@ -133,6 +375,22 @@ class HandPongGame:
             highlightbackground='#22c55e'
         )
         self.canvas.pack()
+        self.renderer = CanvasRenderer(self.canvas, self.canvas_width, self.canvas_height)
+        self.widgets = WidgetUpdater()
+        
+        # Frames are paced against deadlines; input, physics and drawing come first
+        self.frame_scheduler = FrameScheduler(
+            self.root,
+            interval=self.config['render_interval_ms'] / 1000,
+            on_error=lambda task, e: self.log.error('game_loop_error', "⚠️ Game loop error ({task}): {error}",
+                                                    task=task, error=e)
+        )
+        self.frame_scheduler.add('input', self.update_input)
+        self.frame_scheduler.add('physics', self.update_physics)
+        self.frame_scheduler.add('draw', lambda now: self.draw_game(self.accumulator / self.physics_dt))
+        self.frame_scheduler.add('preview', self.update_camera_preview, essential=False)
+        self.frame_scheduler.add('status', self.update_display, essential=False)
+        self.frame_scheduler.add('metrics', self.update_metrics, essential=False)
         
         # Instructions
         instructions_frame = tk.Frame(main_container, bg='#374151', padx=15, pady=10)
@@ -166,7 +424,7 @@ class HandPongGame:
         
         self.camera_preview = tk.Label(
             camera_container,
-            text="📷 Camera is OFF\n\n🎮 Click START GAME\nto turn on camera\n\n✋ Show both hands\nfor best control",
+            text="⏳ Loading hand tracking...",
             width=30,
             height=12,
             bg='#1f2937',
@@ -183,7 +441,8 @@ class HandPongGame:
         # START/STOP button
         self.start_stop_button = tk.Button(
             button_container,
-            text="🎮 START GAME\n📹 Turn ON Camera\n✋ Enable Hand Control",
+            text="⏳ LOADING...\n✋ Preparing Hand Tracking",
+            state=tk.DISABLED,
             font=('Arial', 14, 'bold'),
             bg='#22c55e',
             fg='white',
@@ -251,6 +510,8 @@ class HandPongGame:
     def toggle_game(self):
         """Toggle game on/off"""
         if not self.game_running:
+            if not self.models_ready or self.camera_opener:
+                return
             self.start_game()
         else:
             self.stop_game()
@@ -260,49 +521,136 @@ class HandPongGame:
         print("🎮 Starting Hand Pong Game...")
         
         try:
-            # Initialize camera
-            print("📹 Initializing camera...")
-            self.cap = cv2.VideoCapture(0)
-            
-            if not self.cap.isOpened():
-                messagebox.showerror(
-                    "❌ Camera Error", 
-                    "Cannot access camera!\n\n"
-                    "Troubleshooting:\n"
-                    "• Make sure camera is connected\n"
-                    "• Close other apps using camera\n"
-                    "• Check camera permissions\n"
-                    "• Try restarting the application"
-                )
+            if self.config['replay_path']:
+                # Recorded session instead of a live camera
+                print(f"📼 Replaying {self.config['replay_path']}...")
+                self.camera = ReplaySource(self.config['replay_path'],
+                                           realtime=self.config['replay_realtime']).start()
+            elif self.camera:
+                # Camera kept open since the last match: resume capturing
+                self.cancel_camera_release()
+                print("📹 Camera already open, resuming")
+                self.camera.start()
+            else:
+                # Opening can take a second; begin_match() runs once it is done
+                self.open_camera()
                 return
                 
-            # Set camera properties for better performance
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
-            
-            # Update game state
-            self.game_running = True
-            self.reset_game()
+            self.begin_match()
             
-            # Update UI
-            self.start_stop_button.config(
-                text="🛑 STOP GAME\n📹 Turn OFF Camera\n⏹️ Stop Hand Control",
-                bg='#ef4444',
-                activebackground='#dc2626'
-            )
+        except Exception as e:
+            print(f"❌ Error starting game: {e}")
+            messagebox.showerror("Error", f"Failed to start game:\n{str(e)}")
             
-            self.camera_status.config(
-                text="📹 Camera: ON ✅",
-                fg='#22c55e'
-            )
+    def begin_match(self):
+        """Start recording and the game loop once the camera is available"""
+        transport = None
+        if self.config['net_peer']:
+            # Bind before touching any game state: the port may be taken or the peer unknown
+            try:
+                transport = UdpTransport(self.config['net_port'], self.config['net_peer'])
+            except OSError as e:
+                self.abort_match_start(f"Cannot open UDP port {self.config['net_port']} "
+                                       f"for {self.config['net_peer']}: {e}")
+                return
             
-            # Start game loop
-            self.game_loop()
+        if self.config['record_path']:
+            print(f"⏺️ Recording to {self.config['record_path']}")
+            self.recorder = SessionRecorder(self.config['record_path'])
             
-            print("✅ Game started successfully!")
-            print("✋ Show your hands to the camera to control the paddles!")
+        # Update game state
+        self.game_running = True
+        self.paused = False
+        self.reset_game()
+        if transport:
+            # Online: only inputs are exchanged; both sides simulate the same seeded match
+            self.net = RollbackSession(
+                transport,
+                local_side=self.config['net_side'],
+                seed=self.config['seed'] or 0,
+                rules=self.rules,
+                state=self.state,
+                input_delay=self.config['net_input_delay']
+            )
+            self.prev_positions = self.snapshot_positions()
+            print(f"🌐 Playing the {self.config['net_side']} paddle against {self.config['net_peer']} "
+                  f"(UDP port {self.config['net_port']})")
+        self.accumulator = 0.0
+        self.last_loop_time = time.perf_counter()
+        
+        # Update UI
+        self.start_stop_button.config(
+            text="🛑 STOP GAME\n📹 Turn OFF Camera\n⏹️ Stop Hand Control",
+            bg='#ef4444',
+            activebackground='#dc2626',
+            state=tk.NORMAL
+        )
+        
+        self.widgets.set(
+            self.camera_status,
+            text="📹 Camera: ON ✅",
+            fg='#22c55e'
+        )
+        
+        # Start game loop
+        self.frame_scheduler.start()
+        
+        print("✅ Game started successfully!")
+        print("✋ Show your hands to the camera to control the paddles!")
+        
+    def abort_match_start(self, message):
+        """Report why a match could not start and put the camera and UI back to idle"""
+        print(f"❌ Error starting game: {message}")
+        if self.camera:
+            self.camera.release()
+            self.camera = None
+            self.cap = None
+        self.start_stop_button.config(text=START_BUTTON_TEXT, state=tk.NORMAL)
+        self.widgets.set(self.camera_status, text="📹 Camera: OFF", fg='#ef4444')
+        messagebox.showerror("Error", f"Failed to start game:\n{message}")
+        
+    def open_camera(self):
+        """Open the camera on a background thread, then start the match"""
+        # Initialize camera
+        print("📹 Initializing camera...")
+        self.camera_opener = BackgroundLoader(
+            lambda: open_capture(self.config), name="CameraOpener"
+        ).start()
+        self.start_stop_button.config(text="⏳ OPENING CAMERA...", state=tk.DISABLED)
+        self.widgets.set(self.camera_status, text="📹 Camera: OPENING ⏳", fg='#facc15')
+        self.root.after(50, self.check_camera_open)
+        
+    def check_camera_open(self):
+        """Poll the camera opener from the Tk thread"""
+        opener = self.camera_opener
+        if not opener.done:
+            self.root.after(50, self.check_camera_open)
+            return
+        self.camera_opener = None
+        
+        if opener.error or opener.result is None:
+            if opener.error:
+                print(f"❌ Error opening camera: {opener.error}")
+            self.start_stop_button.config(text=START_BUTTON_TEXT, state=tk.NORMAL)
+            self.widgets.set(self.camera_status, text="📹 Camera: OFF", fg='#ef4444')
+            messagebox.showerror(
+                "❌ Camera Error", 
+                "Cannot access camera!\n\n"
+                "Troubleshooting:\n"
+                "• Make sure camera is connected\n"
+                "• Close other apps using camera\n"
+                "• Check camera permissions\n"
+                "• Try restarting the application"
+            )
+            return
             
+        print(f"📹 Camera opened in {opener.elapsed:.2f}s")
+        self.cap = opener.result
+        
+        # Drain the camera on a background thread
+        self.camera = CameraStream(self.cap).start()
+        try:
+            self.begin_match()
         except Exception as e:
             print(f"❌ Error starting game: {e}")
             messagebox.showerror("Error", f"Failed to start game:\n{str(e)}")
@@ -312,285 +660,421 @@ class HandPongGame:
         print("🛑 Stopping game...")
         
         self.game_running = False
+        self.frame_scheduler.stop()
+        self.preview_frame = None
         
-        # Release camera
-        if self.cap:
+        # Release camera, or keep it open for a while so the next match starts instantly
+        keep_open = self.config['camera_keep_open']
+        if isinstance(self.camera, CameraStream) and keep_open:
+            self.camera.stop()
+            print(f"📹 Camera frames: {self.camera.frames_captured} captured, "
+                  f"{self.camera.dropped_frames} dropped (camera kept open for {keep_open:g}s)")
+            self.camera_release_job = self.root.after(int(keep_open * 1000), self.release_camera)
+        elif self.camera:
+            self.camera.release()
+            print(f"📹 Camera frames: {self.camera.frames_captured} captured, "
+                  f"{self.camera.dropped_frames} dropped")
+            self.camera = None
+            self.cap = None
+        elif self.cap:
             self.cap.release()
             self.cap = None
             
+        if self.recorder:
+            self.recorder.close()
+            print(f"⏺️ Recorded {self.recorder.frame_count} frames")
+            self.recorder = None
+            
+        if self.net:
+            stats = self.net.stats()
+            print(f"🌐 Online match: {stats['rollbacks']} rollbacks "
+                  f"(max {stats['max_rollback_depth']} steps), {stats['stalls']} stalls")
+            self.net.close()
+            self.net = None
+            
         # Update UI
         self.start_stop_button.config(
-            text="🎮 START GAME\n📹 Turn ON Camera\n✋ Enable Hand Control",
+            text=START_BUTTON_TEXT,
             bg='#22c55e',
             activebackground='#16a34a'
         )
         
-        self.camera_status.config(
-            text="📹 Camera: OFF",
-            fg='#ef4444'
+        self.widgets.set(
+            self.camera_status,
+            text="📹 Camera: STANDBY" if self.camera else "📹 Camera: OFF",
+            fg='#facc15' if self.camera else '#ef4444'
         )
         
-        self.left_hand_status.config(
+        self.widgets.set(
+            self.left_hand_status,
             text="👈 Left Hand: ❌",
             fg='#ef4444'
         )
         
-        self.right_hand_status.config(
+        self.widgets.set(
+            self.right_hand_status,
             text="👉 Right Hand: ❌",
             fg='#ef4444'
         )
         
         # Clear camera preview
-        self.camera_preview.config(
-            text="📷 Camera is OFF\n\n🎮 Click START GAME\nto turn on camera\n\n✋ Show both hands\nfor best control",
-            image=''
-        )
+        self.preview.detach(CAMERA_OFF_TEXT)
+        if self.raster_renderer:
+            self.raster_renderer.set_picture(None)
+            self.draw_game()
         
         self.left_hand_detected = False
         self.right_hand_detected = False
+        self.hand_landmarks = None
         print("✅ Game stopped!")
         
+    def release_camera(self):
+        """Release a camera left open after a match"""
+        self.camera_release_job = None
+        if self.game_running or not self.camera:
+            return
+        self.camera.release()
+        self.camera = None
+        self.cap = None
+        print("📹 Camera released after idle timeout")
+        self.widgets.set(self.camera_status, text="📹 Camera: OFF", fg='#ef4444')
+        
+    def cancel_camera_release(self):
+        """Keep an idle camera open (a new match is starting)"""
+        if self.camera_release_job:
+            self.root.after_cancel(self.camera_release_job)
+            self.camera_release_job = None
+        
     def reset_game(self):
         """Reset game state"""
-        self.score = {'player1': 0, 'player2': 0}
-        self.ball['x'] = self.canvas_width // 2
-        self.ball['y'] = self.canvas_height // 2
-        self.ball['dx'] = 4 * (1 if np.random.random() > 0.5 else -1)
-        self.ball['dy'] = 4 * (1 if np.random.random() > 0.5 else -1)
-        
-    def game_loop(self):
-        """Main game loop"""
-        if not self.game_running:
+        self.score['player1'] = 0
+        self.score['player2'] = 0
+        physics.serve(self.ball, self.rules, self.rng)
+        self.prev_positions = self.snapshot_positions()
+        
+    def update_input(self, now):
+        """Read the camera, track hands and move hand-controlled paddles (every frame)"""
+        self.accumulator += now - self.last_loop_time
+        self.last_loop_time = now
+        self.metrics.loop_tick(now)
+        
+        # Process camera and hands
+        self.process_camera()
+        self.update_predicted_paddles()
+        
+    def update_physics(self, now):
+        """Advance physics in fixed steps so game speed does not depend on frame rate"""
+        if self.paused:
+            # Draw what is there now: hand-driven paddles keep moving while the ball waits
+            self.accumulator = 0.0
+            self.prev_positions = self.snapshot_positions()
             return
-            
-        try:
-            # Process camera and hands
-            self.process_camera()
-            
-            # Update game physics
+        self.accumulator = run_fixed_steps(self.accumulator, self.physics_dt, self.config['max_physics_steps'],
+                                           self.physics_step)
+        
+    def physics_step(self):
+        """One fixed physics step, keeping the positions before it for interpolation"""
+        self.prev_positions = self.snapshot_positions()
+        if self.net:
+            self.update_net_game()
+        else:
             self.update_game()
             
-            # Update display
-            self.update_display()
+    def update_metrics(self, now):
+        """Refresh the metrics overlay and exports (a few times per second at most)"""
+        self.metrics.frame_schedule(self.frame_scheduler.stats())
+        if self.config['metrics_overlay'] and now - self.last_overlay_update >= 0.25:
+            self.last_overlay_update = now
+            self.renderer.draw_overlay(self.metrics.summary())
+        if self.metrics_exporter:
+            if self.net:
+                for key, value in self.net.stats().items():
+                    self.metrics.gauges['net_' + key] = value
+            self.metrics_exporter.maybe_export(now)
             
-        except Exception as e:
-            print(f"⚠️ Game loop error: {e}")
-            
-        # Continue loop at 60 FPS
-        self.root.after(16, self.game_loop)
+    def snapshot_positions(self):
+        """Positions of the moving objects, used for render interpolation"""
+        return {
+            'ball': (self.ball['x'], self.ball['y']),
+            'paddle1': self.paddle1['y'],
+            'paddle2': self.paddle2['y']
+        }
         
     def process_camera(self):
         """Process camera and detect hands"""
-        if not self.cap:
+        if not self.camera:
             return
             
-        ret, frame = self.cap.read()
-        if not ret:
-            print("⚠️ Failed to read camera frame")
+        # Newest frame from the capture thread (None if nothing new yet)
+        frame, timestamp = self.camera.read()
+        if frame is None:
+            if getattr(self.camera, 'finished', False):
+                print("📼 Replay finished")
+                self.stop_game()
             return
+        self.frame_timestamp = timestamp
+        self.metrics.camera_frame(timestamp, self.camera.dropped_frames)
+        if self.recorder:
+            self.recorder.write_frame(frame, timestamp)
             
-        # Flip for mirror effect
-        frame = cv2.flip(frame, 1)
-        self.current_frame = frame.copy()
+        # Flip for mirror effect (into a reused buffer)
+        frame = self.frame_buffers.mirror(frame)
         
-        # Convert to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        self.scheduler.note_frame(timestamp)
+        if self.inference:
+            self.process_hands_async(frame, timestamp)
+        elif self.scheduler.should_run():
+            started = time.perf_counter()
+            self.process_hands_inline(frame, timestamp)
+            latency = time.perf_counter() - started
+            self.scheduler.record_latency(latency)
+            self.metrics.inference(latency)
         
-        # Process hands
-        results = self.hands.process(rgb_frame)
+        # The preview is refreshed by its own (optional) frame task.  The mirror buffer
+        # is reused by the next frame, so only hand it over while the preview is due
+        self.preview_frame = frame if self.preview.due() else None
         
-        # Reset hand detection
-        self.left_hand_detected = False
-        self.right_hand_detected = False
+        # Steady state should allocate nothing per frame
+        self.metrics.frame_allocations(
+            self.frame_buffers.bytes_allocated + getattr(self.camera, 'bytes_allocated', 0)
+        )
         
-        if results.multi_hand_landmarks and results.multi_handedness:
-            print(f"🖐️ Detected {len(results.multi_hand_landmarks)} hand(s)")
-            
-            for i, (landmarks, handedness) in enumerate(zip(results.multi_hand_landmarks, results.multi_handedness)):
-                # Determine if it's left or right hand
-                hand_label = handedness.classification[0].label
-                
-                # Get hand position (using middle finger tip - landmark 12)
-                middle_finger = landmarks.landmark[12]
-                
-                # Convert to pixel coordinates
-                h, w, _ = frame.shape
-                hand_x = middle_finger.x * w
-                hand_y = middle_finger.y * h
-                
-                # Map to paddle position
-                paddle_y = (hand_y / h) * self.canvas_height
-                target_y = max(0, min(paddle_y - 40, self.canvas_height - 80))
-                
-                # Control paddles based on hand
-                if hand_label == "Left":  # User's left hand (appears on right side of mirrored image)
-                    self.right_hand_detected = True
-                    # Smooth movement for right paddle
-                    self.paddle2['y'] = int(self.paddle2['y'] * 0.7 + target_y * 0.3)
-                    print(f"👉 Right hand detected at y={int(hand_y)}")
-                    
-                elif hand_label == "Right":  # User's right hand (appears on left side of mirrored image)
-                    self.left_hand_detected = True
-                    # Smooth movement for left paddle
-                    self.paddle1['y'] = int(self.paddle1['y'] * 0.7 + target_y * 0.3)
-                    print(f"👈 Left hand detected at y={int(hand_y)}")
-                
-                # Draw hand landmarks on frame
-                self.mp_draw.draw_landmarks(frame, landmarks, self.mp_hands.HAND_CONNECTIONS)
+    def process_hands_inline(self, frame, timestamp):
+        """Run the hand tracker on the game thread"""
+        # Convert to RGB for MediaPipe
+        rgb_frame = self.frame_buffers.rgb(frame)
         
-        # Update camera preview
-        self.update_camera_preview(frame)
+        # Process hands (landmarks are kept for drawing on the preview)
+        result = self.tracker.track(rgb_frame)
+        self.hand_landmarks = result['landmarks']
         
-    def update_camera_preview(self, frame):
-        """Update camera preview with current frame"""
+        if self.tracker.name != self.tracker_name:
+            self.tracker_name = self.tracker.name
+            self.log.info('tracker_switch', "🔀 Hand tracker: {tracker} ({reason})",
+                          tracker=self.tracker_name, reason=getattr(self.tracker, 'reason', ''), rate_limit=0)
+        self.apply_hand_positions(result['hands'], frame.shape[0], timestamp)
+        
+    def process_hands_async(self, frame, timestamp):
+        """Feed the inference worker and apply its latest result"""
         try:
-            # Resize frame for preview (bigger size)
-            preview_frame = cv2.resize(frame, (240, 180))
-            preview_frame = cv2.cvtColor(preview_frame, cv2.COLOR_BGR2RGB)
+            buffer = self.inference.acquire_frame_buffer()
+            if buffer is not None and self.scheduler.should_run():
+                if frame.shape[:2] != buffer.shape[:2]:
+                    frame_for_model = self.frame_buffers.resized('model_input', frame, buffer.shape[1], buffer.shape[0])
+                else:
+                    frame_for_model = frame
+                # Convert straight into the shared buffer
+                cv2.cvtColor(frame_for_model, cv2.COLOR_BGR2RGB, dst=buffer)
+                self.inference.submit(timestamp)
+                
+            result = self.inference.poll()
+        except RuntimeError as e:
+            self.fall_back_to_inline(e)
+            return
+        if result is not None:
+            if result['error']:
+                self.log.warning('inference_error', "⚠️ Hand tracking failed on a frame: {error}",
+                                 rate_limit=5.0, error=result['error'], errors=self.inference.errors)
+            self.hand_result_age = time.monotonic() - result['timestamp']
+            self.scheduler.record_latency(result['latency'])
+            self.metrics.inference(result['latency'])
+            self.hand_landmarks = result['landmarks']
+            # Get hand position (using middle finger tip - landmark 12)
+            hands = list(zip(result['labels'], result['landmarks'][:, 12, 1]))
+            self.apply_hand_positions(hands, frame.shape[0], result['timestamp'])
+            
+    def fall_back_to_inline(self, error):
+        """Replace a dead inference worker with MediaPipe on the game thread"""
+        self.log.error('inference_worker_died', "❌ {error}; tracking hands inline from now on", error=error)
+        self.inference.close()
+        self.inference = None
+        self.hands = make_hand_tracker(self.mp_hands, max_num_hands=2, roi=self.config['roi_tracking'],
+                                       **self.hands_options())
+        self.tracker = make_tracker('mediapipe', self.hands)
+        self.tracker_name = self.tracker.name
+        
+    def apply_hand_positions(self, hands, frame_height, timestamp):
+        """Move paddles from (handedness label, normalized y) pairs seen at timestamp"""
+        if self.recorder:
+            self.recorder.write_result(timestamp, self.hand_landmarks, [label for label, _ in hands])
+        if hands:
+            self.metrics.input_applied(timestamp, time.monotonic())
+        if self.net and hands:
+            # Online, whichever hand is seen controls this player's paddle
+            local_label = "Right" if self.config['net_side'] == 'left' else "Left"
+            hands = [(local_label, hands[0][1])]
             
-            # Convert to PhotoImage
-            img = Image.fromarray(preview_frame)
-            photo = ImageTk.PhotoImage(img)
+        if hands:
+            self.log.info('hands_detected', "🖐️ Detected {count} hand(s)", count=len(hands))
+            if self.log.sampled('landmarks') and self.hand_landmarks is not None:
+                self.log.debug('landmarks', "landmark 12 y={y}", labels=[label for label, _ in hands],
+                               y=[round(float(y), 4) for _, y in hands], capture_time=timestamp)
             
-            # Update preview
-            self.camera_preview.config(image=photo, text='')
-            self.camera_preview.image = photo  # Keep reference
+        # Control paddles based on hand (filters of lost hands are reset)
+        targets = apply_hands(hands, self.state, self.rules, self.paddle_filters, timestamp, self.physics_dt)
+        self.left_hand_detected = 'paddle1' in targets
+        self.right_hand_detected = 'paddle2' in targets
+        
+        for hand_label, hand_y_norm in hands:
+            # Convert to pixel coordinates
+            hand_y = hand_y_norm * frame_height
+            if hand_label == "Left":  # User's left hand (appears on right side of mirrored image)
+                self.log.info('hand_position', "👉 Right hand detected at y={y}", key='hand_right', y=int(hand_y))
+            elif hand_label == "Right":  # User's right hand (appears on left side of mirrored image)
+                self.log.info('hand_position', "👈 Left hand detected at y={y}", key='hand_left', y=int(hand_y))
+        if self.hand_trace:
+            for name, target_y in targets.items():
+                self.hand_trace.write(f"{timestamp:.6f},{name},{target_y:.2f}\n")
             
+        if self.gestures:
+            command = self.gestures.update(self.hand_landmarks, time.monotonic())
+            if command:
+                self.run_gesture_command(command)
+                
+    def run_gesture_command(self, command):
+        """Act on a gesture: 'serve' (or resume), 'pause' or 'reset'"""
+        if self.net:
+            self.log.info('gesture', "✋ Gesture '{command}' ignored in an online match", command=command)
+            return
+        if command == 'pause':
+            self.paused = not self.paused
+        elif command == 'serve':
+            if self.paused:
+                self.paused = False
+            else:
+                self.reset_ball()
+        elif command == 'reset':
+            self.paused = False
+            self.reset_game()
+        self.log.info('gesture', "✋ Gesture: {command}{state}", rate_limit=0,
+                      command=command, state=" (paused)" if self.paused else "")
+                
+    def update_predicted_paddles(self):
+        """Move hand-controlled paddles to their filtered position for now"""
+        if self.net:
+            return  # online, paddles only move through the rollback session's inputs
+        names = [name for name, detected in (('paddle1', self.left_hand_detected),
+                                             ('paddle2', self.right_hand_detected)) if detected]
+        place_predicted_paddles(self.state, self.rules, self.paddle_filters, names, time.monotonic())
+                
+    def update_camera_preview(self, now):
+        """Update camera preview with the newest frame and landmarks"""
+        if self.preview_frame is None:
+            return False
+        try:
+            updated = self.preview.update(self.preview_frame, self.hand_landmarks)
+            if updated:
+                self.preview_frame = None
+            if updated and self.raster_renderer and self.config['render_pip']:
+                self.raster_renderer.set_picture(self.preview.small)
+            return updated
         except Exception as e:
-            print(f"📹 Camera preview error: {e}")
+            self.log.warning('preview_error', "📹 Camera preview error: {error}", error=e)
             
     def update_game(self):
         """Update game physics"""
-        # AI control for paddles when hands not detected
-        if not self.left_hand_detected:
-            # AI controls left paddle
-            paddle_center = self.paddle1['y'] + self.paddle1['height'] // 2
-            if paddle_center < self.ball['y'] - 20:
-                self.paddle1['y'] = min(self.paddle1['y'] + 3, 
-                                      self.canvas_height - self.paddle1['height'])
-            elif paddle_center > self.ball['y'] + 20:
-                self.paddle1['y'] = max(self.paddle1['y'] - 3, 0)
-                
-        if not self.right_hand_detected:
-            # AI controls right paddle
-            paddle_center = self.paddle2['y'] + self.paddle2['height'] // 2
-            if paddle_center < self.ball['y'] - 20:
-                self.paddle2['y'] = min(self.paddle2['y'] + 3, 
-                                      self.canvas_height - self.paddle2['height'])
-            elif paddle_center > self.ball['y'] + 20:
-                self.paddle2['y'] = max(self.paddle2['y'] - 3, 0)
-        
-        # Ball movement
-        self.ball['x'] += self.ball['dx']
-        self.ball['y'] += self.ball['dy']
-        
-        # Ball collision with top/bottom walls
-        if self.ball['y'] <= self.ball['radius'] or self.ball['y'] >= self.canvas_height - self.ball['radius']:
-            self.ball['dy'] = -self.ball['dy']
-            
-        # Ball collision with paddles
-        # Left paddle collision
-        if (self.ball['x'] - self.ball['radius'] <= self.paddle1['x'] + self.paddle1['width'] and
-            self.ball['y'] >= self.paddle1['y'] and
-            self.ball['y'] <= self.paddle1['y'] + self.paddle1['height'] and
-            self.ball['dx'] < 0):
-            self.ball['dx'] = abs(self.ball['dx']) * 1.05  # Slight speed increase
-            
-        # Right paddle collision
-        if (self.ball['x'] + self.ball['radius'] >= self.paddle2['x'] and
-            self.ball['y'] >= self.paddle2['y'] and
-            self.ball['y'] <= self.paddle2['y'] + self.paddle2['height'] and
-            self.ball['dx'] > 0):
-            self.ball['dx'] = -abs(self.ball['dx']) * 1.05  # Slight speed increase
+        # AI controls paddles when hands not detected
+        scorer = physics.step(
+            self.state, self.rules, self.rng,
+            left_ai=not self.left_hand_detected,
+            right_ai=not self.right_hand_detected
+        )
+        
+        if scorer:
+            # Don't interpolate across a serve
+            self.prev_positions['ball'] = (self.ball['x'], self.ball['y'])
+            side = "Left" if scorer == 'player1' else "Right"
+            self.log.info('score', "🎯 {side} player scores! Score: {player1} - {player2}",
+                          rate_limit=0, side=side, **self.score)
             
-        # Scoring
-        if self.ball['x'] < 0:
-            self.score['player2'] += 1
-            self.reset_ball()
-            print(f"🎯 Right player scores! Score: {self.score['player1']} - {self.score['player2']}")
-        elif self.ball['x'] > self.canvas_width:
-            self.score['player1'] += 1
-            self.reset_ball()
-            print(f"🎯 Left player scores! Score: {self.score['player1']} - {self.score['player2']}")
+    def update_net_game(self):
+        """Advance the online match by one step with the local paddle input"""
+        name, detected = (('paddle1', self.left_hand_detected) if self.config['net_side'] == 'left'
+                          else ('paddle2', self.right_hand_detected))
+        local_y = None
+        if detected:
+            predicted = self.paddle_filters[name].predict(time.monotonic())
+            if predicted is not None:
+                local_y = int(max(0, min(predicted, self.canvas_height - self.state[name]['height'])))
+                
+        score = dict(self.score)
+        was_connected = self.net.connected
+        self.net.advance(local_y)
+        if self.net.disconnected:
+            # Not from inside the frame: stop_game stops the frame scheduler
+            self.root.after(0, self.end_online_match)
+            return
+        if self.net.connected and not was_connected:
+            self.log.info('net_connected', "🌐 Connected to {peer}, match starting", rate_limit=0,
+                          peer=self.config['net_peer'])
+        if self.score != score:
+            # Rollbacks can also take back a point, so report the score as it now stands
+            self.prev_positions['ball'] = (self.ball['x'], self.ball['y'])
+            self.log.info('score', "🎯 Score: {player1} - {player2}", rate_limit=0, **self.score)
             
+    def end_online_match(self):
+        """Stop a match whose peer went away and say why"""
+        if not self.net:
+            return  # already stopped
+        reason = self.net.disconnected
+        self.log.error('net_disconnected', "🌐 Online match ended: {reason}", reason=reason)
+        self.stop_game()
+        messagebox.showwarning("🌐 Online match ended", f"The online match ended: {reason}.")
+        
     def reset_ball(self):
         """Reset ball position"""
-        self.ball['x'] = self.canvas_width // 2
-        self.ball['y'] = self.canvas_height // 2
-        self.ball['dx'] = 4 * (1 if np.random.random() > 0.5 else -1)
-        self.ball['dy'] = 4 * (1 if np.random.random() > 0.5 else -1)
+        physics.serve(self.ball, self.rules, self.rng)
+        # Don't interpolate across a serve
+        self.prev_positions['ball'] = (self.ball['x'], self.ball['y'])
         
-    def update_display(self):
-        """Update all display elements"""
+    def update_display(self, now=None):
+        """Update hand status and score labels"""
         # Update hand status
         if self.left_hand_detected:
-            self.left_hand_status.config(
+            self.widgets.set(
+                self.left_hand_status,
                 text="👈 Left Hand: ✅",
                 fg='#22c55e'
             )
         else:
-            self.left_hand_status.config(
+            self.widgets.set(
+                self.left_hand_status,
                 text="👈 Left Hand: ❌",
                 fg='#ef4444'
             )
             
         if self.right_hand_detected:
-            self.right_hand_status.config(
+            self.widgets.set(
+                self.right_hand_status,
                 text="👉 Right Hand: ✅",
                 fg='#22c55e'
             )
         else:
-            self.right_hand_status.config(
+            self.widgets.set(
+                self.right_hand_status,
                 text="👉 Right Hand: ❌",
                 fg='#ef4444'
             )
             
         # Update score
-        self.score_display.config(
-            text=f"Score: {self.score['player1']} - {self.score['player2']}"
+        self.widgets.set(
+            self.score_display,
+            text=f"Score: {self.score['player1']} - {self.score['player2']}" + (" ⏸️" if self.paused else "")
         )
         
-        # Draw game
-        self.draw_game()
-        
-    def draw_game(self):
-        """Draw the game"""
-        self.canvas.delete("all")
+    def draw_game(self, alpha=1.0):
+        """Draw the game, blending from the previous physics state by alpha"""
+        prev = self.prev_positions
+        ball_x = prev['ball'][0] + (self.ball['x'] - prev['ball'][0]) * alpha
+        ball_y = prev['ball'][1] + (self.ball['y'] - prev['ball'][1]) * alpha
+        paddle1_y = prev['paddle1'] + (self.paddle1['y'] - prev['paddle1']) * alpha
+        paddle2_y = prev['paddle2'] + (self.paddle2['y'] - prev['paddle2']) * alpha
         
-        # Center line
-        for i in range(0, self.canvas_height, 20):
-            self.canvas.create_rectangle(
-                self.canvas_width//2 - 1, i,
-                self.canvas_width//2 + 1, i + 10,
-                fill='#334155', outline=''
-            )
-            
-        # Left paddle (changes color when hand detected)
-        left_paddle_color = '#22c55e' if self.left_hand_detected else '#94a3b8'
-        self.canvas.create_rectangle(
-            self.paddle1['x'], self.paddle1['y'],
-            self.paddle1['x'] + self.paddle1['width'],
-            self.paddle1['y'] + self.paddle1['height'],
-            fill=left_paddle_color, outline=''
-        )
-        
-        # Right paddle (changes color when hand detected)
-        right_paddle_color = '#22c55e' if self.right_hand_detected else '#94a3b8'
-        self.canvas.create_rectangle(
-            self.paddle2['x'], self.paddle2['y'],
-            self.paddle2['x'] + self.paddle2['width'],
-            self.paddle2['y'] + self.paddle2['height'],
-            fill=right_paddle_color, outline=''
-        )
-        
-        # Ball (changes color when any hand detected)
-        ball_color = '#22c55e' if (self.left_hand_detected or self.right_hand_detected) else 'white'
-        self.canvas.create_oval(
-            self.ball['x'] - self.ball['radius'],
-            self.ball['y'] - self.ball['radius'],
-            self.ball['x'] + self.ball['radius'],
-            self.ball['y'] + self.ball['radius'],
-            fill=ball_color, outline=''
+        self.renderer.draw(
+            ball_x, ball_y, self.ball['radius'],
+            (self.paddle1['x'], paddle1_y, self.paddle1['width'], self.paddle1['height']),
+            (self.paddle2['x'], paddle2_y, self.paddle2['width'], self.paddle2['height']),
+            self.left_hand_detected, self.right_hand_detected
         )
         
     def quit_game(self):
@@ -598,9 +1082,28 @@ class HandPongGame:
         print("👋 Quitting Hand Pong Game...")
         if self.game_running:
             self.stop_game()
-        if self.cap:
+        self.cancel_camera_release()
+        if self.camera:
+            self.camera.release()
+        elif self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
+        if self.inference:
+            self.inference.close()
+            self.inference = None
+        if self.hand_trace:
+            self.hand_trace.close()
+            self.hand_trace = None
+        if self.net:
+            self.net.close()
+            self.net = None
+        if self.metrics_exporter:
+            self.metrics_exporter.close()
+            self.metrics_exporter = None
+        self.log.close()
+        if self.raster_renderer:
+            self.raster_renderer.close()
+        if cv2:
+            cv2.destroyAllWindows()
         self.root.quit()
         self.root.destroy()
         
@@ -612,11 +1115,124 @@ class HandPongGame:
         print("👀 Look for the game window with the START GAME button!")
         self.root.mainloop()
 
+def parse_args():
+    """Parse command line options"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Hand-gesture controlled Pong")
+    parser.add_argument('--camera', type=int, default=DEFAULT_CONFIG['camera_index'],
+                        help="camera index passed to cv2.VideoCapture")
+    parser.add_argument('--keep-camera', type=float, metavar='SECONDS',
+                        default=DEFAULT_CONFIG['camera_keep_open'],
+                        help="keep the camera open this long after a match so the next one starts instantly")
+    parser.add_argument('--record', metavar='DIR', default=DEFAULT_CONFIG['record_path'],
+                        help="record camera frames and hand landmarks to a directory")
+    parser.add_argument('--replay', metavar='DIR', default=DEFAULT_CONFIG['replay_path'],
+                        help="play a recorded session instead of using the camera")
+    parser.add_argument('--replay-fast', action='store_true',
+                        help="replay every recorded frame as fast as possible instead of in real time")
+    # Options the hardware profile can tune default to None: unset means "profile, then default"
+    parser.add_argument('--profile', default=DEFAULT_CONFIG['hardware_profile'],
+                        help="hardware profile written by the installer (hardware_profile.py)")
+    parser.add_argument('--no-profile', action='store_true', help="ignore the hardware profile")
+    parser.add_argument('--inference', choices=['inline', 'process'], default=None,
+                        help="run hand tracking on the game thread or in a worker process "
+                             f"(default: {DEFAULT_CONFIG['inference_mode']})")
+    parser.add_argument('--inference-every', default=None,
+                        help="run hand tracking on every Nth camera frame, or 'auto' to adapt N "
+                             "to the measured inference time; paddles are Kalman-predicted in between")
+    parser.add_argument('--model-complexity', type=int, choices=[0, 1], default=None,
+                        help=f"MediaPipe hand model, 0 = fast, 1 = accurate "
+                             f"(default: {DEFAULT_CONFIG['model_complexity']})")
+    parser.add_argument('--filter', default=DEFAULT_CONFIG['paddle_filter'],
+                        help="paddle input filter, e.g. 'one_euro:min_cutoff=1,beta=0.02' "
+                             "(ema, one_euro or kalman)")
+    parser.add_argument('--hand-trace', default=DEFAULT_CONFIG['hand_trace_file'],
+                        help="write hand measurements to this CSV file for filter_eval.py")
+    parser.add_argument('--gestures', action='store_true',
+                        help="control the game by hand shape: pinch to serve or resume, "
+                             "open palm to pause, fist to reset the score (hold briefly)")
+    parser.add_argument('--roi', action='store_true', default=None,
+                        help="track hands in small crops around their last position")
+    parser.add_argument('--tracker', choices=['mediapipe', 'blob', 'auto'], default=None,
+                        help="hand tracker: MediaPipe landmarks, cheap skin-color blobs, "
+                             "or 'auto' to switch to blobs when MediaPipe is too slow")
+    parser.add_argument('--preview-fps', type=float, default=None,
+                        help=f"camera preview refresh rate (default: {DEFAULT_CONFIG['preview_fps']})")
+    parser.add_argument('--renderer', choices=['canvas', 'raster', 'window'], default=DEFAULT_CONFIG['renderer'],
+                        help="draw with Tk canvas items, as one NumPy image on the canvas, "
+                             "or as one image in an OpenCV window")
+    parser.add_argument('--render-size', metavar='WxH', default=DEFAULT_CONFIG['render_size'],
+                        help="output size of --renderer window, e.g. 1920x1080")
+    parser.add_argument('--fullscreen', action='store_true', help="show --renderer window fullscreen")
+    parser.add_argument('--pip', action='store_true',
+                        help="show the camera picture-in-picture on the court (raster and window renderers)")
+    parser.add_argument('--metrics-overlay', action='store_true',
+                        help="show loop/camera FPS, inference time and input age on the game canvas")
+    parser.add_argument('--metrics-file', default=DEFAULT_CONFIG['metrics_file'],
+                        help="write Prometheus-style metrics to this file every second")
+    parser.add_argument('--metrics-port', type=int, default=DEFAULT_CONFIG['metrics_port'],
+                        help="serve metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--seed', type=int, default=DEFAULT_CONFIG['seed'],
+                        help="seed for serve directions (both online players must use the same one)")
+    parser.add_argument('--net-peer', metavar='HOST:PORT', default=DEFAULT_CONFIG['net_peer'],
+                        help="play online against another hand.py at this address (UDP)")
+    parser.add_argument('--net-port', type=int, default=DEFAULT_CONFIG['net_port'],
+                        help="local UDP port for online play")
+    parser.add_argument('--net-side', choices=['left', 'right'], default=DEFAULT_CONFIG['net_side'],
+                        help="paddle this player controls online")
+    parser.add_argument('--net-input-delay', type=int, default=DEFAULT_CONFIG['net_input_delay'],
+                        help="steps of local input delay online (more = fewer rollbacks)")
+    parser.add_argument('--log-level', default=DEFAULT_CONFIG['log_level'],
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], type=str.upper)
+    parser.add_argument('--log-file', default=DEFAULT_CONFIG['log_file'],
+                        help="append game events to this file instead of stdout")
+    parser.add_argument('--log-json', action='store_true', help="log one JSON object per line")
+    parser.add_argument('--log-trace-sample', type=float, default=DEFAULT_CONFIG['log_trace_sample'],
+                        help="fraction of frames that log a DEBUG landmark trace")
+    args = parser.parse_args()
+    inference_every = args.inference_every
+    if inference_every not in (None, 'auto'):
+        inference_every = int(inference_every)
+    config = {
+        'hardware_profile': None if args.no_profile else args.profile,
+        'camera_index': args.camera,
+        'camera_keep_open': args.keep_camera,
+        'record_path': args.record,
+        'replay_path': args.replay,
+        'replay_realtime': not args.replay_fast,
+        'inference_mode': args.inference,
+        'inference_every': inference_every,
+        'model_complexity': args.model_complexity,
+        'paddle_filter': args.filter,
+        'hand_trace_file': args.hand_trace,
+        'gestures': args.gestures,
+        'preview_fps': args.preview_fps,
+        'renderer': args.renderer,
+        'render_size': tuple(int(n) for n in args.render_size.lower().split('x')) if args.render_size else None,
+        'render_fullscreen': args.fullscreen,
+        'render_pip': args.pip,
+        'roi_tracking': args.roi,
+        'tracker': args.tracker,
+        'metrics_overlay': args.metrics_overlay,
+        'metrics_file': args.metrics_file,
+        'metrics_port': args.metrics_port,
+        'seed': args.seed,
+        'net_peer': args.net_peer,
+        'net_port': args.net_port,
+        'net_side': args.net_side,
+        'net_input_delay': args.net_input_delay,
+        'log_level': args.log_level,
+        'log_file': args.log_file,
+        'log_json': args.log_json,
+        'log_trace_sample': args.log_trace_sample,
+    }
+    return {key: value for key, value in config.items() if not (key in PROFILE_KEYS and value is None)}
+
 if __name__ == "__main__":
     try:
         print("🚀 Launching Hand Pong Game...")
         print("🖥️ This runs as a Python Desktop Application (not in browser)")
-        game = HandPongGame()
+        game = HandPongGame(parse_args())
         game.run()
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -0,0 +1,285 @@
+"""Install-time hardware benchmark and the tuning profile it produces.
+
+``run_benchmark()`` measures, in a few seconds:
+
+- the frame rate the camera actually delivers at several resolutions (or,
+  with no camera, how fast the frame pipeline handles synthetic frames)
+- MediaPipe latency for every model_complexity / max_num_hands setting
+- the cost of the camera preview and of the raster renderer
+
+``choose_settings()`` turns those numbers into HandPongGame config values
+(camera resolution, inference mode and rate, tracker, preview rate), and
+``save_profile()`` writes both to a JSON file that ``HandPongGame`` loads at
+startup; command line options still take precedence.
+
+    python hardware_profile.py                 # camera 0, or synthetic frames
+    python hardware_profile.py --synthetic     # never open a camera
+
+Only the standard library is imported at module level, so the game can
+read a profile without paying for OpenCV or MediaPipe.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hardware_profile.json')
+PROFILE_VERSION = 1
+
+RESOLUTIONS = ((320, 240), (640, 480), (1280, 720))
+INFERENCE_SETTINGS = ((0, 1), (0, 2), (1, 1), (1, 2))  # (model_complexity, max_num_hands)
+
+# Config keys a profile may set
+PROFILE_KEYS = ('camera_width', 'camera_height', 'camera_fps', 'model_complexity', 'inference_mode',
+                'inference_every', 'roi_tracking', 'tracker', 'preview_fps')
+
+
+def load_profile(path=DEFAULT_PROFILE_PATH):
+    """The profile dict stored at path, or None if there is none (or it is unusable)"""
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring hardware profile {path}: {e}")
+        return None
+    if profile.get('version') != PROFILE_VERSION:
+        print(f"⚠️ Ignoring hardware profile {path}: version {profile.get('version')}, "
+              f"expected {PROFILE_VERSION} (run python hardware_profile.py again)")
+        return None
+    profile['config'] = {key: value for key, value in profile.get('config', {}).items() if key in PROFILE_KEYS}
+    return profile
+
+
+def save_profile(profile, path=DEFAULT_PROFILE_PATH):
+    """Write profile as JSON (atomically, so the game never reads half a file)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(profile, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def measure_camera(index=0, resolutions=RESOLUTIONS, seconds=1.0):
+    """[{'requested', 'size', 'fps'}] per resolution, or None if the camera does not open or deliver frames"""
+    import cv2
+    cap = cv2.VideoCapture(index)
+    if not cap.isOpened():
+        cap.release()
+        return None
+    results = []
+    try:
+        for width, height in resolutions:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            cap.set(cv2.CAP_PROP_FPS, 60)
+            frame = None
+            for _ in range(5):  # let the driver settle on the new mode
+                ok, new_frame = cap.read(frame) if frame is not None else cap.read()
+                if ok and new_frame is not None:
+                    frame = new_frame
+            if frame is None:
+                continue  # this mode delivers nothing
+            size = [frame.shape[1], frame.shape[0]]
+            count = 0
+            started = time.perf_counter()
+            while time.perf_counter() - started < seconds:
+                ok, new_frame = cap.read(frame)
+                count += ok and new_frame is not None
+            elapsed = time.perf_counter() - started
+            results.append({
+                'requested': [width, height],
+                'size': size,
+                'fps': round(count / elapsed, 1),
+            })
+    finally:
+        cap.release()
+    # A camera that opens but never delivers a frame is as good as none
+    return results or None
+
+
+def measure_pipeline(resolutions=RESOLUTIONS, frames=60):
+    """Per resolution, milliseconds to mirror and convert a frame (no camera needed)"""
+    from benchmark import synthetic_frames
+    from frame_buffers import FrameBuffers
+    results = []
+    for width, height in resolutions:
+        source = synthetic_frames(count=10, width=width, height=height)
+        buffers = FrameBuffers()
+        started = time.perf_counter()
+        for i in range(frames):
+            buffers.rgb(buffers.mirror(source[i % len(source)]))
+        results.append({'size': [width, height],
+                        'ms': round((time.perf_counter() - started) / frames * 1000, 3)})
+    return results
+
+
+def measure_inference(frame_size=(640, 480), settings=INFERENCE_SETTINGS, frames=20, camera_index=None):
+    """[{'model_complexity', 'max_num_hands', 'ms'}] median latency per setting, or None without MediaPipe"""
+    try:
+        import mediapipe as mp
+    except ImportError:
+        return None
+    import cv2
+    import numpy as np
+    from benchmark import synthetic_frames
+
+    width, height = frame_size
+    source = None
+    if camera_index is not None:
+        # Real frames (ideally with someone in front of the camera) are closer to play than synthetic ones
+        cap = cv2.VideoCapture(camera_index)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        source = [cap.read()[1] for _ in range(frames)] if cap.isOpened() else None
+        cap.release()
+        if source and any(frame is None for frame in source):
+            source = None
+    if not source:
+        source = synthetic_frames(count=frames, width=width, height=height)
+    rgb_frames = [cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB) for frame in source]
+
+    results = []
+    for complexity, max_num_hands in settings:
+        hands = mp.solutions.hands.Hands(static_image_mode=False, model_complexity=complexity,
+                                         max_num_hands=max_num_hands,
+                                         min_detection_confidence=0.3, min_tracking_confidence=0.3)
+        for frame in rgb_frames[:3]:
+            hands.process(frame)  # warm up
+        latencies = []
+        for frame in rgb_frames:
+            started = time.perf_counter()
+            hands.process(frame)
+            latencies.append(time.perf_counter() - started)
+        hands.close()
+        results.append({'model_complexity': complexity, 'max_num_hands': max_num_hands,
+                        'ms': round(float(np.median(latencies)) * 1000, 2)})
+    return results
+
+
+def measure_render(frames=120):
+    """Milliseconds per camera preview update and per raster-rendered game frame"""
+    import numpy as np
+    from preview import CameraPreview
+    from raster_renderer import benchmark as raster_benchmark
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    landmarks = np.random.default_rng(1).random((2, 21, 3), dtype=np.float32)
+    preview = CameraPreview(None, fps=0, connections=[(0, 1), (1, 2), (2, 3), (3, 4)])
+    started = time.perf_counter()
+    for _ in range(frames):
+        preview.update(frame, landmarks)
+    preview_ms = (time.perf_counter() - started) / frames * 1000
+    return {'preview_ms': round(preview_ms, 3), 'raster_ms': round(raster_benchmark((600, 400), frames), 3)}
+
+
+def choose_settings(measurements, cpu_count=None):
+    """HandPongGame config values suited to the measured hardware"""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    config = {}
+
+    # Camera: MediaPipe shrinks frames to 256 px anyway, so more than 640x480 only costs time.
+    # Take the largest mode up to that which still delivers a playable frame rate.
+    camera_fps = 30.0
+    modes = [m for m in measurements.get('camera') or [] if m['size'][0] <= 640]
+    if modes:
+        playable = [m for m in modes if m['fps'] >= 24]
+        mode = max(playable, key=lambda m: m['size'][0]) if playable else max(modes, key=lambda m: m['fps'])
+        config['camera_width'], config['camera_height'] = mode['size']
+        config['camera_fps'] = 60 if mode['fps'] >= 55 else 30
+        camera_fps = min(mode['fps'], config['camera_fps'])
+    elif measurements.get('pipeline'):
+        # No camera measured: keep the mirror/convert work small on slow machines
+        cheap = [m for m in measurements['pipeline'] if m['size'][0] <= 640 and m['ms'] <= 2.0]
+        if cheap:
+            config['camera_width'], config['camera_height'] = max(cheap, key=lambda m: m['size'][0])['size']
+    frame_interval_ms = 1000 / max(camera_fps, 1)
+
+    # Inference: the game tracks two hands.  Inline inference shares the game thread's
+    # 16.7 ms frame with physics and drawing, so it gets about 10 ms of it.
+    inference = {(m['model_complexity'], m['max_num_hands']): m['ms'] for m in measurements.get('inference') or []}
+    if (0, 2) in inference:
+        inline_budget_ms = 10.0
+        complexity = 1 if inference.get((1, 2), math.inf) <= inline_budget_ms else 0
+        latency_ms = inference[(complexity, 2)]
+        config['model_complexity'] = complexity
+        if latency_ms <= inline_budget_ms:
+            config['inference_mode'] = 'inline'
+            config['inference_every'] = 1
+        elif cpu_count >= 4:
+            # Spare cores: run the model in its own process, at the camera rate if it keeps up
+            config['inference_mode'] = 'process'
+            config['inference_every'] = 1 if latency_ms <= frame_interval_ms else 'auto'
+        else:
+            # Few cores: infer on fewer frames, in crops, and fall back to blobs when too slow
+            config['inference_mode'] = 'inline'
+            config['inference_every'] = 'auto'
+            config['roi_tracking'] = True
+            config['tracker'] = 'auto'
+
+    render = measurements.get('render')
+    if render:
+        config['preview_fps'] = 30 if render['preview_ms'] <= 2.0 else 15
+    return config
+
+
+def run_benchmark(camera_index=0, synthetic=False, log=print):
+    """Measure this machine and return a profile dict (see save_profile)"""
+    started = time.perf_counter()
+    measurements = {'camera': None}
+    if not synthetic:
+        log(f"📹 Measuring camera {camera_index} frame rates...")
+        measurements['camera'] = measure_camera(camera_index)
+        if measurements['camera'] is None:
+            log("⚠️ No camera found: measuring with synthetic frames")
+        else:
+            for mode in measurements['camera']:
+                log(f"   {mode['size'][0]}x{mode['size'][1]}: {mode['fps']:.0f} fps")
+    measurements['pipeline'] = measure_pipeline()
+
+    log("🧠 Measuring MediaPipe latency...")
+    use_camera = measurements['camera'] is not None
+    measurements['inference'] = measure_inference(camera_index=camera_index if use_camera else None)
+    if measurements['inference'] is None:
+        log("⚠️ MediaPipe not installed: skipping inference settings")
+    else:
+        for m in measurements['inference']:
+            log(f"   model_complexity={m['model_complexity']} max_num_hands={m['max_num_hands']}: {m['ms']:.1f} ms")
+
+    log("🖼️ Measuring render cost...")
+    measurements['render'] = measure_render()
+    log(f"   preview {measurements['render']['preview_ms']:.2f} ms, "
+        f"raster frame {measurements['render']['raster_ms']:.2f} ms")
+
+    config = choose_settings(measurements)
+    return {
+        'version': PROFILE_VERSION,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'seconds': round(time.perf_counter() - started, 1),
+        'source': 'camera' if use_camera else 'synthetic',
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'measurements': measurements,
+        'config': config,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark this machine and write a Hand Pong tuning profile")
+    parser.add_argument('--camera', type=int, default=0, help="camera index to measure")
+    parser.add_argument('--synthetic', action='store_true', help="do not open a camera; use synthetic frames")
+    parser.add_argument('--output', default=DEFAULT_PROFILE_PATH, help="profile file to write")
+    args = parser.parse_args()
+    profile = run_benchmark(args.camera, synthetic=args.synthetic)
+    save_profile(profile, args.output)
+    print(f"✅ Wrote {args.output} in {profile['seconds']:.1f}s: {json.dumps(profile['config'])}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+import multiprocessing as mp_proc
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, landmarks_array
+
+HANDEDNESS_LABELS = ('Left', 'Right')
+
+
+def _worker_main(conn, frame_name, result_name, frame_shape, max_num_hands, roi, hands_options, cpus=None):
+    """Run MediaPipe Hands in a child process.
+
+    Frames are read from the shared frame buffer and landmarks are written to
+    the shared result buffer; only tiny control messages go through ``conn``.
+    """
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        # Pin before MediaPipe starts its own threads so they inherit the mask
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass  # cores not available to this process: run unpinned
+    import mediapipe as mp
+    from roi_tracking import make_hand_tracker, warm_up_tracker
+
+    frame_shm = shared_memory.SharedMemory(name=frame_name)
+    result_shm = shared_memory.SharedMemory(name=result_name)
+    frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=frame_shm.buf)
+    landmarks, handedness = _result_views(result_shm.buf, max_num_hands)
+
+    hands = make_hand_tracker(mp.solutions.hands, max_num_hands, roi=roi, **hands_options)
+    warm_up_tracker(hands, frame_shape)
+    conn.send(('ready',))
+
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+
+            _, timestamp = message
+            started = time.perf_counter()
+            try:
+                results = hands.process(frame)
+
+                count = 0
+                if results.multi_hand_landmarks and results.multi_handedness:
+                    count = min(len(results.multi_hand_landmarks), max_num_hands)
+                    # All hands in one pass, straight into shared memory
+                    landmarks_array(results.multi_hand_landmarks[:count], out=landmarks)
+                    for i, hand_info in enumerate(results.multi_handedness[:count]):
+                        handedness[i] = HANDEDNESS_LABELS.index(hand_info.classification[0].label)
+            except Exception as e:
+                # One bad frame must not take hand tracking down for the rest of the session
+                conn.send(('error', timestamp, time.perf_counter() - started, repr(e)))
+                continue
+
+            conn.send(('done', timestamp, count, time.perf_counter() - started))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        hands.close()
+        del frame, landmarks, handedness
+        frame_shm.close()
+        result_shm.close()
+
+
+def _result_views(buf, max_num_hands):
+    """Map the result shared memory onto (landmarks, handedness) arrays"""
+    landmarks_size = max_num_hands * NUM_LANDMARKS * 3 * 4
+    landmarks = np.ndarray((max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32, buffer=buf)
+    handedness = np.ndarray((max_num_hands,), dtype=np.int8, buffer=buf, offset=landmarks_size)
+    return landmarks, handedness
+
+
+class InferenceWorker:
+    """Run hand tracking in a separate process over shared memory.
+
+    The game writes an RGB frame into ``acquire_frame_buffer()`` and calls
+    ``submit()``; ``poll()`` later returns the landmarks for that frame tagged
+    with the frame's capture timestamp.  Only one frame is in flight at a
+    time: while the worker is busy, ``acquire_frame_buffer()`` returns None
+    and the caller simply skips inference for that frame.  A frame the model
+    fails on gives a result without hands and with the exception text in
+    'error'; once the worker process has died, ``acquire_frame_buffer()`` and
+    ``poll()`` raise RuntimeError.
+
+    ``cpus`` optionally pins the worker to a set of CPU cores (Linux only).
+    """
+
+    def __init__(self, frame_shape=(480, 640, 3), max_num_hands=2, roi=None, cpus=None, **hands_options):
+        self.frame_shape = tuple(frame_shape)
+        self.max_num_hands = max_num_hands
+
+        frame_size = int(np.prod(self.frame_shape))
+        result_size = max_num_hands * NUM_LANDMARKS * 3 * 4 + max_num_hands
+        self._frame_shm = shared_memory.SharedMemory(create=True, size=frame_size)
+        self._result_shm = shared_memory.SharedMemory(create=True, size=result_size)
+        self.frame_buffer = np.ndarray(self.frame_shape, dtype=np.uint8, buffer=self._frame_shm.buf)
+        self._landmarks, self._handedness = _result_views(self._result_shm.buf, max_num_hands)
+
+        # Spawn keeps the child independent of Tk state in the parent
+        ctx = mp_proc.get_context('spawn')
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self._frame_shm.name, self._result_shm.name,
+                  self.frame_shape, max_num_hands, roi, hands_options, cpus),
+            name="HandInference",
+            daemon=True
+        )
+
+        self.ready = False
+        self.busy = True  # until the worker reports ready
+        self.last_latency = None
+        self.errors = 0  # frames the model failed on
+        self._result = None
+        self._closed = False
+
+    def start(self):
+        """Start the worker process"""
+        self._process.start()
+        return self
+
+    def wait_ready(self, timeout=None):
+        """Block until the worker has loaded and warmed up its model; returns self.ready"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.ready and self._process.is_alive():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            if self._conn.poll(0.1 if remaining is None else min(0.1, remaining)):
+                self._drain()
+        return self.ready
+
+    def acquire_frame_buffer(self):
+        """Return the shared frame buffer if the worker is idle, else None"""
+        self._drain()
+        if self.busy:
+            return None
+        return self.frame_buffer
+
+    def submit(self, timestamp):
+        """Hand the frame written into ``frame_buffer`` to the worker"""
+        self.busy = True
+        self._conn.send(('frame', timestamp))
+
+    def poll(self):
+        """Return the newest finished result, or None.
+
+        The result is a dict with 'landmarks' (hands x 21 x 3, normalized),
+        'labels' (MediaPipe handedness per hand), 'timestamp' (capture time of
+        the frame), 'latency' (inference time in seconds) and 'error' (None,
+        or why the model failed on this frame).
+        """
+        self._drain()
+        result, self._result = self._result, None
+        return result
+
+    def _drain(self):
+        """Process pending control messages from the worker"""
+        while self._conn.poll():
+            try:
+                message = self._conn.recv()
+            except EOFError:
+                break
+            if message[0] == 'ready':
+                self.ready = True
+                self.busy = False
+            elif message[0] == 'done':
+                _, timestamp, count, latency = message
+                self.busy = False
+                self.last_latency = latency
+                self._result = {
+                    'landmarks': self._landmarks[:count].copy(),
+                    'labels': [HANDEDNESS_LABELS[i] for i in self._handedness[:count]],
+                    'timestamp': timestamp,
+                    'latency': latency,
+                    'error': None
+                }
+            elif message[0] == 'error':
+                _, timestamp, latency, error = message
+                self.busy = False
+                self.errors += 1
+                self._result = {
+                    'landmarks': self._landmarks[:0].copy(),
+                    'labels': [],
+                    'timestamp': timestamp,
+                    'latency': latency,
+                    'error': error
+                }
+        if not self._closed and not self._process.is_alive():
+            # Otherwise busy would stay set and every frame would silently skip inference
+            raise RuntimeError(f"hand tracking worker exited (code {self._process.exitcode})")
+
+    def close(self):
+        """Stop the worker and free the shared memory"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._conn.close()
+
+        del self.frame_buffer, self._landmarks, self._handedness
+        for shm in (self._frame_shm, self._result_shm):
+            shm.close()
+            shm.unlink()
+
+
+class InferenceScheduler:
+    """Decide which camera frames get hand inference.
+
+    ``every`` is either a fixed N (run on every Nth frame) or 'auto', which
+    picks N from the measured inference latency so that inference takes at
+    most ``target_load`` of the time between camera frames.
+    """
+
+    def __init__(self, every=1, target_load=0.5, max_every=4):
+        self.auto = every == 'auto'
+        self.every = 1 if self.auto else max(1, int(every))
+        self.target_load = target_load
+        self.max_every = max_every
+
+        self.frames_since_run = 0
+        self.latency = None  # smoothed seconds per inference
+        self.frame_interval = None  # smoothed seconds between camera frames
+        self._last_frame_time = None
+
+    def note_frame(self, frame_timestamp):
+        """Register a new camera frame (used to measure the frame interval)"""
+        if self._last_frame_time is not None:
+            interval = frame_timestamp - self._last_frame_time
+            if interval > 0:
+                self.frame_interval = _smooth(self.frame_interval, interval)
+        self._last_frame_time = frame_timestamp
+        self.frames_since_run += 1
+
+    def should_run(self):
+        """Whether enough frames have passed since the last inference"""
+        if self.frames_since_run >= self.every:
+            self.frames_since_run = 0
+            return True
+        return False
+
+    def record_latency(self, latency):
+        """Feed back how long an inference took and adapt N"""
+        self.latency = _smooth(self.latency, latency)
+        if self.auto and self.frame_interval:
+            budget = self.target_load * self.frame_interval
+            needed = int(-(-self.latency // budget))  # ceil
+            self.every = min(max(needed, 1), self.max_every)
+
+
+def _smooth(current, sample, weight=0.1):
+    """Exponential moving average that starts at the first sample"""
+    return sample if current is None else current + weight * (sample - current)
@@ -1,60 +1,145 @@
+import argparse
+import os
+import re
 import subprocess
 import sys
-import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REQUIREMENTS_FILE = os.path.join(HERE, 'requirements.txt')
+DEFAULT_WHEELHOUSE = os.path.join(HERE, 'wheelhouse')
+
+# Other distributions that provide the same import (MediaPipe itself pulls in opencv-contrib-python)
+ALTERNATIVES = {
+    'opencv-python': ('opencv-contrib-python', 'opencv-python-headless', 'opencv-contrib-python-headless'),
+}
 
 def check_python_version():
     """Check if Python version is compatible"""
-    if sys.version_info < (3, 7):
-        print("❌ Python 3.7 or higher is required!")
+    if sys.version_info < (3, 8):
+        print("❌ Python 3.8 or higher is required (MediaPipe has no wheels for older versions)!")
         print(f"Current version: {sys.version}")
         return False
     print(f"✅ Python version: {sys.version.split()[0]}")
     return True
 
-def check_and_install():
+def read_requirements(path=REQUIREMENTS_FILE):
+    """(name, operator, version) for every 'name==version' style line of requirements.txt"""
+    requirements = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            match = re.match(r'^([A-Za-z0-9._-]+)\s*(==|>=)?\s*([^\s;]*)', line)
+            if match:
+                requirements.append((match.group(1), match.group(2), match.group(3) or None))
+    return requirements
+
+def _version_key(version):
+    """'4.8.1.78' -> (4, 8, 1, 78), ignoring any non-numeric suffix"""
+    return tuple(int(part) for part in re.findall(r'\d+', version.split('+')[0]))
+
+def _looks_intact(dist):
+    """Whether the distribution's top-level modules are actually on disk"""
+    top_level = (dist.read_text('top_level.txt') or '').split()
+    for name in top_level:
+        path = dist.locate_file(name)
+        if not (os.path.isdir(path) or os.path.exists(str(path) + '.py') or
+                any(str(f).startswith(name + '.') for f in dist.files or [])):
+            return False
+    return True
+
+def check_requirement(name, operator, version):
+    """(ok, message, to_install) for one requirement, from package metadata only (nothing is imported).
+
+    Any of the requirement's ALTERNATIVES at a matching version satisfies it.
+    Otherwise to_install is the requirement string that fixes it, naming the
+    variant already installed so a second package providing the same module
+    is never added next to it.
+    """
+    # Imported here so Python 3.7 gets check_python_version's message instead of an ImportError
+    from importlib import metadata
+    spec = f"{operator or ''}{version or ''}"
+    installed_variant = None
+    problems = []
+    for candidate in (name,) + ALTERNATIVES.get(name, ()):
+        try:
+            dist = metadata.distribution(candidate)
+        except metadata.PackageNotFoundError:
+            continue
+        installed_variant = installed_variant or candidate
+        installed = dist.version
+        if operator == '==' and _version_key(installed) != _version_key(version):
+            problems.append(f"{candidate} {installed} installed, {version} required")
+        elif operator == '>=' and _version_key(installed) < _version_key(version):
+            problems.append(f"{candidate} {installed} installed, {version} or newer required")
+        elif not _looks_intact(dist):
+            problems.append(f"{candidate} {installed} is installed but its files are missing")
+        else:
+            return True, f"{candidate} {installed}", None
+    if installed_variant is None:
+        return False, f"{name} is missing", name + spec
+    return False, "; ".join(problems), installed_variant + spec
+
+def install_requirements(requirements, wheelhouse=None, upgrade_pip=False):
+    """Install requirement strings with a single pip run (offline when a wheelhouse is given)"""
+    if upgrade_pip:
+        print("⬆️ Upgrading pip...")
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--upgrade', 'pip'])
+    command = [sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check']
+    if wheelhouse:
+        # Prebuilt wheels only: no index, no network, nothing compiled
+        command += ['--no-index', '--find-links', wheelhouse]
+    print(f"📥 Installing {', '.join(requirements)}" + (f" from {wheelhouse}" if wheelhouse else ""))
+    subprocess.check_call(command + list(requirements))
+
+def build_wheelhouse(directory, requirements_file=REQUIREMENTS_FILE):
+    """Download wheels for every requirement (and dependency) into directory for offline installs"""
+    print(f"📦 Downloading wheels into {directory}...")
+    subprocess.check_call([sys.executable, '-m', 'pip', 'download', '--disable-pip-version-check',
+                           '--only-binary', ':all:', '-r', requirements_file, '-d', directory])
+    print(f"✅ Wheelhouse ready. Copy it next to installer.py (as 'wheelhouse') or use --wheelhouse {directory}")
+
+def find_wheelhouse(wheelhouse=None):
+    """The wheelhouse to install from: the argument, $HANDPONG_WHEELHOUSE or ./wheelhouse"""
+    wheelhouse = wheelhouse or os.environ.get('HANDPONG_WHEELHOUSE')
+    if wheelhouse:
+        return wheelhouse
+    if os.path.isdir(DEFAULT_WHEELHOUSE) and os.listdir(DEFAULT_WHEELHOUSE):
+        return DEFAULT_WHEELHOUSE
+    return None
+
+def check_and_install(wheelhouse=None, upgrade_pip=False, check_only=False):
     """Check for required packages and install if missing"""
     print("🔍 Checking system requirements...")
     
     if not check_python_version():
         return False
     
-    required_packages = {
-        'cv2': 'opencv-python==4.8.1.78',
-        'mediapipe': 'mediapipe==0.10.7', 
-        'PIL': 'pillow==10.0.1',
-        'numpy': 'numpy==1.24.3'
-    }
-    
     missing_packages = []
     
     print("\n📦 Checking required packages...")
-    for module, package in required_packages.items():
-        try:
-            __import__(module)
-            print(f"✅ {module} is already installed")
-        except ImportError:
-            print(f"❌ {module} is missing")
-            missing_packages.append(package)
+    for name, operator, version in read_requirements():
+        ok, message, to_install = check_requirement(name, operator, version)
+        if ok:
+            print(f"✅ {message}")
+        else:
+            print(f"❌ {message}")
+            missing_packages.append(to_install)
     
     if missing_packages:
+        if check_only:
+            return False
+        wheelhouse = find_wheelhouse(wheelhouse)
         print(f"\n🔧 Installing missing packages: {', '.join(missing_packages)}")
         try:
-            # Upgrade pip first
-            print("⬆️ Upgrading pip...")
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--upgrade', 'pip'])
-            
-            # Install missing packages
-            print("📥 Installing packages...")
-            subprocess.check_call([
-                sys.executable, '-m', 'pip', 'install'
-            ] + missing_packages)
-            
+            # One pip run resolves everything together instead of package by package
+            install_requirements(missing_packages, wheelhouse=wheelhouse, upgrade_pip=upgrade_pip)
             print("✅ All packages installed successfully!")
         except subprocess.CalledProcessError as e:
             print(f"❌ Installation failed: {e}")
             print("\n🔧 Try manual installation:")
-            for package in missing_packages:
-                print(f"pip install {package}")
+            print(f"pip install {' '.join(missing_packages)}")
             return False
     else:
         print("\n✅ All required packages are already installed!")
@@ -78,20 +163,65 @@ def check_camera():
         print(f"⚠️ Camera check failed: {e}")
         return False
 
+def tune_for_hardware(camera_available, profile_path=None):
+    """Benchmark this machine and write the profile hand.py tunes itself from"""
+    # Imported here: the packages it measures may only just have been installed
+    from hardware_profile import DEFAULT_PROFILE_PATH, run_benchmark, save_profile
+    profile_path = profile_path or DEFAULT_PROFILE_PATH
+    print("\n⏱️ Benchmarking this machine (a few seconds)...")
+    try:
+        profile = run_benchmark(synthetic=not camera_available)
+        save_profile(profile, profile_path)
+    except Exception as e:
+        print(f"⚠️ Hardware benchmark failed ({e}); the game will use its default settings")
+        return False
+    settings = ", ".join(f"{key}={value}" for key, value in profile['config'].items()) or "defaults"
+    print(f"✅ Wrote {profile_path}: {settings}")
+    return True
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Check and install Hand Pong's dependencies")
+    parser.add_argument('--wheelhouse', metavar='DIR',
+                        help="install offline from prebuilt wheels in DIR "
+                             "(default: $HANDPONG_WHEELHOUSE or ./wheelhouse if present)")
+    parser.add_argument('--build-wheelhouse', metavar='DIR',
+                        help="download wheels for all requirements into DIR and exit")
+    parser.add_argument('--upgrade-pip', action='store_true', help="upgrade pip before installing")
+    parser.add_argument('--check-only', action='store_true',
+                        help="only report missing packages (exit status 1 if any)")
+    parser.add_argument('--no-pause', action='store_true', help="do not wait for Enter (unattended installs)")
+    parser.add_argument('--no-benchmark', action='store_true',
+                        help="skip the hardware benchmark that tunes the game's settings")
+    parser.add_argument('--profile', metavar='FILE', help="where to write the hardware profile")
+    return parser.parse_args()
+
 def main():
     """Main installer function"""
+    args = parse_args()
+    pause = (lambda prompt: None) if args.no_pause else input
+    if args.build_wheelhouse:
+        build_wheelhouse(args.build_wheelhouse)
+        return
+    
     print("🏓 Hand Pong Game - Setup Installer")
     print("=" * 50)
     
     # Check and install packages
-    if not check_and_install():
+    if not check_and_install(args.wheelhouse, upgrade_pip=args.upgrade_pip, check_only=args.check_only):
         print("\n❌ Setup failed!")
-        input("Press Enter to exit...")
+        pause("Press Enter to exit...")
+        sys.exit(1)
+    if args.check_only:
         return
     
     # Check camera
     camera_ok = check_camera()
     
+    # Measure camera, inference and rendering speed; hand.py reads the result at startup
+    if not args.no_benchmark:
+        tune_for_hardware(camera_ok, args.profile)
+    
     print("\n" + "=" * 50)
     print("🎮 SETUP COMPLETE!")
     print("=" * 50)
@@ -99,12 +229,12 @@ def main():
     if camera_ok:
         print("✅ Everything is ready to play!")
         print("\n🚀 To start the game, run:")
-        print("python hand_pong_improved.py")
+        print("python hand.py")
     else:
         print("⚠️ Setup complete, but camera issues detected.")
         print("Make sure your camera is connected and not in use.")
         print("\n🚀 You can still try running:")
-        print("python hand_pong_improved.py")
+        print("python hand.py")
     
     print("\n📋 Game Controls:")
     print("• Left hand controls left paddle")
@@ -118,7 +248,7 @@ def main():
     print("• Keep hands clearly visible")
     print("• Stay 2-3 feet from camera")
     
-    input("\nPress Enter to exit installer...")
+    pause("\nPress Enter to exit installer...")
 
 if __name__ == "__main__":
     main()
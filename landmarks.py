@@ -0,0 +1,41 @@
+"""MediaPipe hand landmarks as NumPy arrays.
+
+MediaPipe returns one protobuf message per landmark.  ``landmarks_array``
+turns a whole result into a (hands x 21 x 3) float32 array in a single
+C-level pass, so per-frame code (paddle control, gesture classification)
+works on one array instead of walking the messages point by point.
+"""
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Landmark indices used by the game
+WRIST = 0
+THUMB_TIP = 4
+INDEX_MCP = 5
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+MIDDLE_TIP = 12
+FINGER_PIPS = (6, 10, 14, 18)  # index, middle, ring, pinky
+FINGER_TIPS = (8, 12, 16, 20)
+
+_xyz = attrgetter('x', 'y', 'z')
+
+
+def landmarks_array(multi_hand_landmarks, out=None):
+    """(hands x 21 x 3) float32 array of a result's multi_hand_landmarks.
+
+    With ``out``, the values are written into its first rows and that view
+    is returned.
+    """
+    count = len(multi_hand_landmarks)
+    points = chain.from_iterable(hand.landmark for hand in multi_hand_landmarks)
+    values = np.fromiter(chain.from_iterable(map(_xyz, points)), dtype=np.float32,
+                         count=count * NUM_LANDMARKS * 3).reshape(count, NUM_LANDMARKS, 3)
+    if out is None:
+        return values
+    out[:count] = values
+    return out[:count]
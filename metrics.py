@@ -0,0 +1,219 @@
+"""Live performance metrics for the game loop.
+
+Fixed-bucket histograms (constant memory, cheap to update every frame) for
+loop interval, camera interval, inference latency and input age, plus
+counters and gauges.  ``MetricsExporter`` publishes them in the Prometheus
+text format to a file and/or a loopback HTTP endpoint.
+"""
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bucket upper bounds in seconds (0.5 ms .. 1 s)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.004, 0.008, 0.012, 0.016, 0.020, 0.025,
+                   0.033, 0.040, 0.050, 0.066, 0.100, 0.150, 0.250, 0.500, 1.0)
+
+PREFIX = 'handpong_'
+
+HISTOGRAM_HELP = {
+    'loop_interval_seconds': "Time between game loop iterations",
+    'camera_interval_seconds': "Time between processed camera frames",
+    'inference_latency_seconds': "Hand tracking inference time per frame",
+    'input_age_seconds': "Camera capture to paddle update",
+}
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.last = None
+        self.smoothed = None
+
+    def observe(self, value):
+        """Record one sample"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.last = value
+        self.smoothed = value if self.smoothed is None else self.smoothed + 0.05 * (value - self.smoothed)
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating within its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def prometheus(self, name):
+        """Histogram lines in the Prometheus text format"""
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum {self.sum:.6f}')
+        lines.append(f'{name}_count {self.count}')
+        return lines
+
+
+class GameMetrics:
+    """All metrics the game records"""
+
+    def __init__(self):
+        self.histograms = {name: Histogram() for name in HISTOGRAM_HELP}
+        self.counters = {'loop_iterations_total': 0, 'camera_frames_total': 0, 'inference_runs_total': 0,
+                         'frame_bytes_allocated_total': 0, 'frame_deadlines_missed_total': 0,
+                         'frames_late_total': 0, 'frame_tasks_deferred_total': 0}
+        self.gauges = {'camera_dropped_frames': 0, 'frame_bytes_allocated': 0, 'frame_lateness_seconds': 0.0}
+        self._last_loop = None
+        self._last_camera = None
+        self._last_allocated = 0
+
+    def loop_tick(self, now):
+        """Called at the start of every game loop iteration"""
+        if self._last_loop is not None:
+            self.histograms['loop_interval_seconds'].observe(now - self._last_loop)
+        self._last_loop = now
+        self.counters['loop_iterations_total'] += 1
+
+    def camera_frame(self, timestamp, dropped_frames):
+        """Called for every camera frame the game processes"""
+        if self._last_camera is not None:
+            self.histograms['camera_interval_seconds'].observe(timestamp - self._last_camera)
+        self._last_camera = timestamp
+        self.counters['camera_frames_total'] += 1
+        self.gauges['camera_dropped_frames'] = dropped_frames
+
+    def frame_allocations(self, total_bytes):
+        """Called per frame with the pipeline's running total of allocated bytes"""
+        # A lower total means the pipeline was rebuilt (e.g. camera reopened)
+        allocated = total_bytes - self._last_allocated if total_bytes >= self._last_allocated else total_bytes
+        self._last_allocated = total_bytes
+        self.counters['frame_bytes_allocated_total'] += allocated
+        self.gauges['frame_bytes_allocated'] = allocated
+
+    def frame_schedule(self, stats):
+        """Called with FrameScheduler.stats() to publish frame pacing"""
+        self.counters['frame_deadlines_missed_total'] = stats['missed']
+        self.counters['frames_late_total'] = stats['late']
+        self.counters['frame_tasks_deferred_total'] = stats['deferred']
+        self.gauges['frame_lateness_seconds'] = stats['lateness']
+
+    def inference(self, latency):
+        """Called after every hand inference"""
+        self.histograms['inference_latency_seconds'].observe(latency)
+        self.counters['inference_runs_total'] += 1
+
+    def input_applied(self, capture_timestamp, now):
+        """Called when a hand measurement reaches the paddles"""
+        self.histograms['input_age_seconds'].observe(max(0.0, now - capture_timestamp))
+
+    def fps(self, histogram):
+        """Smoothed rate from an interval histogram"""
+        interval = self.histograms[histogram].smoothed
+        return 1.0 / interval if interval else 0.0
+
+    def summary(self):
+        """One-line human readable summary for the overlay"""
+        inference = self.histograms['inference_latency_seconds'].smoothed
+        age = self.histograms['input_age_seconds'].smoothed
+        return (f"loop {self.fps('loop_interval_seconds'):.0f} fps | "
+                f"cam {self.fps('camera_interval_seconds'):.0f} fps | "
+                f"inf {inference * 1000 if inference else 0:.1f} ms | "
+                f"age {age * 1000 if age else 0:.0f} ms | "
+                f"drop {self.gauges['camera_dropped_frames']} | "
+                f"miss {self.counters['frame_deadlines_missed_total']}")
+
+    def prometheus_text(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, histogram in self.histograms.items():
+            full = PREFIX + name
+            lines.append(f"# HELP {full} {HISTOGRAM_HELP[name]}")
+            lines.append(f"# TYPE {full} histogram")
+            lines.extend(histogram.prometheus(full))
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {PREFIX}{name} counter")
+            lines.append(f"{PREFIX}{name} {value}")
+        gauges = dict(self.gauges,
+                      loop_fps=self.fps('loop_interval_seconds'),
+                      camera_fps=self.fps('camera_interval_seconds'))
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {PREFIX}{name} gauge")
+            lines.append(f"{PREFIX}{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Publish metrics to a text file and/or http://127.0.0.1:<port>/metrics.
+
+    ``maybe_export()`` is called from the game loop; it renders the text at
+    most once per ``interval`` seconds, so the HTTP thread only ever serves a
+    prepared string and never touches live game state.
+    """
+
+    def __init__(self, metrics, path=None, port=None, interval=1.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.text = metrics.prometheus_text()
+        self._last_export = None
+        self.server = None
+        if port is not None:
+            self._start_server(port)
+
+    def _start_server(self, port):
+        """Serve the latest text on the loopback interface"""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.text.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        threading.Thread(target=self.server.serve_forever, name="MetricsHTTP", daemon=True).start()
+
+    def maybe_export(self, now):
+        """Refresh the published metrics if the export interval has passed"""
+        if self._last_export is not None and now - self._last_export < self.interval:
+            return
+        self._last_export = now
+        self.text = self.metrics.prometheus_text()
+        if self.path:
+            # Write then rename so scrapers never see a partial file
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(self.text)
+            os.replace(tmp_path, self.path)
+
+    def close(self):
+        """Stop the HTTP server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
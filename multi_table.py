@@ -0,0 +1,352 @@
+"""Several tables (cameras and matches) on one PC.
+
+    python multi_table.py --cameras 0 1 2
+    python multi_table.py --cameras 0 1 --layout windows
+
+Every table has its own camera capture thread and its own hand inference
+worker process.  Where the OS allows it, each worker is pinned to its own
+CPU cores, so the tables' inference runs in parallel instead of queueing on
+one thread.  Physics and drawing for all tables share one Tk game loop; they
+are cheap compared to inference.
+"""
+import argparse
+import math
+import os
+import random
+import time
+import tkinter as tk
+
+import cv2
+
+import physics
+from camera import CameraStream, open_capture
+from filters import make_filter
+from frame_buffers import FrameBuffers
+from frame_scheduler import FrameScheduler
+from inference_worker import InferenceWorker, InferenceScheduler
+from metrics import GameMetrics
+from paddle_input import apply_hands, place_predicted_paddles, run_fixed_steps
+from renderer import CanvasRenderer, WidgetUpdater
+from startup import BackgroundLoader
+
+HANDS_OPTIONS = {
+    'min_detection_confidence': 0.3,
+    'min_tracking_confidence': 0.3
+}
+
+DEFAULT_TABLE_CONFIG = {
+    'camera_width': 640,
+    'camera_height': 480,
+    'camera_fps': 30,
+    'inference_every': 1,  # run inference on every Nth camera frame, or 'auto'
+    'paddle_filter': None,  # filters.make_filter spec; None = 'ema', or 'kalman' when skipping frames
+    'roi_tracking': False,
+    'canvas_width': 600,
+    'canvas_height': 400,
+    'physics_hz': 60,
+    'render_interval_ms': 1000 / 60,
+    'max_physics_steps': 5,
+    'metrics_overlay': False,
+}
+
+
+def assign_cores(num_tables, reserve=1):
+    """CPU core sets for the tables' inference workers.
+
+    With enough cores, the cores left after ``reserve`` (for the Tk thread and
+    the capture threads) are split evenly between the workers; otherwise the
+    workers share cores round-robin.  Returns Nones where affinity is not
+    supported.
+    """
+    if not hasattr(os, 'sched_getaffinity'):
+        return [None] * num_tables
+    cores = sorted(os.sched_getaffinity(0))
+    if len(cores) < 2:
+        return [None] * num_tables
+    if len(cores) >= num_tables + reserve:
+        usable = cores[reserve:]
+        per_table = len(usable) // num_tables
+        return [set(usable[i * per_table:(i + 1) * per_table]) for i in range(num_tables)]
+    return [{cores[i % len(cores)]} for i in range(num_tables)]
+
+
+class Table:
+    """One camera, inference worker and match, drawn on its own canvas"""
+
+    def __init__(self, number, camera_index, parent, config, cpus=None):
+        self.number = number
+        self.camera_index = camera_index
+        self.config = config
+
+        # Match state
+        self.rules = physics.make_rules(width=config['canvas_width'], height=config['canvas_height'])
+        self.state = physics.new_state(self.rules)
+        self.rng = physics.SeededRng(random.getrandbits(64))
+        self.accumulator = 0.0
+        self.left_hand_detected = False
+        self.right_hand_detected = False
+
+        filter_spec = config['paddle_filter']
+        if filter_spec is None:
+            filter_spec = 'ema' if config['inference_every'] == 1 else 'kalman'
+        self.paddle_filters = {'paddle1': make_filter(filter_spec), 'paddle2': make_filter(filter_spec)}
+        self.scheduler = InferenceScheduler(config['inference_every'])
+        self.frame_buffers = FrameBuffers()
+        self.metrics = GameMetrics()
+        self.last_overlay_update = 0.0
+
+        # UI
+        self.frame = tk.Frame(parent, bg='#1e293b', padx=8, pady=8)
+        self.title = tk.Label(self.frame, font=('Arial', 12, 'bold'), fg='white', bg='#1e293b')
+        self.title.pack(fill=tk.X)
+        self.canvas = tk.Canvas(
+            self.frame,
+            width=config['canvas_width'],
+            height=config['canvas_height'],
+            bg='#0f172a',
+            highlightthickness=2,
+            highlightbackground='#22c55e'
+        )
+        self.canvas.pack()
+        self.renderer = CanvasRenderer(self.canvas, config['canvas_width'], config['canvas_height'])
+        self.widgets = WidgetUpdater()
+
+        # The worker and the camera start in parallel with the other tables
+        self.status = "⏳ starting"
+        self.camera = None
+        self.cpus = cpus
+        self.inference = self.start_worker()
+        camera_config = dict(config, camera_index=camera_index)
+        self.camera_opener = BackgroundLoader(
+            lambda: open_capture(camera_config), name=f"CameraOpener{number}"
+        ).start()
+
+    def start_worker(self):
+        """Start this table's inference worker (it reports ready on its own)"""
+        return InferenceWorker(
+            frame_shape=(self.config['camera_height'], self.config['camera_width'], 3),
+            max_num_hands=2,
+            roi=self.config['roi_tracking'],
+            cpus=self.cpus,
+            **HANDS_OPTIONS
+        ).start()
+
+    def check_startup(self):
+        """Start capturing once the camera is open; returns True while capturing"""
+        if self.camera:
+            return True
+        opener = self.camera_opener
+        if opener is None or not opener.done:
+            return False
+        self.camera_opener = None
+        if opener.result is None:
+            self.status = f"❌ camera {self.camera_index} unavailable"
+            print(f"❌ Table {self.number}: cannot access camera {self.camera_index}")
+            return False
+        self.camera = CameraStream(opener.result).start()
+        print(f"📹 Table {self.number}: camera {self.camera_index} opened in {opener.elapsed:.2f}s")
+        return True
+
+    def tick(self, elapsed, now):
+        """Advance this table by one game loop iteration"""
+        self.metrics.loop_tick(now)
+        if self.check_startup():
+            self.process_camera()
+        self.update_predicted_paddles()
+
+        # Fixed-timestep physics; AI plays until hands take over
+        self.accumulator = run_fixed_steps(
+            self.accumulator + elapsed, 1.0 / self.config['physics_hz'], self.config['max_physics_steps'],
+            lambda: physics.step(self.state, self.rules, self.rng,
+                                 left_ai=not self.left_hand_detected, right_ai=not self.right_hand_detected)
+        )
+
+        self.draw(now)
+
+    def process_camera(self):
+        """Feed the newest frame to the worker and apply its latest result"""
+        try:
+            frame, timestamp = self.camera.read()
+            if frame is not None:
+                self.metrics.camera_frame(timestamp, self.camera.dropped_frames)
+                self.scheduler.note_frame(timestamp)
+                buffer = self.inference.acquire_frame_buffer()
+                if buffer is not None and self.scheduler.should_run():
+                    # No preview here, so frames are only mirrored when the model needs them
+                    frame = self.frame_buffers.mirror(frame)
+                    if frame.shape[:2] != buffer.shape[:2]:
+                        frame = self.frame_buffers.resized('model_input', frame, buffer.shape[1], buffer.shape[0])
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buffer)
+                    self.inference.submit(timestamp)
+
+            result = self.inference.poll()
+        except RuntimeError as e:
+            # The AI plays this table's paddles while a new worker loads
+            print(f"❌ Table {self.number}: {e}; restarting it")
+            self.inference.close()
+            self.inference = self.start_worker()
+            self.left_hand_detected = self.right_hand_detected = False
+            return
+        if result is not None:
+            if result['error'] and self.inference.errors % 100 == 1:
+                print(f"⚠️ Table {self.number}: hand tracking failed on {self.inference.errors} frame(s), "
+                      f"latest: {result['error']}")
+            self.apply_result(result)
+
+    def apply_result(self, result):
+        """Move paddles from a worker result"""
+        self.scheduler.record_latency(result['latency'])
+        self.metrics.inference(result['latency'])
+        timestamp = result['timestamp']
+        if result['labels']:
+            self.metrics.input_applied(timestamp, time.monotonic())
+
+        # Middle finger tip (landmark 12) sets the paddle
+        hands = zip(result['labels'], result['landmarks'][:, 12, 1].tolist())
+        targets = apply_hands(hands, self.state, self.rules, self.paddle_filters, timestamp,
+                              1.0 / self.config['physics_hz'])
+        self.left_hand_detected = 'paddle1' in targets
+        self.right_hand_detected = 'paddle2' in targets
+
+    def update_predicted_paddles(self):
+        """Move hand-controlled paddles to their filtered position for now"""
+        names = [name for name, detected in (('paddle1', self.left_hand_detected),
+                                             ('paddle2', self.right_hand_detected)) if detected]
+        place_predicted_paddles(self.state, self.rules, self.paddle_filters, names, time.monotonic())
+
+    def draw(self, now):
+        """Draw the match and the table's title line"""
+        ball, paddle1, paddle2 = self.state['ball'], self.state['paddle1'], self.state['paddle2']
+        self.renderer.draw(
+            ball['x'], ball['y'], ball['radius'],
+            (paddle1['x'], paddle1['y'], paddle1['width'], paddle1['height']),
+            (paddle2['x'], paddle2['y'], paddle2['width'], paddle2['height']),
+            self.left_hand_detected, self.right_hand_detected
+        )
+        score = self.state['score']
+        if self.camera:
+            hands = ("👈" if self.left_hand_detected else "") + ("👉" if self.right_hand_detected else "")
+            self.status = f"✋ {hands}" if hands else "🤖 AI"
+        self.widgets.set(
+            self.title,
+            text=f"Table {self.number} · camera {self.camera_index} · "
+                 f"{score['player1']} : {score['player2']} · {self.status}"
+        )
+        if self.config['metrics_overlay'] and now - self.last_overlay_update >= 0.25:
+            self.last_overlay_update = now
+            self.renderer.draw_overlay(self.metrics.summary())
+
+    def reset_score(self):
+        """Start a new match"""
+        self.state['score']['player1'] = 0
+        self.state['score']['player2'] = 0
+        physics.serve(self.state['ball'], self.rules, self.rng)
+
+    def close(self):
+        """Release the camera and stop the worker"""
+        if self.camera:
+            self.camera.release()
+            self.camera = None
+        self.inference.close()
+
+
+class MultiTableApp:
+    """Run one table per camera, in one window (grid) or one window each"""
+
+    def __init__(self, cameras, config=None, layout='grid', pin_cores=True):
+        self.config = dict(DEFAULT_TABLE_CONFIG)
+        if config:
+            self.config.update(config)
+
+        self.root = tk.Tk()
+        self.root.title("🏓 Hand Pong Game - Multi-table")
+        self.root.configure(bg='#1e293b')
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+        self.root.bind('<Escape>', lambda event: self.quit())
+        self.root.bind('<r>', lambda event: self.reset_scores())
+
+        cores = assign_cores(len(cameras)) if pin_cores else [None] * len(cameras)
+        columns = math.ceil(math.sqrt(len(cameras)))
+        self.tables = []
+        for i, (camera_index, cpus) in enumerate(zip(cameras, cores)):
+            if layout == 'windows' and i:
+                parent = tk.Toplevel(self.root, bg='#1e293b')
+                parent.title(f"🏓 Table {i + 1}")
+                parent.protocol("WM_DELETE_WINDOW", self.quit)
+            else:
+                parent = self.root
+            table = Table(i + 1, camera_index, parent, self.config, cpus=cpus)
+            if layout == 'windows':
+                table.frame.pack()
+            else:
+                table.frame.grid(row=i // columns, column=i % columns)
+            self.tables.append(table)
+            pinned = f"CPU {sorted(cpus)}" if cpus else "any CPU"
+            print(f"🏓 Table {i + 1}: camera {camera_index}, inference on {pinned}")
+
+        self.last_loop_time = time.perf_counter()
+        self.frame_scheduler = FrameScheduler(self.root, interval=self.config['render_interval_ms'] / 1000)
+        self.frame_scheduler.add('tables', self.game_loop)
+
+    def game_loop(self, now):
+        """Advance every table (one frame)"""
+        elapsed = now - self.last_loop_time
+        self.last_loop_time = now
+        for table in self.tables:
+            try:
+                table.tick(elapsed, now)
+            except Exception as e:
+                print(f"⚠️ Table {table.number} error: {e}")
+
+    def reset_scores(self):
+        """Restart every match"""
+        for table in self.tables:
+            table.reset_score()
+
+    def run(self):
+        """Show the tables until the window is closed"""
+        print("✋ Show your hands to each table's camera; R resets the scores, Esc quits")
+        self.last_loop_time = time.perf_counter()
+        self.frame_scheduler.start()
+        self.root.mainloop()
+
+    def quit(self):
+        """Stop all tables and close the windows"""
+        print("👋 Quitting multi-table Hand Pong...")
+        self.frame_scheduler.stop()
+        for table in self.tables:
+            table.close()
+        self.root.quit()
+        self.root.destroy()
+
+
+def main():
+    """Run several tables from the command line"""
+    parser = argparse.ArgumentParser(description="Hand Pong with one match per camera")
+    parser.add_argument('--cameras', type=int, nargs='+', default=[0, 1],
+                        help="camera indexes, one table each")
+    parser.add_argument('--layout', choices=['grid', 'windows'], default='grid',
+                        help="all tables in one window, or one window per table")
+    parser.add_argument('--inference-every', default=str(DEFAULT_TABLE_CONFIG['inference_every']),
+                        help="run hand tracking on every Nth camera frame, or 'auto'")
+    parser.add_argument('--filter', default=DEFAULT_TABLE_CONFIG['paddle_filter'],
+                        help="paddle input filter (ema, one_euro or kalman)")
+    parser.add_argument('--roi', action='store_true',
+                        help="track hands in small crops around their last position")
+    parser.add_argument('--no-pin', action='store_true',
+                        help="let the OS schedule the inference workers instead of pinning them to cores")
+    parser.add_argument('--metrics-overlay', action='store_true',
+                        help="show loop/camera FPS and inference time on each table")
+    args = parser.parse_args()
+
+    config = {
+        'inference_every': args.inference_every if args.inference_every == 'auto' else int(args.inference_every),
+        'paddle_filter': args.filter,
+        'roi_tracking': args.roi,
+        'metrics_overlay': args.metrics_overlay,
+    }
+    MultiTableApp(args.cameras, config, layout=args.layout, pin_cores=not args.no_pin).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""Two-player matches over UDP with rollback.
+
+Only inputs travel over the network.  Each peer sends its paddle input for
+every physics step, and both peers run the same deterministic simulation
+(``physics.step`` with a ``physics.SeededRng`` and a shared seed).  A remote
+input that has not arrived yet is predicted as its last known value.  When
+the real input arrives and differs, the session restores the snapshot taken
+before that step and re-simulates up to the present, so the local paddle
+never waits for the network.
+
+    python hand.py --net-peer 192.168.1.20:5005 --net-side left     # player 1
+    python hand.py --net-peer 192.168.1.10:5005 --net-side right    # player 2
+    python netplay.py --simulate --delay 80 --jitter 20 --loss 0.05
+
+Every session has a random id.  Peers exchange hello packets carrying
+both ids before step 0, and every packet names its sender and receiver, so
+packets from an earlier session are ignored.  A peer that restarts
+mid-match (new id) or goes silent for ``timeout`` seconds ends the match
+with ``disconnected`` set to the reason instead of stalling it forever.
+
+``--simulate`` plays two scripted peers over ``LoopbackLink`` (an in-process
+network with delay, jitter and packet loss) and checks that both ended up
+with identical states.
+"""
+import argparse
+import heapq
+import math
+import random
+import socket
+import struct
+import time
+import zlib
+
+import physics
+
+NO_HAND = -1  # input when no hand controls the paddle (the AI plays it)
+
+MAGIC = b'HP'
+VERSION = 2
+# magic, version, kind, sender session, receiver session (0 = not known yet), first input frame, ack, input count
+HEADER = struct.Struct('!2sBBIIIIB')
+HELLO, INPUTS = 0, 1
+MAX_INPUTS_PER_PACKET = 64
+
+
+def encode_packet(kind, sender, receiver, first_frame=0, ack=0, inputs=()):
+    """Datagram from session sender to session receiver, carrying inputs for first_frame, first_frame + 1, ..."""
+    return (HEADER.pack(MAGIC, VERSION, kind, sender, receiver, first_frame, ack, len(inputs)) +
+            struct.pack(f'!{len(inputs)}h', *inputs))
+
+
+def decode_packet(data):
+    """(kind, sender, receiver, first_frame, ack, inputs), or None for foreign or truncated datagrams"""
+    if len(data) < HEADER.size:
+        return None
+    magic, version, kind, sender, receiver, first_frame, ack, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or len(data) != HEADER.size + 2 * count:
+        return None
+    return kind, sender, receiver, first_frame, ack, struct.unpack_from(f'!{count}h', data, HEADER.size)
+
+
+def parse_peer(text):
+    """'host:port' -> (host, port)"""
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+class UdpTransport:
+    """Non-blocking UDP socket exchanging datagrams with one peer"""
+
+    def __init__(self, local_port, peer):
+        host, port = parse_peer(peer) if isinstance(peer, str) else peer
+        self.peer = (socket.gethostbyname(host), port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.sock.bind(('', local_port))
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.setblocking(False)
+
+    def send(self, data):
+        try:
+            self.sock.sendto(data, self.peer)
+        except OSError:
+            pass  # e.g. peer not started yet; inputs are resent with the next packet
+
+    def receive(self):
+        """All datagrams from the peer that arrived since the last call"""
+        packets = []
+        while True:
+            try:
+                data, address = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                continue  # ICMP errors surface here on some platforms
+            if address[0] == self.peer[0]:
+                packets.append(data)
+        return packets
+
+    def close(self):
+        self.sock.close()
+
+
+class LoopbackLink:
+    """In-process stand-in for the network with delay, jitter and packet loss.
+
+    ``endpoints()`` returns two transports.  Datagrams sent on one arrive on
+    the other after ``delay`` +/- ``jitter`` seconds (so they can be
+    reordered) unless they are dropped with probability ``loss``.
+    """
+
+    def __init__(self, delay=0.05, jitter=0.0, loss=0.0, seed=0, clock=time.monotonic):
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self._queues = ([], [])  # heaps of (deliver_at, sequence, data) per receiving side
+        self._sequence = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def endpoints(self):
+        return _LoopbackEndpoint(self, 0), _LoopbackEndpoint(self, 1)
+
+    def _send(self, to_side, data):
+        self.sent += 1
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        latency = max(0.0, self.delay + self.rng.uniform(-self.jitter, self.jitter))
+        self._sequence += 1
+        heapq.heappush(self._queues[to_side], (self.clock() + latency, self._sequence, data))
+
+    def _receive(self, side):
+        queue = self._queues[side]
+        now = self.clock()
+        packets = []
+        while queue and queue[0][0] <= now:
+            packets.append(heapq.heappop(queue)[2])
+        return packets
+
+
+class _LoopbackEndpoint:
+    """One side of a LoopbackLink, with the UdpTransport interface"""
+
+    def __init__(self, link, side):
+        self.link = link
+        self.side = side
+
+    def send(self, data):
+        self.link._send(1 - self.side, data)
+
+    def receive(self):
+        return self.link._receive(self.side)
+
+    def close(self):
+        pass
+
+
+class RollbackSession:
+    """A deterministic match between a local and a remote player.
+
+    ``advance(local_input)`` is called once per physics step with the local
+    paddle's y (or None when no hand is seen).  Local inputs are applied
+    ``input_delay`` steps later, which hides that much network latency
+    without any rollback.  The session never gets more than
+    ``max_rollback`` steps ahead of the last confirmed remote input; beyond
+    that it stalls until the peer catches up.  Until the hello exchange
+    with the peer has completed (``connected``), and once the peer is gone
+    (``disconnected``), ``advance()`` does not step at all.
+    """
+
+    def __init__(self, transport, local_side='left', seed=0, rules=None, state=None,
+                 input_delay=2, max_rollback=12, checksum_history=600,
+                 session_id=None, timeout=5.0, clock=time.monotonic):
+        self.transport = transport
+        self.session_id = session_id or random.SystemRandom().getrandbits(32) or 1
+        self.peer_id = None  # the peer's session id, from its packets
+        self.connected = False  # hello exchange done; step 0 may run
+        self.disconnected = None  # why the match ended (peer restarted or silent)
+        self.timeout = timeout
+        self.clock = clock
+        self.last_heard = None
+        self.local_side = local_side
+        self.rules = rules or physics.make_rules()
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.checksum_history = checksum_history
+
+        # Both peers start from the same state and serve with the same seed.
+        # A caller's state dict is reset in place so references to it stay valid.
+        fresh = physics.new_state(self.rules)
+        if state is None:
+            state = fresh
+        else:
+            physics.restore(state, physics.snapshot(fresh))
+        self.state = state
+        self.rng = physics.SeededRng(seed)
+        physics.serve(self.state['ball'], self.rules, self.rng)
+
+        self.frame = 0  # next step to simulate
+        self.local_inputs = [NO_HAND] * input_delay  # index = step
+        self.remote_inputs = []  # confirmed remote inputs, index = step
+        self.used_remote = {}  # step -> remote input the simulation used
+        self.snapshots = {}  # step -> (state snapshot, rng counter) before simulating it
+        self.checksums = {}  # step -> CRC of the state after it, once its inputs are final
+        self.remote_ack = 0  # how many of our inputs the peer has confirmed
+        self._checked = 0  # steps below this have a checksum (or were pruned)
+
+        # Stats
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        self.max_rollback_depth = 0
+        self.stalls = 0
+        self.handshake_ticks = 0
+
+    @property
+    def confirmed_frame(self):
+        """Number of steps whose remote input has arrived"""
+        return len(self.remote_inputs)
+
+    @property
+    def frames_ahead(self):
+        """How many simulated steps still rely on predicted remote input"""
+        return max(0, self.frame - len(self.remote_inputs))
+
+    def advance(self, local_input=None):
+        """Record this step's local input and simulate one step.
+
+        Returns 'player1'/'player2' if someone scored in this step.  Returns
+        None without stepping (and counts a stall) when too far ahead of the
+        remote player, while waiting for the peer to connect, and after it
+        has disconnected.
+        """
+        if self.disconnected:
+            return None
+        earliest = self._receive()
+        if self.disconnected:
+            return None
+        if not self.connected:
+            # Step 0 waits until both peers know each other's session
+            self.handshake_ticks += 1
+            self.transport.send(encode_packet(HELLO, self.session_id, self.peer_id or 0))
+            return None
+        if self.clock() - self.last_heard > self.timeout:
+            self.disconnected = f"peer disconnected (nothing received for {self.timeout:g}s)"
+            return None
+        if earliest is not None:
+            self._rollback(earliest)
+
+        if self.frame - len(self.remote_inputs) >= self.max_rollback:
+            self.stalls += 1
+            self._send()
+            return None
+
+        self.local_inputs.append(NO_HAND if local_input is None else int(local_input))
+        self._send()
+        scorer = self._simulate(self.frame)
+        self._prune()
+        return scorer
+
+    def _remote_input(self, frame):
+        """Confirmed remote input for frame, or the prediction (last known value)"""
+        if frame < len(self.remote_inputs):
+            return self.remote_inputs[frame]
+        return self.remote_inputs[-1] if self.remote_inputs else NO_HAND
+
+    def _simulate(self, frame):
+        """Run one physics step with the best inputs known for it"""
+        self.snapshots[frame] = (physics.snapshot(self.state), self.rng.counter)
+        local = self.local_inputs[frame]
+        remote = self.used_remote[frame] = self._remote_input(frame)
+        left, right = (local, remote) if self.local_side == 'left' else (remote, local)
+        if left != NO_HAND:
+            self.state['paddle1']['y'] = left
+        if right != NO_HAND:
+            self.state['paddle2']['y'] = right
+        scorer = physics.step(self.state, self.rules, self.rng,
+                              left_ai=left == NO_HAND, right_ai=right == NO_HAND)
+        self.frame = frame + 1
+        return scorer
+
+    def _rollback(self, start):
+        """Restore the state before step start and simulate up to the present again"""
+        depth = self.frame - start
+        self.rollbacks += 1
+        self.resimulated_frames += depth
+        self.max_rollback_depth = max(self.max_rollback_depth, depth)
+        saved, counter = self.snapshots[start]
+        physics.restore(self.state, saved)
+        self.rng.counter = counter
+        for frame in range(start, start + depth):
+            self._simulate(frame)
+
+    def _receive(self):
+        """Take in remote inputs; returns the first simulated step that was mispredicted"""
+        earliest = None
+        for data in self.transport.receive():
+            packet = decode_packet(data)
+            if packet is None:
+                continue
+            kind, sender, receiver, first_frame, ack, inputs = packet
+            if sender != self.peer_id:
+                if self.connected:
+                    # Our peer's session ended and a new one started: this match cannot go on
+                    self.disconnected = "peer restarted"
+                    return None
+                self.peer_id = sender  # the newest session of the peer wins until we connect
+            if receiver != self.session_id:
+                continue  # the peer does not know our session (yet)
+            self.last_heard = self.clock()
+            if not self.connected:
+                self.connected = True
+                # Acknowledge, in case the peer has not heard from us yet
+                self.transport.send(encode_packet(HELLO, self.session_id, self.peer_id))
+            if kind != INPUTS:
+                continue
+            self.remote_ack = max(self.remote_ack, ack)
+            # Inputs are resent until acknowledged, so only contiguous ones are kept
+            for frame in range(len(self.remote_inputs), first_frame + len(inputs)):
+                if frame < first_frame:
+                    break
+                value = inputs[frame - first_frame]
+                self.remote_inputs.append(value)
+                if frame < self.frame and self.used_remote[frame] != value and earliest is None:
+                    earliest = frame
+        return earliest
+
+    def _send(self):
+        """Send every local input the peer has not acknowledged (and our ack)"""
+        first = max(self.remote_ack, len(self.local_inputs) - MAX_INPUTS_PER_PACKET)
+        self.transport.send(encode_packet(INPUTS, self.session_id, self.peer_id, first, len(self.remote_inputs),
+                                          self.local_inputs[first:]))
+
+    def _prune(self):
+        """Checksum steps whose inputs are final and drop snapshots no longer needed"""
+        final = min(len(self.remote_inputs), self.frame)
+        for frame in range(self._checked, final):
+            after = self.snapshots[frame + 1] if frame + 1 < self.frame else (physics.snapshot(self.state), self.rng.counter)
+            self.checksums[frame] = zlib.crc32(repr(after).encode())
+            self.snapshots.pop(frame, None)
+            self.used_remote.pop(frame, None)
+            self.checksums.pop(frame - self.checksum_history, None)
+        self._checked = max(self._checked, final)
+
+    def stats(self):
+        """Counters for logging and metrics"""
+        return {
+            'connected': self.connected,
+            'frame': self.frame,
+            'frames_ahead': self.frames_ahead,
+            'rollbacks': self.rollbacks,
+            'resimulated_frames': self.resimulated_frames,
+            'max_rollback_depth': self.max_rollback_depth,
+            'stalls': self.stalls,
+            'handshake_ticks': self.handshake_ticks,
+        }
+
+    def close(self):
+        self.transport.close()
+
+
+def scripted_input(side, frame):
+    """Test input: a hand moving up and down, absent every fourth 5-second block"""
+    if (frame // 300) % 4 == 3:
+        return None
+    phase = 0.0 if side == 'left' else 1.7
+    return int(160 + 140 * math.sin(frame / 37.0 + phase))
+
+
+def simulate(frames=3600, delay=0.08, jitter=0.02, loss=0.05, input_delay=2, max_rollback=12,
+             seed=0, hz=60):
+    """Play two scripted peers over a LoopbackLink and compare their states"""
+    clock = [0.0]
+    link = LoopbackLink(delay, jitter, loss, seed=seed, clock=lambda: clock[0])
+    left_end, right_end = link.endpoints()
+    peers = [
+        RollbackSession(left_end, 'left', seed=seed, input_delay=input_delay, max_rollback=max_rollback,
+                        checksum_history=2 * frames, clock=lambda: clock[0]),
+        RollbackSession(right_end, 'right', seed=seed, input_delay=input_delay, max_rollback=max_rollback,
+                        checksum_history=2 * frames, clock=lambda: clock[0]),
+    ]
+    # Run until both peers have simulated and confirmed every frame
+    ticks = 0
+    while min(len(peer.checksums) for peer in peers) < frames and ticks < frames * 10:
+        clock[0] += 1.0 / hz
+        for peer in peers:
+            value = scripted_input(peer.local_side, peer.frame) if peer.frame < frames else None
+            peer.advance(value)
+        ticks += 1
+
+    left, right = peers
+    common = sorted(set(left.checksums) & set(right.checksums))
+    desyncs = [frame for frame in common if left.checksums[frame] != right.checksums[frame]]
+    return {
+        'frames': frames,
+        'ticks': ticks,
+        'delay_ms': delay * 1000,
+        'jitter_ms': jitter * 1000,
+        'loss': loss,
+        'packets_sent': link.sent,
+        'packets_dropped': link.dropped,
+        'compared_frames': len(common),
+        'desyncs': len(desyncs),
+        'disconnected': left.disconnected or right.disconnected,
+        'first_desync': desyncs[0] if desyncs else None,
+        'score': dict(left.state['score']),
+        'peers': {'left': left.stats(), 'right': right.stats()},
+    }
+
+
+def main():
+    """Run the loopback simulation from the command line"""
+    parser = argparse.ArgumentParser(description="Rollback netplay loopback simulation")
+    parser.add_argument('--simulate', action='store_true', help="run two scripted peers over a simulated network")
+    parser.add_argument('--frames', type=int, default=3600, help="physics steps to play")
+    parser.add_argument('--delay', type=float, default=80, help="one-way delay in ms")
+    parser.add_argument('--jitter', type=float, default=20, help="+/- delay variation in ms")
+    parser.add_argument('--loss', type=float, default=0.05, help="packet loss probability")
+    parser.add_argument('--input-delay', type=int, default=2, help="local input delay in steps")
+    parser.add_argument('--max-rollback', type=int, default=12, help="steps of prediction before stalling")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if not args.simulate:
+        parser.error("use --simulate (online games are started with hand.py --net-peer)")
+
+    report = simulate(args.frames, args.delay / 1000, args.jitter / 1000, args.loss,
+                      args.input_delay, args.max_rollback, args.seed)
+    print(f"Network: {report['delay_ms']:.0f} ms ± {report['jitter_ms']:.0f} ms, "
+          f"{report['loss']:.0%} loss ({report['packets_dropped']}/{report['packets_sent']} packets dropped)")
+    for side, stats in report['peers'].items():
+        print(f"{side:>5}: {stats['handshake_ticks']} ticks to connect, {stats['rollbacks']} rollbacks, {stats['resimulated_frames']} re-simulated steps "
+              f"(max depth {stats['max_rollback_depth']}), {stats['stalls']} stalls")
+    print(f"Score {report['score']['player1']} - {report['score']['player2']} after {report['frames']} steps "
+          f"({report['ticks']} ticks)")
+    if report['disconnected']:
+        print(f"❌ Match ended early: {report['disconnected']}")
+        raise SystemExit(1)
+    if report['desyncs']:
+        print(f"❌ Desync: {report['desyncs']} of {report['compared_frames']} steps differ "
+              f"(first at step {report['first_desync']})")
+        raise SystemExit(1)
+    print(f"✅ Both peers agree on all {report['compared_frames']} confirmed steps")
+
+
+if __name__ == "__main__":
+    main()
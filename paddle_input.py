@@ -0,0 +1,61 @@
+"""Hand measurements to paddle positions, and the fixed-timestep loop.
+
+Shared by ``HandPongGame`` (hand.py) and the tables of multi_table.py so
+both map hands to paddles, filter them and step the physics the same way.
+Hands are (MediaPipe handedness label, normalized y) pairs from a mirrored
+frame; this module needs neither NumPy nor MediaPipe.
+"""
+from filters import update_from
+
+# The frame is mirrored: the player's right hand (labelled "Right") holds the left paddle
+PADDLE_FOR_HAND = {'Right': 'paddle1', 'Left': 'paddle2'}
+
+
+def paddle_target(hand_y, rules):
+    """Paddle top y that centers the paddle on a normalized hand height, kept on the court"""
+    height, paddle_height = rules['height'], rules['paddle_height']
+    return max(0, min(hand_y * height - paddle_height / 2, height - paddle_height))
+
+
+def apply_hands(hands, state, rules, paddle_filters, timestamp, seed_interval=1 / 60):
+    """Feed hands seen at timestamp to the paddle filters; returns {paddle name: target y}.
+
+    Filters of paddles without a hand are reset, so a hand that comes back
+    starts from where the (AI-controlled) paddle is by then (see
+    filters.update_from; seed_interval is one physics step).
+    """
+    targets = {}
+    for label, hand_y in hands:
+        name = PADDLE_FOR_HAND.get(label)
+        if name is None:
+            continue
+        targets[name] = paddle_target(hand_y, rules)
+        update_from(paddle_filters[name], state[name]['y'], targets[name], timestamp, seed_interval)
+
+    # Forget the motion of hands that disappeared
+    for name, paddle_filter in paddle_filters.items():
+        if name not in targets:
+            paddle_filter.reset()
+    return targets
+
+
+def place_predicted_paddles(state, rules, paddle_filters, names, now):
+    """Move the named (hand-controlled) paddles to their filtered position for now"""
+    for name in names:
+        predicted = paddle_filters[name].predict(now)
+        if predicted is not None:
+            paddle = state[name]
+            paddle['y'] = int(max(0, min(predicted, rules['height'] - paddle['height'])))
+
+
+def run_fixed_steps(accumulator, dt, max_steps, step):
+    """Call step() once per whole dt in accumulator, at most max_steps times; returns what is left"""
+    steps = 0
+    while accumulator >= dt and steps < max_steps:
+        step()
+        accumulator -= dt
+        steps += 1
+    if steps == max_steps:
+        # Too far behind: drop the backlog instead of slowing the game down
+        accumulator = min(accumulator, dt)
+    return accumulator
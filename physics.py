@@ -0,0 +1,209 @@
+"""Pong rules without any UI.
+
+The game state is a plain dict of dicts (ball, paddles, score) so it is cheap
+to copy and easy to inspect.  ``batch_physics.py`` implements the same rules
+on NumPy arrays for running many matches at once.
+
+The ball moves with swept collision: walls and paddles are hit at their exact
+time of impact within a step, so it cannot tunnel through them however fast
+it gets, and the cost of a step does not grow with the ball's speed.
+
+With a ``SeededRng`` the rules are deterministic: the same seed and inputs
+give the same match on any machine, which networked play relies on.
+"""
+import math
+
+DEFAULT_RULES = {
+    'width': 600,
+    'height': 400,
+    'ball_radius': 8,
+    'serve_speed': 4,
+    'serve_jitter': 0.0,  # +/- fraction applied to the vertical serve speed
+    'speedup': 1.05,  # ball speed factor on every paddle hit
+    'max_ball_speed': 40,  # horizontal speed cap in pixels per step
+    'paddle_width': 8,
+    'paddle_height': 80,
+    'left_paddle_x': 10,
+    'right_paddle_x': 582,
+    'paddle_start_y': 180,
+    'ai_speed': 3,
+    'ai_deadzone': 20,
+}
+
+
+STATE_PARTS = ('ball', 'paddle1', 'paddle2', 'score')
+
+# Paddle bounces resolved within one step; motion left after that is dropped
+MAX_PADDLE_HITS = 2
+
+_MASK64 = (1 << 64) - 1
+
+
+class SeededRng:
+    """Counter-based random numbers (SplitMix64), identical on every platform.
+
+    The whole generator state is one integer, ``counter``, so it can be saved
+    and restored along with a game state snapshot.
+    """
+
+    def __init__(self, seed=0, counter=0):
+        self.seed = seed & _MASK64
+        self.counter = counter
+
+    def random(self):
+        """Uniform float in [0, 1)"""
+        self.counter += 1
+        z = (self.seed + self.counter * 0x9E3779B97F4A7C15) & _MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        z ^= z >> 31
+        return (z >> 11) * (1.0 / (1 << 53))
+
+
+def snapshot(state):
+    """Copy of the state's values, cheap enough to take every step"""
+    return tuple(tuple(state[part].values()) for part in STATE_PARTS)
+
+
+def restore(state, saved):
+    """Put snapshot() values back into state in place (references stay valid)"""
+    for part, values in zip(STATE_PARTS, saved):
+        target = state[part]
+        for key, value in zip(target, values):
+            target[key] = value
+
+
+def make_rules(**overrides):
+    """Return a copy of DEFAULT_RULES with overrides applied"""
+    unknown = set(overrides) - set(DEFAULT_RULES)
+    if unknown:
+        raise KeyError(f"Unknown rule(s): {', '.join(sorted(unknown))}")
+    rules = dict(DEFAULT_RULES)
+    rules.update(overrides)
+    return rules
+
+
+def new_state(rules):
+    """Create a fresh game state with the ball at the center"""
+    paddle_y = rules['paddle_start_y']
+    return {
+        'ball': {
+            'x': rules['width'] // 2,
+            'y': rules['height'] // 2,
+            'dx': rules['serve_speed'],
+            'dy': rules['serve_speed'],
+            'radius': rules['ball_radius']
+        },
+        'paddle1': {'x': rules['left_paddle_x'], 'y': paddle_y,
+                    'width': rules['paddle_width'], 'height': rules['paddle_height']},
+        'paddle2': {'x': rules['right_paddle_x'], 'y': paddle_y,
+                    'width': rules['paddle_width'], 'height': rules['paddle_height']},
+        'score': {'player1': 0, 'player2': 0}
+    }
+
+
+def serve(ball, rules, rng):
+    """Put the ball back in the center with a random diagonal direction"""
+    speed = rules['serve_speed']
+    ball['x'] = rules['width'] // 2
+    ball['y'] = rules['height'] // 2
+    ball['dx'] = speed * (1 if rng.random() > 0.5 else -1)
+    ball['dy'] = speed * (1 if rng.random() > 0.5 else -1)
+    if rules['serve_jitter']:
+        ball['dy'] *= 1 + rules['serve_jitter'] * (2 * rng.random() - 1)
+
+
+def move_ai_paddle(paddle, ball_y, rules):
+    """Move a computer-controlled paddle towards the ball"""
+    paddle_center = paddle['y'] + paddle['height'] // 2
+    if paddle_center < ball_y - rules['ai_deadzone']:
+        paddle['y'] = min(paddle['y'] + rules['ai_speed'], rules['height'] - paddle['height'])
+    elif paddle_center > ball_y + rules['ai_deadzone']:
+        paddle['y'] = max(paddle['y'] - rules['ai_speed'], 0)
+
+
+def bounce_speed(dx, rules):
+    """Horizontal speed after a paddle hit: reversed, sped up and capped"""
+    return -math.copysign(min(abs(dx) * rules['speedup'], rules['max_ball_speed']), dx)
+
+
+def fold_walls(y, dy, t, radius, height):
+    """Ball center y and dy after moving for time t between the top and bottom walls.
+
+    Reflections are folded in closed form, so any number of bounces costs the same.
+    """
+    span = height - 2 * radius
+    travelled = y - radius + dy * t
+    folded = travelled - 2 * span * math.floor(travelled / (2 * span))
+    if folded > span:
+        return radius + 2 * span - folded, -dy
+    return radius + folded, dy
+
+
+def move_ball(ball, paddle1, paddle2, rules):
+    """Move the ball through one step, bouncing off paddles at their time of impact.
+
+    Returns the number of paddle hits.
+    """
+    radius = ball['radius']
+    height = rules['height']
+    remaining = 1.0
+    for hits in range(MAX_PADDLE_HITS + 1):
+        dx = ball['dx']
+        # Ball edge against the face of the paddle it is heading for
+        if dx < 0:
+            paddle, face = paddle1, paddle1['x'] + paddle1['width'] + radius
+        else:
+            paddle, face = paddle2, paddle2['x'] - radius
+        t = (face - ball['x']) / dx if dx else -1.0
+        if 0 <= t <= remaining:
+            y, dy = fold_walls(ball['y'], ball['dy'], t, radius, height)
+            if paddle['y'] <= y <= paddle['y'] + paddle['height']:
+                ball['x'], ball['y'], ball['dy'] = face, y, dy
+                ball['dx'] = bounce_speed(dx, rules)
+                remaining -= t
+                continue
+        ball['x'] += ball['dx'] * remaining
+        ball['y'], ball['dy'] = fold_walls(ball['y'], ball['dy'], remaining, radius, height)
+        return hits
+    return MAX_PADDLE_HITS
+
+
+def step(state, rules, rng, left_ai=True, right_ai=True):
+    """Advance the game by one physics step.
+
+    Returns 'player1' or 'player2' if that player scored during the step,
+    otherwise None.
+    """
+    ball = state['ball']
+    paddle1 = state['paddle1']
+    paddle2 = state['paddle2']
+
+    # AI control for paddles when hands not detected
+    if left_ai:
+        move_ai_paddle(paddle1, ball['y'], rules)
+    if right_ai:
+        move_ai_paddle(paddle2, ball['y'], rules)
+
+    # A paddle moved onto the ball: send the ball back the way it came
+    radius = ball['radius']
+    if (ball['dx'] < 0 and paddle1['x'] - radius <= ball['x'] <= paddle1['x'] + paddle1['width'] + radius and
+            paddle1['y'] <= ball['y'] <= paddle1['y'] + paddle1['height']):
+        ball['dx'] = bounce_speed(ball['dx'], rules)
+    elif (ball['dx'] > 0 and paddle2['x'] - radius <= ball['x'] <= paddle2['x'] + paddle2['width'] + radius and
+            paddle2['y'] <= ball['y'] <= paddle2['y'] + paddle2['height']):
+        ball['dx'] = bounce_speed(ball['dx'], rules)
+
+    # Ball movement, with wall and paddle bounces at their exact time of impact
+    move_ball(ball, paddle1, paddle2, rules)
+
+    # Scoring
+    if ball['x'] < 0:
+        state['score']['player2'] += 1
+        serve(ball, rules, rng)
+        return 'player2'
+    if ball['x'] > rules['width']:
+        state['score']['player1'] += 1
+        serve(ball, rules, rng)
+        return 'player1'
+    return None
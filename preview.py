@@ -0,0 +1,73 @@
+"""Camera preview that reuses its buffers and Tk image every frame."""
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+LINE_COLOR = (255, 255, 255)
+POINT_COLOR = (0, 0, 255)
+
+
+class CameraPreview:
+    """Show downscaled camera frames with hand landmarks in a Tk label.
+
+    The frame is shrunk first and landmarks are drawn on the small image, so
+    nothing is ever drawn at full camera resolution.  The resize, color
+    conversion and PhotoImage are all allocated once and reused.  Without a
+    label (headless, e.g. for benchmarks) only the buffers are updated.
+    """
+
+    def __init__(self, label, size=(240, 180), fps=30, connections=()):
+        self.label = label
+        self.width, self.height = size
+        self.interval = 1.0 / fps if fps else 0.0
+        self.connections = list(connections)
+        self.last_update = 0.0
+
+        # Preallocated buffers; the PIL image shares memory with self.rgba
+        self.small = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.rgba = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        self.image = Image.frombuffer('RGBA', size, self.rgba, 'raw', 'RGBA', 0, 1)
+        self.photo = ImageTk.PhotoImage('RGBA', size) if label is not None else None
+        self.attached = False
+
+    def due(self, now=None):
+        """Whether the preview rate allows another update"""
+        now = time.monotonic() if now is None else now
+        return now - self.last_update >= self.interval
+
+    def update(self, frame, landmarks=None):
+        """Show frame (BGR, any size) with optional (hands x 21 x 3) landmarks"""
+        now = time.monotonic()
+        if not self.due(now):
+            return False
+        self.last_update = now
+
+        cv2.resize(frame, (self.width, self.height), dst=self.small, interpolation=cv2.INTER_AREA)
+        if landmarks is not None and len(landmarks):
+            self.draw_landmarks(landmarks)
+        cv2.cvtColor(self.small, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+
+        if self.photo is None:
+            return True
+        self.photo.paste(self.image)
+        if not self.attached:
+            self.label.config(image=self.photo, text='')
+            self.attached = True
+        return True
+
+    def draw_landmarks(self, landmarks):
+        """Draw normalized landmarks scaled to the preview size"""
+        scale = np.array([self.width, self.height], dtype=np.float32)
+        for hand in landmarks:
+            points = [tuple(p) for p in (hand[:, :2] * scale).astype(np.int32).tolist()]
+            for start, end in self.connections:
+                cv2.line(self.small, points[start], points[end], LINE_COLOR, 1)
+            for point in points:
+                cv2.circle(self.small, point, 2, POINT_COLOR, -1)
+
+    def detach(self, text):
+        """Replace the image with a text message"""
+        self.label.config(image='', text=text)
+        self.attached = False
@@ -0,0 +1,271 @@
+"""Software-rasterized game rendering into a single NumPy image.
+
+``RasterRenderer`` has the same ``draw()``/``draw_overlay()`` interface as
+``renderer.CanvasRenderer``, but paints the court, paddles, ball, an
+optional camera picture-in-picture and the overlay text into one
+preallocated image with slice fills and masked copies.  Only the areas
+drawn last frame are restored from a prerendered background, so a frame
+costs a few small copies however large the output is.
+
+The finished image is handed to a sink once per frame: ``TkImageSink``
+pastes it into a single image item on the game canvas, ``WindowSink`` shows
+it in an OpenCV window (optionally fullscreen).  The output size is
+independent of the game's coordinate system; the court is scaled
+uniformly and letterboxed, so it stays sharp on large kiosk screens.
+
+    python raster_renderer.py --size 1920x1080   # time rendering headlessly
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from renderer import IDLE_COLOR, ACTIVE_COLOR, BALL_COLOR, CENTER_LINE_COLOR, OVERLAY_COLOR
+
+COURT_COLOR = '#0f172a'
+BORDER_COLOR = '#22c55e'
+LETTERBOX_COLOR = '#1e293b'
+
+
+def parse_size(text):
+    """'1920x1080' -> (1920, 1080)"""
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+class TkImageSink:
+    """Show frames as one image item on a Tk canvas (one paste per frame)"""
+
+    order = 'RGBA'
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.photo = None
+        self.pil_image = None
+
+    def attach(self, image):
+        """Share the renderer's image buffer and put it on the canvas"""
+        from PIL import Image, ImageTk
+        height, width = image.shape[:2]
+        # RGBA frombuffer shares memory with the array, so nothing is copied until paste()
+        self.pil_image = Image.frombuffer('RGBA', (width, height), image, 'raw', 'RGBA', 0, 1)
+        self.photo = ImageTk.PhotoImage('RGBA', (width, height))
+        self.canvas.create_image(0, 0, anchor='nw', image=self.photo)
+
+    def show(self, image):
+        self.photo.paste(self.pil_image)
+
+    def close(self):
+        pass
+
+
+class WindowSink:
+    """Show frames in an OpenCV window, optionally fullscreen"""
+
+    order = 'BGR'
+
+    def __init__(self, name="Hand Pong", fullscreen=False):
+        self.name = name
+        self.fullscreen = fullscreen
+
+    def attach(self, image):
+        cv2.namedWindow(self.name, cv2.WINDOW_NORMAL | cv2.WINDOW_KEEPRATIO)
+        if self.fullscreen:
+            cv2.setWindowProperty(self.name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+
+    def show(self, image):
+        cv2.imshow(self.name, image)
+        cv2.waitKey(1)
+
+    def close(self):
+        cv2.destroyWindow(self.name)
+
+
+class RasterRenderer:
+    """Draw the court, paddles and ball into one NumPy image"""
+
+    def __init__(self, width, height, size=None, sink=None, order='RGBA', pip_width=0.3):
+        self.width = width  # game units
+        self.height = height
+        self.sink = sink
+        self.order = sink.order if sink else order
+        out_width, out_height = size or (width, height)
+
+        # Uniform scale, court centered with letterbox bars
+        self.scale = min(out_width / width, out_height / height)
+        self.offset_x = (out_width - width * self.scale) / 2
+        self.offset_y = (out_height - height * self.scale) / 2
+
+        self.image = np.empty((out_height, out_width, len(self.order)), dtype=np.uint8)
+        self.background = np.empty_like(self.image)
+        self._draw_background()
+        np.copyto(self.image, self.background)
+
+        self._dirty = []  # (y0, y1, x0, x1) drawn last frame, restored before the next
+        self._disks = {}  # pixel radius -> (size, size, 1) bool mask
+
+        # Picture-in-picture, bottom center of the court
+        pip_w = int(width * self.scale * pip_width)
+        self.picture = None
+        self._picture_buffer = np.empty((pip_w * 3 // 4, pip_w, len(self.order)), dtype=np.uint8)
+        self._picture_small = np.empty(self._picture_buffer.shape[:2] + (3,), dtype=np.uint8)
+
+        self.overlay_text = None
+        self.overlay_scale = max(0.8, self.scale * 0.9)
+        self.colors = {name: self.color(name) for name in (IDLE_COLOR, ACTIVE_COLOR, BALL_COLOR)}
+        self.overlay_color = tuple(int(c) for c in self.color(OVERLAY_COLOR))
+
+        if sink:
+            sink.attach(self.image)
+
+    def color(self, name):
+        """Tk color ('#rrggbb' or 'white') as a pixel in this renderer's channel order"""
+        hex_color = '#ffffff' if name == 'white' else name
+        rgba = {'R': int(hex_color[1:3], 16), 'G': int(hex_color[3:5], 16), 'B': int(hex_color[5:7], 16), 'A': 255}
+        return np.array([rgba[channel] for channel in self.order], dtype=np.uint8)
+
+    def _bounds(self, x0, y0, x1, y1):
+        """Game-unit box to clipped pixel slices bounds (y0, y1, x0, x1)"""
+        out_height, out_width = self.image.shape[:2]
+        px0 = min(max(int(round(self.offset_x + x0 * self.scale)), 0), out_width)
+        px1 = min(max(int(round(self.offset_x + x1 * self.scale)), 0), out_width)
+        py0 = min(max(int(round(self.offset_y + y0 * self.scale)), 0), out_height)
+        py1 = min(max(int(round(self.offset_y + y1 * self.scale)), 0), out_height)
+        return py0, py1, px0, px1
+
+    def _draw_background(self):
+        """Prerender the letterbox, court, border and center line"""
+        bg = self.background
+        bg[:] = self.color(LETTERBOX_COLOR if self.offset_x or self.offset_y else COURT_COLOR)
+        y0, y1, x0, x1 = self._bounds(0, 0, self.width, self.height)
+        if self.offset_x or self.offset_y:
+            border = max(1, int(round(2 * self.scale)))
+            bg[max(y0 - border, 0):y1 + border, max(x0 - border, 0):x1 + border] = self.color(BORDER_COLOR)
+        bg[y0:y1, x0:x1] = self.color(COURT_COLOR)
+        line = self.color(CENTER_LINE_COLOR)
+        for i in range(0, self.height, 20):
+            dy0, dy1, dx0, dx1 = self._bounds(self.width // 2 - 1, i, self.width // 2 + 1, i + 10)
+            bg[dy0:dy1, dx0:dx1] = line
+
+    def _disk(self, radius):
+        """Cached boolean disk mask for a pixel radius"""
+        mask = self._disks.get(radius)
+        if mask is None:
+            yy, xx = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+            mask = (xx * xx + yy * yy <= radius * radius + radius)[:, :, None]
+            self._disks[radius] = mask
+        return mask
+
+    def _restore(self):
+        """Put the background back where the last frame drew"""
+        for y0, y1, x0, x1 in self._dirty:
+            self.image[y0:y1, x0:x1] = self.background[y0:y1, x0:x1]
+        self._dirty.clear()
+
+    def _fill_rect(self, x, y, w, h, color):
+        y0, y1, x0, x1 = self._bounds(x, y, x + w, y + h)
+        self.image[y0:y1, x0:x1] = color
+        self._dirty.append((y0, y1, x0, x1))
+
+    def _fill_disk(self, x, y, radius, color):
+        r = max(1, int(round(radius * self.scale)))
+        cx = int(round(self.offset_x + x * self.scale))
+        cy = int(round(self.offset_y + y * self.scale))
+        out_height, out_width = self.image.shape[:2]
+        y0, y1 = max(cy - r, 0), min(cy + r + 1, out_height)
+        x0, x1 = max(cx - r, 0), min(cx + r + 1, out_width)
+        if y0 >= y1 or x0 >= x1:
+            return
+        mask = self._disk(r)[y0 - (cy - r):y1 - (cy - r), x0 - (cx - r):x1 - (cx - r)]
+        np.copyto(self.image[y0:y1, x0:x1], color, where=mask)
+        self._dirty.append((y0, y1, x0, x1))
+
+    def set_picture(self, frame):
+        """Show a BGR frame (any size) as picture-in-picture; None hides it"""
+        if frame is None:
+            self.picture = None
+            return
+        height, width = self._picture_small.shape[:2]
+        cv2.resize(frame, (width, height), dst=self._picture_small, interpolation=cv2.INTER_AREA)
+        if self.order == 'BGR':
+            np.copyto(self._picture_buffer, self._picture_small)
+        else:
+            cv2.cvtColor(self._picture_small, cv2.COLOR_BGR2RGBA, dst=self._picture_buffer)
+        self.picture = self._picture_buffer
+
+    def draw_overlay(self, text):
+        """Show a line of text in the top-left corner (None hides it)"""
+        self.overlay_text = text or None
+
+    def draw(self, ball_x, ball_y, radius, paddle1, paddle2, left_active, right_active):
+        """Render a frame; paddles are (x, y, width, height) tuples"""
+        self._restore()
+
+        if self.picture is not None:
+            height, width = self.picture.shape[:2]
+            _, court_y1, court_x0, court_x1 = self._bounds(0, 0, self.width, self.height)
+            x0 = (court_x0 + court_x1 - width) // 2
+            y0 = court_y1 - height - 4
+            self.image[y0:y0 + height, x0:x0 + width] = self.picture
+            self._dirty.append((y0, y0 + height, x0, x0 + width))
+
+        # Paddles change color when a hand controls them
+        active, idle = self.colors[ACTIVE_COLOR], self.colors[IDLE_COLOR]
+        for (x, y, w, h), is_active in ((paddle1, left_active), (paddle2, right_active)):
+            self._fill_rect(x, y, w, h, active if is_active else idle)
+
+        # Ball changes color when any hand detected
+        self._fill_disk(ball_x, ball_y, radius, active if (left_active or right_active) else self.colors[BALL_COLOR])
+
+        if self.overlay_text:
+            (text_w, text_h), baseline = cv2.getTextSize(self.overlay_text, cv2.FONT_HERSHEY_PLAIN,
+                                                         self.overlay_scale, 1)
+            court_y0, _, court_x0, _ = self._bounds(0, 0, 0, 0)
+            x0, y0 = court_x0 + 6, court_y0 + 4
+            cv2.putText(self.image, self.overlay_text, (x0, y0 + text_h), cv2.FONT_HERSHEY_PLAIN,
+                        self.overlay_scale, self.overlay_color, 1, cv2.LINE_AA)
+            self._dirty.append((y0, y0 + text_h + baseline + 1, x0, x0 + text_w + 1))
+
+        if self.sink:
+            self.sink.show(self.image)
+
+    def close(self):
+        if self.sink:
+            self.sink.close()
+
+
+def benchmark(size, frames=600, pip=True):
+    """Milliseconds per rendered frame (headless, no sink)"""
+    import physics
+    rules = physics.make_rules()
+    state = physics.new_state(rules)
+    renderer = RasterRenderer(rules['width'], rules['height'], size=size)
+    renderer.draw_overlay("loop 60 fps | cam 30 fps | inf 12.0 ms | age 40 ms | drop 0 | miss 0")
+    if pip:
+        renderer.set_picture(np.random.default_rng(0).integers(0, 255, (180, 240, 3), dtype=np.uint8))
+    rng = physics.SeededRng(0)
+    started = time.perf_counter()
+    for _ in range(frames):
+        physics.step(state, rules, rng)
+        ball, p1, p2 = state['ball'], state['paddle1'], state['paddle2']
+        renderer.draw(ball['x'], ball['y'], ball['radius'],
+                      (p1['x'], p1['y'], p1['width'], p1['height']),
+                      (p2['x'], p2['y'], p2['width'], p2['height']), True, False)
+    return (time.perf_counter() - started) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the raster renderer without a display")
+    parser.add_argument('--size', type=parse_size, action='append',
+                        help="output size WxH (repeatable; default 600x400, 1280x720 and 1920x1080)")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--no-pip', action='store_true', help="leave out the camera picture-in-picture")
+    args = parser.parse_args()
+    for size in args.size or [(600, 400), (1280, 720), (1920, 1080)]:
+        ms = benchmark(size, args.frames, pip=not args.no_pip)
+        print(f"🖼️ {size[0]}x{size[1]}: {ms:.3f} ms per frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""Record camera sessions to disk and replay them as a frame source.
+
+A recording is a directory of flat binary files that are appended to while
+recording and memory-mapped when reading, so a replay never loads the whole
+session into memory:
+
+- ``meta.json``      frame shape and the number of hand slots
+- ``frames.u8``      raw BGR camera frames, back to back
+- ``timestamps.f8``  capture time of each frame (seconds, monotonic clock)
+- ``results.bin``    hand landmark results (``result_dtype``), each tagged
+                     with the index of the frame it was computed from
+
+The frame count is derived from the file sizes, so a session cut short by a
+crash can still be replayed.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+HANDEDNESS_LABELS = ('Left', 'Right')
+
+
+def result_dtype(max_num_hands):
+    """Record layout of one hand landmark result"""
+    return np.dtype([
+        ('frame', np.int64),
+        ('count', np.int8),
+        ('handedness', np.int8, (max_num_hands,)),
+        ('landmarks', np.float32, (max_num_hands, 21, 3)),
+    ])
+
+
+class SessionRecorder:
+    """Append frames, timestamps and landmark results to a recording directory"""
+
+    def __init__(self, path, max_num_hands=2):
+        self.path = path
+        self.max_num_hands = max_num_hands
+        self.dtype = result_dtype(max_num_hands)
+        os.makedirs(path, exist_ok=True)
+
+        self.frame_shape = None
+        self.frame_count = 0
+        self._recent = deque(maxlen=256)  # (timestamp, frame index) for matching results
+        self._frames = open(os.path.join(path, 'frames.u8'), 'wb')
+        self._timestamps = open(os.path.join(path, 'timestamps.f8'), 'wb')
+        self._results = open(os.path.join(path, 'results.bin'), 'wb')
+
+    def write_frame(self, frame, timestamp):
+        """Append a raw camera frame; returns its index"""
+        if self.frame_shape is None:
+            self.frame_shape = frame.shape
+            with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+                json.dump({'frame_shape': list(frame.shape), 'max_num_hands': self.max_num_hands}, f)
+        elif frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape changed from {self.frame_shape} to {frame.shape}")
+
+        # Write straight from the array's memory instead of copying it to bytes first
+        self._frames.write(memoryview(np.ascontiguousarray(frame, dtype=np.uint8)).cast('B'))
+        self._timestamps.write(np.float64(timestamp).tobytes())
+        index = self.frame_count
+        self._recent.append((timestamp, index))
+        self.frame_count += 1
+        return index
+
+    def write_result(self, timestamp, landmarks, labels):
+        """Append the landmarks computed from the frame captured at timestamp"""
+        index = next((i for ts, i in reversed(self._recent) if ts == timestamp), None)
+        if index is None:
+            return
+
+        record = np.zeros((), dtype=self.dtype)
+        count = 0 if landmarks is None else min(len(landmarks), self.max_num_hands)
+        record['frame'] = index
+        record['count'] = count
+        if count:
+            record['landmarks'][:count] = landmarks[:count]
+            record['handedness'][:count] = [HANDEDNESS_LABELS.index(label) for label in labels[:count]]
+        self._results.write(record.tobytes())
+
+    def close(self):
+        """Flush and close all files"""
+        for f in (self._frames, self._timestamps, self._results):
+            f.close()
+
+
+class Recording:
+    """Memory-mapped, read-only view of a recording directory"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.frame_shape = tuple(meta['frame_shape'])
+        self.max_num_hands = meta['max_num_hands']
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        count = min(os.path.getsize(os.path.join(path, 'frames.u8')) // frame_bytes,
+                    os.path.getsize(os.path.join(path, 'timestamps.f8')) // 8)
+        self.frames = self._map('frames.u8', np.uint8, (count,) + self.frame_shape)
+        self.timestamps = self._map('timestamps.f8', np.float64, (count,))
+
+        dtype = result_dtype(self.max_num_hands)
+        results_count = os.path.getsize(os.path.join(path, 'results.bin')) // dtype.itemsize
+        self.results = self._map('results.bin', dtype, (results_count,))
+
+    def _map(self, name, dtype, shape):
+        """Memory-map one of the recording files (empty arrays are not mappable)"""
+        if not shape[0]:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode='r', shape=shape)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def result_for(self, frame_index):
+        """(landmarks, labels) recorded for a frame, or None if it had no inference"""
+        matches = np.flatnonzero(self.results['frame'] == frame_index)
+        if not len(matches):
+            return None
+        record = self.results[matches[-1]]
+        count = int(record['count'])
+        labels = [HANDEDNESS_LABELS[i] for i in record['handedness'][:count]]
+        return np.array(record['landmarks'][:count]), labels
+
+
+class ReplaySource:
+    """Feed a recording to the game in place of a CameraStream.
+
+    With ``realtime=True`` frames become available at their recorded pace
+    and frames the game was too slow to pick up are dropped, like a live
+    camera.  With ``realtime=False`` every ``read()`` returns the next frame,
+    so a replay is deterministic and runs as fast as the game can consume it.
+    Timestamps are shifted so the session starts at the moment of ``start()``.
+    """
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.recording = Recording(path)
+        self._offsets = self.recording.timestamps - (self.recording.timestamps[0] if len(self.recording) else 0)
+        self.realtime = realtime
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._start_time = None
+        self._next_index = 0
+        self.last_index = None
+        self.finished = False
+
+        # Same stats as CameraStream
+        self.frames_captured = 0
+        self.dropped_frames = 0
+        self.failed_reads = 0
+
+    def start(self):
+        """Start the replay clock"""
+        self._start_time = time.monotonic()
+        self._next_index = 0
+        self.finished = False
+        return self
+
+    def read(self, timeout=0.0):
+        """Return (frame, timestamp) of the next frame due, or (None, None)"""
+        recording = self.recording
+        if not len(recording):
+            self.finished = True
+            return None, None
+
+        with self._lock:
+            if self._next_index >= len(recording):
+                if not self.loop:
+                    self.finished = True
+                    return None, None
+                self.start()
+
+            offsets = self._offsets
+            if self.realtime:
+                elapsed = time.monotonic() - self._start_time
+                index = int(np.searchsorted(offsets, elapsed, side='right')) - 1
+                if index < self._next_index:
+                    return None, None
+                self.dropped_frames += index - self._next_index
+            else:
+                index = self._next_index
+
+            self._next_index = index + 1
+            self.last_index = index
+            self.frames_captured += 1
+            return recording.frames[index], self._start_time + offsets[index]
+
+    def stop(self):
+        """Nothing to stop; kept for CameraStream compatibility"""
+
+    def release(self):
+        """Nothing to release; kept for CameraStream compatibility"""
@@ -0,0 +1,93 @@
+"""Retained-mode drawing for the game canvas.
+
+Canvas items are created once and then only moved or recolored, instead of
+deleting and recreating the whole scene every frame.
+"""
+
+IDLE_COLOR = '#94a3b8'
+ACTIVE_COLOR = '#22c55e'
+BALL_COLOR = 'white'
+CENTER_LINE_COLOR = '#334155'
+OVERLAY_COLOR = '#facc15'
+
+
+class CanvasRenderer:
+    """Draw the court, paddles and ball on a Tk canvas"""
+
+    def __init__(self, canvas, width, height):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+
+        # Static scene: center line
+        for i in range(0, height, 20):
+            canvas.create_rectangle(
+                width // 2 - 1, i,
+                width // 2 + 1, i + 10,
+                fill=CENTER_LINE_COLOR, outline=''
+            )
+
+        # Dynamic items, positioned on the first draw()
+        self.paddle1_item = canvas.create_rectangle(0, 0, 0, 0, fill=IDLE_COLOR, outline='')
+        self.paddle2_item = canvas.create_rectangle(0, 0, 0, 0, fill=IDLE_COLOR, outline='')
+        self.ball_item = canvas.create_oval(0, 0, 0, 0, fill=BALL_COLOR, outline='')
+
+        self.overlay_item = None
+
+        # Last values sent to Tk, so unchanged items are left alone
+        self._coords = {}
+        self._fills = {}
+        self._overlay_text = None
+
+    def _move(self, item, coords):
+        """Move an item if its rounded coordinates changed"""
+        coords = tuple(round(c, 1) for c in coords)
+        if self._coords.get(item) != coords:
+            self.canvas.coords(item, *coords)
+            self._coords[item] = coords
+
+    def _fill(self, item, color):
+        """Recolor an item if its color changed"""
+        if self._fills.get(item) != color:
+            self.canvas.itemconfig(item, fill=color)
+            self._fills[item] = color
+
+    def draw(self, ball_x, ball_y, radius, paddle1, paddle2, left_active, right_active):
+        """Update dynamic items; paddles are (x, y, width, height) tuples"""
+        for item, (x, y, w, h), active in ((self.paddle1_item, paddle1, left_active),
+                                           (self.paddle2_item, paddle2, right_active)):
+            # Paddles change color when a hand controls them
+            self._move(item, (x, y, x + w, y + h))
+            self._fill(item, ACTIVE_COLOR if active else IDLE_COLOR)
+
+        # Ball changes color when any hand detected
+        self._move(self.ball_item, (ball_x - radius, ball_y - radius, ball_x + radius, ball_y + radius))
+        self._fill(self.ball_item, ACTIVE_COLOR if (left_active or right_active) else BALL_COLOR)
+
+    def draw_overlay(self, text):
+        """Show a line of text in the top-left corner (None hides it)"""
+        text = text or ''
+        if text == self._overlay_text:
+            return
+        if self.overlay_item is None:
+            self.overlay_item = self.canvas.create_text(
+                6, 4, anchor='nw', fill=OVERLAY_COLOR, font=('Courier', 9)
+            )
+        self.canvas.itemconfig(self.overlay_item, text=text)
+        self._overlay_text = text
+
+
+class WidgetUpdater:
+    """Apply widget options only when they differ from the last call"""
+
+    def __init__(self):
+        self._last = {}
+
+    def set(self, widget, **options):
+        """Configure widget with options that changed; returns True if any did"""
+        last = self._last.setdefault(str(widget), {})
+        changed = {key: value for key, value in options.items() if last.get(key) != value}
+        if changed:
+            widget.config(**changed)
+            last.update(changed)
+        return bool(changed)
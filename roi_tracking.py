@@ -0,0 +1,146 @@
+"""Region-of-interest hand tracking.
+
+Once hands have been found, MediaPipe only sees small crops around where
+each hand was last seen, shrunk to ``max_side`` pixels.  The whole frame is
+searched again when a hand is lost, and periodically so new hands are picked
+up.  Landmarks are mapped back to full-frame normalized coordinates, so the
+result looks the same to the caller as a full-frame ``Hands.process()``.
+"""
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+DEFAULT_ROI_OPTIONS = {
+    'max_side': 192,  # crops are shrunk so their longest side is at most this
+    'margin': 0.35,  # box growth on each side, as a fraction of the hand size
+    'min_size': 0.2,  # smallest crop, as a fraction of the frame height
+    'search_interval': 30,  # frames between full-frame searches
+}
+
+MIN_CROP = 16  # pixels; a hand box clipped smaller than this is dropped and the frame searched again
+
+
+def make_hand_tracker(mp_hands, max_num_hands=2, roi=None, **hands_options):
+    """Create a MediaPipe Hands model, wrapped in ROI tracking if roi is set"""
+    if not roi:
+        return mp_hands.Hands(static_image_mode=False, max_num_hands=max_num_hands, **hands_options)
+    options = dict(DEFAULT_ROI_OPTIONS)
+    if isinstance(roi, dict):
+        options.update(roi)
+    return RoiHandTracker(
+        full_model=mp_hands.Hands(static_image_mode=False, max_num_hands=max_num_hands, **hands_options),
+        crop_models=[mp_hands.Hands(static_image_mode=False, max_num_hands=1, **hands_options)
+                     for _ in range(max_num_hands)],
+        **options
+    )
+
+
+def warm_up_tracker(hands, frame_shape, runs=2):
+    """Run inference on blank frames so the first real frame is not slow; returns seconds"""
+    started = time.perf_counter()
+    if isinstance(hands, RoiHandTracker):
+        models = [(hands.full_model, frame_shape)]
+        models += [(model, (hands.max_side, hands.max_side, 3)) for model in hands.crop_models]
+    else:
+        models = [(hands, frame_shape)]
+    for model, shape in models:
+        blank = np.zeros(shape, dtype=np.uint8)
+        for _ in range(runs):
+            model.process(blank)
+    return time.perf_counter() - started
+
+
+class RoiHandTracker:
+    """Run hand inference on crops around the last known hand boxes"""
+
+    def __init__(self, full_model, crop_models, max_side=192, margin=0.35, min_size=0.2, search_interval=30):
+        self.full_model = full_model
+        self.crop_models = crop_models
+        self.max_side = max_side
+        self.margin = margin
+        self.min_size = min_size
+        self.search_interval = search_interval
+
+        self.boxes = []  # pixel (x0, y0, x1, y1) per tracked hand
+        self.frames_since_search = 0
+
+        # Stats
+        self.full_searches = 0
+        self.roi_frames = 0
+        self.last_mode = None
+
+    def process(self, rgb_frame):
+        """Detect hands; same result attributes as Hands.process()"""
+        h, w = rgb_frame.shape[:2]
+        self.frames_since_search += 1
+
+        if self.boxes and self.frames_since_search < self.search_interval:
+            landmarks, handedness = self._process_crops(rgb_frame)
+            if landmarks is not None:
+                self.roi_frames += 1
+                self.last_mode = 'roi'
+                self.boxes = self._boxes_for(landmarks, w, h)
+                return SimpleNamespace(multi_hand_landmarks=landmarks, multi_handedness=handedness)
+
+        # First frame, periodic search, or a hand was lost: search the whole frame
+        results = self.full_model.process(rgb_frame)
+        self.full_searches += 1
+        self.frames_since_search = 0
+        self.last_mode = 'full'
+        self.boxes = self._boxes_for(results.multi_hand_landmarks or [], w, h)
+        return results
+
+    def _process_crops(self, rgb_frame):
+        """Track each hand in its own crop; returns (None, None) if any is lost"""
+        h, w = rgb_frame.shape[:2]
+        landmarks, handedness = [], []
+        for box, model in zip(self.boxes, self.crop_models):
+            x0, y0, x1, y1 = box
+            crop = rgb_frame[y0:y1, x0:x1]
+            scale = self.max_side / max(crop.shape[:2])
+            if scale < 1:
+                crop = cv2.resize(crop, (max(1, int((x1 - x0) * scale)), max(1, int((y1 - y0) * scale))),
+                                  interpolation=cv2.INTER_AREA)
+            else:
+                crop = np.ascontiguousarray(crop)
+
+            results = model.process(crop)
+            if not results.multi_hand_landmarks:
+                return None, None
+
+            hand = results.multi_hand_landmarks[0]
+            # Map crop-normalized coordinates back to the full frame
+            for point in hand.landmark:
+                point.x = (x0 + point.x * (x1 - x0)) / w
+                point.y = (y0 + point.y * (y1 - y0)) / h
+            landmarks.append(hand)
+            handedness.append(results.multi_handedness[0])
+        return landmarks, handedness
+
+    def _boxes_for(self, hands, w, h):
+        """Crop boxes for all hands, or none (a full search next frame) if any hand has left the frame"""
+        boxes = [self._box_for(hand, w, h) for hand in hands]
+        return [] if None in boxes else boxes
+
+    def _box_for(self, hand, w, h):
+        """Square pixel crop box around a hand's landmarks, clipped to the frame (None if mostly outside)"""
+        xs = [point.x * w for point in hand.landmark]
+        ys = [point.y * h for point in hand.landmark]
+        cx, cy = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+        size = max(max(xs) - min(xs), max(ys) - min(ys))
+        size = max(size * (1 + 2 * self.margin), self.min_size * h)
+        half = size / 2
+        # Landmarks are extrapolated past the frame edge when a hand leaves it
+        x0, y0 = max(0, int(cx - half)), max(0, int(cy - half))
+        x1, y1 = min(w, int(cx + half)), min(h, int(cy + half))
+        if x1 - x0 < MIN_CROP or y1 - y0 < MIN_CROP:
+            return None
+        return x0, y0, x1, y1
+
+    def close(self):
+        """Release all models"""
+        self.full_model.close()
+        for model in self.crop_models:
+            model.close()
@@ -0,0 +1,53 @@
+"""Load slow dependencies in the background while the window is already up.
+
+Importing OpenCV/MediaPipe and building the hand tracking graph takes
+seconds.  ``BackgroundLoader`` runs that work on a thread; the Tk main loop
+polls ``done`` (Tk itself must only be touched from the main thread) and
+finishes setting up once the result is available.
+"""
+import threading
+import time
+
+# Reference point for startup timings: when the game's modules were first imported
+PROCESS_START = time.perf_counter()
+
+
+class BackgroundLoader:
+    """Run load() on a daemon thread and keep its result, error and duration"""
+
+    def __init__(self, load, name="BackgroundLoader"):
+        self._load = load
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.result = None
+        self.error = None
+        self.elapsed = None
+
+    def start(self):
+        """Start loading"""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            self.result = self._load()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - started
+            self._done.set()
+
+    @property
+    def done(self):
+        """Whether load() has returned or raised"""
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until loading finishes; returns done"""
+        return self._done.wait(timeout)
+
+
+def since_start():
+    """Seconds since the game's modules were imported"""
+    return time.perf_counter() - PROCESS_START
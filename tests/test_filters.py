@@ -0,0 +1,22 @@
+import pytest
+
+from filters import FILTERS, make_filter, update_from
+
+
+@pytest.mark.parametrize('name', sorted(FILTERS))
+def test_update_from_eases_a_reset_filter_toward_the_hand(name):
+    paddle_filter = make_filter(name)
+    position = update_from(paddle_filter, 100.0, 300.0, 1.0)
+    # The first measurement is folded in, but the paddle does not jump straight to it
+    assert 100.0 < position < 300.0
+
+
+@pytest.mark.parametrize('name', sorted(FILTERS))
+def test_update_from_only_seeds_a_filter_without_measurements(name):
+    seeded = make_filter(name)
+    update_from(seeded, 100.0, 300.0, 1.0)
+    plain = make_filter(name)
+    plain.update(100.0, 1.0 - 1 / 60)
+    plain.update(300.0, 1.0)
+    # Later measurements ignore the paddle's current position
+    assert update_from(seeded, 0.0, 310.0, 1.05) == plain.update(310.0, 1.05)
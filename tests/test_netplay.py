@@ -0,0 +1,63 @@
+from netplay import LoopbackLink, RollbackSession, simulate
+
+
+def make_peers(link, clock, **options):
+    left_end, right_end = link.endpoints()
+    return (RollbackSession(left_end, 'left', clock=lambda: clock[0], **options),
+            RollbackSession(right_end, 'right', clock=lambda: clock[0], **options))
+
+
+def tick(peers, clock):
+    clock[0] += 1 / 60
+    for peer in peers:
+        peer.advance(None)
+
+
+def test_no_step_before_the_handshake():
+    clock = [0.0]
+    link = LoopbackLink(delay=0.05, clock=lambda: clock[0])
+    left, right = make_peers(link, clock)
+    tick((left,), clock)
+    tick((left,), clock)
+    # The right peer has not started yet: the left one must not run step 0 alone
+    assert left.frame == 0 and not left.connected
+    for _ in range(30):
+        tick((left, right), clock)
+    assert left.connected and right.connected
+    assert left.frame > 0 and right.frame > 0
+
+
+def test_restarted_peer_ends_the_match():
+    clock = [0.0]
+    link = LoopbackLink(delay=0.02, clock=lambda: clock[0])
+    left, right = make_peers(link, clock)
+    for _ in range(60):
+        tick((left, right), clock)
+    assert left.connected
+
+    # The right game restarts on the same link with a new session
+    restarted = RollbackSession(link.endpoints()[1], 'right', clock=lambda: clock[0])
+    for _ in range(10):
+        tick((left, restarted), clock)
+    assert left.disconnected == "peer restarted"
+    assert left.advance(None) is None
+
+
+def test_silent_peer_times_out():
+    clock = [0.0]
+    link = LoopbackLink(delay=0.02, clock=lambda: clock[0])
+    left, right = make_peers(link, clock, timeout=1.0)
+    for _ in range(60):
+        tick((left, right), clock)
+    for _ in range(90):
+        tick((left,), clock)
+    assert left.disconnected.startswith("peer disconnected")
+
+
+def test_peers_stay_in_sync_under_loss_and_jitter():
+    report = simulate(frames=1200, delay=0.1, jitter=0.04, loss=0.2, seed=3)
+    assert report['disconnected'] is None
+    assert report['compared_frames'] == 1200
+    assert report['desyncs'] == 0
+    # The network was bad enough that both peers had to roll back
+    assert all(stats['rollbacks'] for stats in report['peers'].values())
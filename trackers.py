@@ -0,0 +1,233 @@
+"""Hand tracking backends behind one interface.
+
+Every tracker has ``track(rgb_frame)``, which takes a mirrored RGB frame and
+returns a dict with:
+
+    'hands'       (handedness label, normalized y) pairs, labelled the way
+                  MediaPipe labels a mirrored frame
+    'landmarks'   (hands x 21 x 3) normalized points for the preview and
+                  recordings, or None
+    'confidence'  0..1, how much the tracker trusts this result
+
+``MediaPipeTracker`` wraps a MediaPipe model (plain or ROI).  ``BlobTracker``
+only looks for skin-colored blobs to the left and right of the player and
+reports how high each one is, which is all the paddles need, at a fraction of
+the cost.  ``AdaptiveTracker`` runs MediaPipe while it keeps up with the
+camera, switches to the blob tracker when it does not, and goes back to
+MediaPipe whenever the blobs stop looking like hands.
+"""
+import time
+
+import cv2
+import numpy as np
+
+from landmarks import MIDDLE_TIP, NUM_LANDMARKS, landmarks_array
+
+TRACKERS = ('mediapipe', 'blob', 'auto')
+
+DEFAULT_BLOB_OPTIONS = {
+    'size': (160, 120),  # frames are shrunk to this before segmentation
+    'center_band': 0.3,  # middle fraction of the frame ignored (the player's face)
+    'min_area': 0.01,  # smallest blob, as a fraction of one side's area
+    'max_area': 0.35,  # bigger blobs are arms, bodies or skin-colored walls
+    'cr_range': (135, 175),  # YCrCb skin thresholds used until calibrated
+    'cb_range': (80, 130),
+}
+
+DEFAULT_AUTO_OPTIONS = {
+    'latency_budget': 0.025,  # seconds of MediaPipe time per frame before switching
+    'min_confidence': 0.5,  # blob results below this count as lost
+    'lost_frames': 5,  # consecutive lost blob frames before going back to MediaPipe
+    'recheck_interval': 5.0,  # seconds between MediaPipe frames while on blobs
+}
+
+
+def make_tracker(kind, hands=None, blob=None, auto=None):
+    """Create the tracker named kind; hands is the MediaPipe model for 'mediapipe' and 'auto'"""
+    blob_options = dict(DEFAULT_BLOB_OPTIONS, **(blob or {}))
+    if kind == 'mediapipe':
+        return MediaPipeTracker(hands)
+    if kind == 'blob':
+        return BlobTracker(**blob_options)
+    if kind == 'auto':
+        auto_options = dict(DEFAULT_AUTO_OPTIONS, **(auto or {}))
+        return AdaptiveTracker(MediaPipeTracker(hands), BlobTracker(**blob_options), **auto_options)
+    raise ValueError(f"Unknown tracker {kind!r} (choose from {', '.join(TRACKERS)})")
+
+
+class MediaPipeTracker:
+    """Full hand landmarks from a MediaPipe Hands (or RoiHandTracker) model"""
+
+    name = 'mediapipe'
+
+    def __init__(self, hands):
+        self.hands = hands
+
+    def track(self, rgb_frame):
+        """Landmarks of every detected hand"""
+        results = self.hands.process(rgb_frame)
+        if not (results.multi_hand_landmarks and results.multi_handedness):
+            return {'hands': [], 'landmarks': None, 'confidence': 0.0}
+        landmarks = landmarks_array(results.multi_hand_landmarks)
+        labels = [handedness.classification[0].label for handedness in results.multi_handedness]
+        # Get hand position (using middle finger tip - landmark 12)
+        hands = list(zip(labels, landmarks[:, MIDDLE_TIP, 1].tolist()))
+        return {'hands': hands, 'landmarks': landmarks, 'confidence': 1.0}
+
+
+class BlobTracker:
+    """Vertical hand positions from skin-colored blobs beside the player"""
+
+    name = 'blob'
+
+    def __init__(self, size=(160, 120), center_band=0.3, min_area=0.01, max_area=0.35,
+                 cr_range=(135, 175), cb_range=(80, 130)):
+        self.size = size
+        self.center_band = center_band
+        self.min_area = min_area
+        self.max_area = max_area
+        self.set_skin_range(cr_range, cb_range)
+        self.calibrated = False
+        # Blob centroids sit lower than the middle fingertip MediaPipe reports
+        self.offsets = {'Left': 0.0, 'Right': 0.0}
+
+        width, height = size
+        self.small = np.empty((height, width, 3), dtype=np.uint8)
+        self.ycrcb = np.empty((height, width, 3), dtype=np.uint8)
+        self.mask = np.empty((height, width), dtype=np.uint8)
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        # Mirrored frame: the player's right hand is on the left of the image
+        x0 = int(width * (0.5 - center_band / 2))
+        x1 = int(width * (0.5 + center_band / 2))
+        self.regions = (('Right', 0, x0), ('Left', x1, width))
+
+    def set_skin_range(self, cr_range, cb_range):
+        """Use these YCrCb chroma ranges as skin"""
+        self.lower = np.array([0, cr_range[0], cb_range[0]], dtype=np.uint8)
+        self.upper = np.array([255, cr_range[1], cb_range[1]], dtype=np.uint8)
+
+    def _segment(self, rgb_frame):
+        """Shrink, convert and threshold the frame into self.mask"""
+        cv2.resize(rgb_frame, self.size, dst=self.small, interpolation=cv2.INTER_NEAREST)
+        cv2.cvtColor(self.small, cv2.COLOR_RGB2YCrCb, dst=self.ycrcb)
+        cv2.inRange(self.ycrcb, self.lower, self.upper, dst=self.mask)
+        cv2.morphologyEx(self.mask, cv2.MORPH_OPEN, self.kernel, dst=self.mask)
+
+    def _blobs(self):
+        """(label, normalized x, normalized y, confidence) of the blob on each side of self.mask"""
+        height, width = self.mask.shape
+        blobs = []
+        for label, x0, x1 in self.regions:
+            m = cv2.moments(self.mask[:, x0:x1], binaryImage=True)
+            area = m['m00'] / (height * (x1 - x0))
+            if not self.min_area <= area <= self.max_area:
+                continue
+            x = (x0 + m['m10'] / m['m00']) / width
+            y = m['m01'] / m['m00'] / height
+            # A hand is compact; a tall smear (arm, sleeve gap, background) is not
+            spread = np.sqrt(m['mu02'] / m['m00']) / height
+            confidence = float(np.clip(1.0 - (spread - 0.1) / 0.15, 0.0, 1.0))
+            blobs.append((label, x, y, confidence))
+        return blobs
+
+    def track(self, rgb_frame):
+        """Centroid height of the skin blob on each side of the frame"""
+        self._segment(rgb_frame)
+        blobs = self._blobs()
+        if not blobs:
+            return {'hands': [], 'landmarks': None, 'confidence': 0.0}
+        hands = [(label, y + self.offsets[label]) for label, _, y, _ in blobs]
+        # One point per hand, repeated so the preview and recordings get the usual shape
+        landmarks = np.zeros((len(blobs), NUM_LANDMARKS, 3), dtype=np.float32)
+        for i, (label, x, _, _) in enumerate(blobs):
+            landmarks[i, :, 0] = x
+            landmarks[i, :, 1] = hands[i][1]
+        return {'hands': hands, 'landmarks': landmarks,
+                'confidence': min(confidence for _, _, _, confidence in blobs)}
+
+    def calibrate(self, rgb_frame, result, margin=8):
+        """Learn skin color and fingertip offsets from a MediaPipe result on the same frame"""
+        if not result['hands'] or result['landmarks'] is None:
+            return False
+        height, width = self.mask.shape
+        self._segment(rgb_frame)
+        points = result['landmarks'][:, :, :2].reshape(-1, 2)
+        xs = np.clip((points[:, 0] * width).astype(int), 0, width - 1)
+        ys = np.clip((points[:, 1] * height).astype(int), 0, height - 1)
+        samples = self.ycrcb[ys, xs]
+        cr_low, cb_low = np.percentile(samples[:, 1:], 10, axis=0) - margin
+        cr_high, cb_high = np.percentile(samples[:, 1:], 90, axis=0) + margin
+        self.set_skin_range((max(int(cr_low), 0), min(int(cr_high), 255)),
+                            (max(int(cb_low), 0), min(int(cb_high), 255)))
+
+        # Re-threshold with the new colors and line the blobs up with the fingertips
+        cv2.inRange(self.ycrcb, self.lower, self.upper, dst=self.mask)
+        cv2.morphologyEx(self.mask, cv2.MORPH_OPEN, self.kernel, dst=self.mask)
+        fingertips = dict(result['hands'])
+        for label, _, y, _ in self._blobs():
+            if label in fingertips:
+                self.offsets[label] = fingertips[label] - y
+        self.calibrated = True
+        return True
+
+
+class AdaptiveTracker:
+    """MediaPipe while it keeps up, skin blobs while it does not"""
+
+    def __init__(self, primary, fallback, latency_budget=0.025, min_confidence=0.5,
+                 lost_frames=5, recheck_interval=5.0):
+        self.primary = primary
+        self.fallback = fallback
+        self.latency_budget = latency_budget
+        self.min_confidence = min_confidence
+        self.lost_frames = lost_frames
+        self.recheck_interval = recheck_interval
+
+        self.active = primary
+        self.latency = None  # smoothed seconds per MediaPipe frame
+        self.low_confidence = 0
+        self.last_primary = time.monotonic()
+
+        # Stats
+        self.switches = 0
+        self.reason = None  # why the last switch happened
+
+    @property
+    def name(self):
+        return self.active.name
+
+    def _switch(self, tracker, reason):
+        self.active = tracker
+        self.low_confidence = 0
+        self.switches += 1
+        self.reason = reason
+
+    def track(self, rgb_frame):
+        """Track with the active backend, switching when it is too slow or unsure"""
+        now = time.monotonic()
+        if self.active is self.fallback and now - self.last_primary < self.recheck_interval:
+            result = self.fallback.track(rgb_frame)
+            if result['confidence'] < self.min_confidence:
+                self.low_confidence += 1
+                if self.low_confidence >= self.lost_frames:
+                    self._switch(self.primary, "blob tracker lost the hands")
+            else:
+                self.low_confidence = 0
+            return result
+
+        # MediaPipe frame: always while active, otherwise a periodic recheck
+        started = time.perf_counter()
+        result = self.primary.track(rgb_frame)
+        latency = time.perf_counter() - started
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.last_primary = now
+        if result['hands']:
+            self.fallback.calibrate(rgb_frame, result)
+
+        too_slow = self.latency > self.latency_budget
+        if too_slow and self.fallback.calibrated and self.active is self.primary:
+            self._switch(self.fallback, f"MediaPipe {self.latency * 1000:.0f} ms "
+                                        f"> {self.latency_budget * 1000:.0f} ms budget")
+        elif not too_slow and self.active is self.fallback:
+            self._switch(self.primary, f"MediaPipe back within budget ({self.latency * 1000:.0f} ms)")
+        return result